@@ -15,8 +15,11 @@ const HF_CONFIG = {
         single: 'leaderboard_single.json',
         multi: 'leaderboard_multi.json',
         compare: 'leaderboard_compare.json',
-        lastUpdated: 'last_updated.json'
+        display: 'leaderboard_display.json',
+        lastUpdated: 'last_updated.json',
+        shardIndex: 'shards/index.json'
     },
+    shardDir: 'shards/',
 
     // 备用：本地数据（当 HF 不可用时）
     fallbackToLocal: true,
@@ -31,7 +34,7 @@ const HF_CONFIG = {
 
 const CACHE_KEY = 'sagellm_hf_leaderboard_cache_v3';
 
-function readCacheEnvelope() {
+function readCacheEnvelope({ ignoreTTL = false } = {}) {
     try {
         const raw = sessionStorage.getItem(CACHE_KEY);
         if (!raw) {
@@ -42,7 +45,7 @@ function readCacheEnvelope() {
             return null;
         }
         const age = Date.now() - parsed.savedAt;
-        if (age > HF_CONFIG.cacheTTLms) {
+        if (!ignoreTTL && age > HF_CONFIG.cacheTTLms) {
             return null;
         }
         return parsed;
@@ -51,11 +54,12 @@ function readCacheEnvelope() {
     }
 }
 
-function writeCache(data, marker = null) {
+function writeCache(data, marker = null, hashes = null) {
     try {
         sessionStorage.setItem(CACHE_KEY, JSON.stringify({
             savedAt: Date.now(),
             marker,
+            hashes,
             data
         }));
     } catch (_error) {
@@ -254,7 +258,7 @@ function mergeByEntryId(entries) {
  * @param {string} filename - 文件名
  * @returns {Promise<Array>} - 解析后的 JSON 数据
  */
-async function loadFromHuggingFace(filename) {
+async function loadFromHuggingFace(filename, { immutable = false } = {}) {
     // Hugging Face raw file URL 格式
     // https://huggingface.co/datasets/{repo}/resolve/{branch}/{path}
     const url = `https://huggingface.co/datasets/${HF_CONFIG.repo}/resolve/${HF_CONFIG.branch}/${filename}`;
@@ -265,7 +269,8 @@ async function loadFromHuggingFace(filename) {
         headers: {
             'Accept': 'application/json'
         },
-        cache: 'no-cache'  // 确保获取最新数据
+        // 确保获取最新数据；内容寻址（hashed）文件不会变化，可直接命中浏览器缓存
+        cache: immutable ? 'force-cache' : 'no-cache'
     });
 
     if (!response.ok) {
@@ -291,6 +296,14 @@ async function loadFromLocal(filename) {
     return await response.json();
 }
 
+// 预计算展示行（aggregate_results.py 输出的 leaderboard_display.json）；结构不符时忽略
+function normalizeDisplaySnapshot(payload) {
+    if (payload && payload.schema_version === 'leaderboard-display/v1' && payload.tabs) {
+        return payload;
+    }
+    return null;
+}
+
 async function loadOptionalJson(loader, filename) {
     try {
         return await loader(filename);
@@ -300,9 +313,40 @@ async function loadOptionalJson(loader, filename) {
     }
 }
 
+function snapshotHashes(snapshots) {
+    if (!snapshots || typeof snapshots !== 'object') {
+        return null;
+    }
+    return Object.fromEntries(
+        Object.entries(snapshots)
+            .filter(([, info]) => info && info.sha256)
+            .map(([name, info]) => [name, info.sha256])
+    );
+}
+
+// last_updated.json 的 snapshots 记录每个快照的 sha256 与内容寻址文件名：
+// 哈希未变的快照直接复用会话缓存，变化的快照优先拉取不可变的 hashed 文件
+async function loadHashedSnapshot(loader, key, snapshots, previous, optional = false) {
+    const filename = HF_CONFIG.files[key];
+    const info = snapshots?.[filename];
+    if (info?.sha256 && previous?.hashes?.[filename] === info.sha256 && previous.data?.[key] != null) {
+        console.log(`[HF Loader] ♻️ ${filename} unchanged (${info.sha256.slice(0, 12)}), reusing cache`);
+        return previous.data[key];
+    }
+
+    if (info?.hashed) {
+        try {
+            return await loader(info.hashed, { immutable: true });
+        } catch (_e) {
+            // ignore and fallback to the logical filename
+        }
+    }
+    return optional ? loadOptionalJson(loader, filename) : loader(filename);
+}
+
 /**
  * 加载 leaderboard 数据（优先 HF，失败则本地）
- * @returns {Promise<{single: Array, multi: Array, compare: Object}>}
+ * @returns {Promise<{single: Array, multi: Array, compare: Object, display: Object}>}
  */
 async function loadLeaderboardData() {
     const cachedEnvelope = readCacheEnvelope();
@@ -326,25 +370,30 @@ async function loadLeaderboardData() {
         console.log('[HF Loader] ♻️ Marker changed, refreshing leaderboard data');
     }
 
-    const result = { single: [], multi: [], compare: null };
+    const result = { single: [], multi: [], compare: null, display: null };
 
     // 尝试从 Hugging Face 加载
     try {
         console.log('[HF Loader] Loading from Hugging Face...');
 
-        const marker = await getLatestMarker();
+        const markerPayload = await loadOptionalJson(loadFromHuggingFace, HF_CONFIG.files.lastUpdated);
+        const marker = markerPayload?.last_updated || await getLatestMarker();
+        const snapshots = markerPayload?.snapshots || null;
+        const previous = readCacheEnvelope({ ignoreTTL: true });
 
-        const [singleData, multiData, compareData] = await Promise.all([
-            loadFromHuggingFace(HF_CONFIG.files.single),
-            loadFromHuggingFace(HF_CONFIG.files.multi),
-            loadOptionalJson(loadFromHuggingFace, HF_CONFIG.files.compare)
+        const [singleData, multiData, compareData, displayData] = await Promise.all([
+            loadHashedSnapshot(loadFromHuggingFace, 'single', snapshots, previous),
+            loadHashedSnapshot(loadFromHuggingFace, 'multi', snapshots, previous),
+            loadHashedSnapshot(loadFromHuggingFace, 'compare', snapshots, previous, true),
+            loadHashedSnapshot(loadFromHuggingFace, 'display', snapshots, previous, true)
         ]);
 
         result.single = normalizeEntryArray(singleData);
         result.multi = normalizeEntryArray(multiData);
         result.compare = compareData && typeof compareData === 'object' ? compareData : null;
+        result.display = normalizeDisplaySnapshot(displayData);
 
-        writeCache(result, marker);
+        writeCache(result, marker, snapshotHashes(snapshots));
         console.log(`[HF Loader] ✅ Loaded from HF: ${result.single.length} single, ${result.multi.length} multi`);
         return result;
 
@@ -356,15 +405,17 @@ async function loadLeaderboardData() {
             try {
                 console.log('[HF Loader] Trying local fallback...');
 
-                const [singleData, multiData, compareData] = await Promise.all([
+                const [singleData, multiData, compareData, displayData] = await Promise.all([
                     loadFromLocal(HF_CONFIG.files.single),
                     loadFromLocal(HF_CONFIG.files.multi),
-                    loadOptionalJson(loadFromLocal, HF_CONFIG.files.compare)
+                    loadOptionalJson(loadFromLocal, HF_CONFIG.files.compare),
+                    loadOptionalJson(loadFromLocal, HF_CONFIG.files.display)
                 ]);
 
                 result.single = normalizeEntryArray(singleData);
                 result.multi = normalizeEntryArray(multiData);
                 result.compare = compareData && typeof compareData === 'object' ? compareData : null;
+                result.display = normalizeDisplaySnapshot(displayData);
 
                 writeCache(result, null);
                 console.log(`[HF Loader] ✅ Loaded from local: ${result.single.length} single, ${result.multi.length} multi`);
@@ -420,9 +471,100 @@ async function getLastUpdated() {
     return null;
 }
 
+// 分片布局：index 与 shard 必须来自同一数据源，避免新旧快照混用
+let shardLoader = null;
+const shardCache = new Map();
+
+/**
+ * 加载分片索引（aggregate_results.py 输出的 shards/index.json）
+ * @returns {Promise<Object|null>} - 索引不可用时返回 null，调用方回退到全量快照
+ */
+async function loadShardIndex() {
+    const useIndex = (index, loader) => {
+        if (index && Array.isArray(index.shards) && index.shards.length > 0) {
+            shardLoader = loader;
+            shardCache.clear();
+            return index;
+        }
+        return null;
+    };
+
+    try {
+        const hfIndex = useIndex(await loadFromHuggingFace(HF_CONFIG.files.shardIndex), loadFromHuggingFace);
+        if (hfIndex) {
+            return hfIndex;
+        }
+    } catch (_e) {
+        // ignore and fallback
+    }
+
+    if (!HF_CONFIG.fallbackToLocal) {
+        return null;
+    }
+
+    // 本地分片只在与 HF 快照同一批次时使用，避免旧分片遮蔽 HF 上更新的全量快照
+    const [hfMarker, localMarker] = await Promise.all([
+        loadOptionalJson(loadFromHuggingFace, HF_CONFIG.files.lastUpdated),
+        loadOptionalJson(loadFromLocal, HF_CONFIG.files.lastUpdated)
+    ]);
+    if (hfMarker?.last_updated && hfMarker.last_updated !== localMarker?.last_updated) {
+        return null;
+    }
+
+    try {
+        return useIndex(await loadFromLocal(HF_CONFIG.files.shardIndex), loadFromLocal);
+    } catch (_e) {
+        return null;
+    }
+}
+
+/**
+ * 加载单个分片的 entry 列表，或其 compare 分组 / 展示行 sidecar
+ * @param {string} path - index.shards[].path / compare_path / display_path
+ * @returns {Promise<Array>}
+ */
+async function loadShard(path) {
+    if (!shardLoader) {
+        throw new Error('Shard index has not been loaded');
+    }
+    if (!shardCache.has(path)) {
+        const pending = shardLoader(`${HF_CONFIG.shardDir}${path}`)
+            .then(normalizeEntryArray)
+            .catch((error) => {
+                shardCache.delete(path);
+                throw error;
+            });
+        shardCache.set(path, pending);
+    }
+    return shardCache.get(path);
+}
+
+/**
+ * 分片模式下单独加载 compare 快照（与分片同源；仅用于没有 compare_path 的旧版索引）
+ * @returns {Promise<Object|null>}
+ */
+async function loadCompareSnapshot() {
+    const compareData = await loadOptionalJson(shardLoader || loadFromHuggingFace, HF_CONFIG.files.compare);
+    return compareData && typeof compareData === 'object' ? compareData : null;
+}
+
+/**
+ * 分片模式下单独加载预计算展示行（与分片同源；仅用于没有 display_path 的旧版索引）
+ * @returns {Promise<Object|null>}
+ */
+async function loadDisplaySnapshot() {
+    return normalizeDisplaySnapshot(
+        await loadOptionalJson(shardLoader || loadFromHuggingFace, HF_CONFIG.files.display)
+    );
+}
+
 // 导出供 leaderboard.js 使用
 window.HFDataLoader = {
     loadLeaderboardData,
+    loadShardIndex,
+    loadShard,
+    loadCompareSnapshot,
+    loadDisplaySnapshot,
     getLastUpdated,
     config: HF_CONFIG
 };
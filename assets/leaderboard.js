@@ -323,6 +323,10 @@
         multiChipData: [],
         multiNodeData: [],
         compareSnapshot: null,
+        displaySnapshot: null,
+        displayLookups: {},
+        shardIndex: null,
+        loadedShards: new Set(),
         totalLoadedEntries: 0,
         pypiVersions: {},
         sagellmVersionOptions: [],
@@ -459,6 +463,16 @@
         try {
             let singleData, multiData;
 
+            // 分片模式：只拉取当前 tab 的默认分片，首屏不随历史数据总量增长
+            if (await loadShardedData()) {
+                initializeFilters();
+                await ensureShardsForCurrentView();
+
+                loadingEl.style.display = 'none';
+                contentEl.style.display = 'block';
+                return;
+            }
+
             // 优先使用 HF Data Loader（如果可用）
             if (window.HFDataLoader) {
                 console.log('[Leaderboard] Using HF Data Loader...');
@@ -466,6 +480,7 @@
                 singleData = data.single;
                 multiData = data.multi;
                 state.compareSnapshot = data.compare || null;
+                setDisplaySnapshot(data.display || null);
             } else {
                 // 备用：直接从本地加载
                 console.log('[Leaderboard] HF Loader not available, using local data...');
@@ -481,6 +496,7 @@
                 singleData = await singleRes.json();
                 multiData = await multiRes.json();
                 state.compareSnapshot = null;
+                setDisplaySnapshot(null);
             }
 
             // 按芯片数和节点数分类
@@ -518,6 +534,126 @@
         }
     }
 
+    async function loadShardedData() {
+        if (!window.HFDataLoader || !window.HFDataLoader.loadShardIndex) {
+            return false;
+        }
+
+        const index = await window.HFDataLoader.loadShardIndex();
+        if (!index) {
+            return false;
+        }
+
+        console.log(`[Leaderboard] Using sharded layout: ${index.shards.length} shards, ${index.entry_count} entries`);
+        state.shardIndex = index;
+        if (index.shards.some((shard) => shard.display_path || shard.compare_path)) {
+            // compare 分组与展示行随各自分片加载（见 loadShards），首屏只拉取索引和当前分片
+            state.compareSnapshot = { groups: [] };
+            setDisplaySnapshot({ tabs: {} });
+        } else {
+            // 旧版索引没有分片 sidecar，回退到全量快照
+            state.compareSnapshot = await window.HFDataLoader.loadCompareSnapshot();
+            setDisplaySnapshot(window.HFDataLoader.loadDisplaySnapshot
+                ? await window.HFDataLoader.loadDisplaySnapshot()
+                : null);
+        }
+        const defaultShard = index.tabs?.[state.currentTab]?.default_shard;
+        if (defaultShard) {
+            await loadShards([defaultShard]);
+        }
+        return true;
+    }
+
+    async function loadShards(paths) {
+        const missing = paths.filter((path) => !state.loadedShards.has(path));
+        if (missing.length === 0) {
+            return false;
+        }
+
+        const descriptors = missing.map((path) => state.shardIndex.shards.find((shard) => shard.path === path));
+        const loadOptional = (path) => (path ? window.HFDataLoader.loadShard(path) : Promise.resolve([]));
+        const [payloads, compareGroups, displayRows] = await Promise.all([
+            Promise.all(missing.map((path) => window.HFDataLoader.loadShard(path))),
+            Promise.all(descriptors.map((descriptor) => loadOptional(descriptor?.compare_path))),
+            Promise.all(descriptors.map((descriptor) => loadOptional(descriptor?.display_path)))
+        ]);
+        const touchedTabs = new Set();
+        missing.forEach((path, index) => {
+            const descriptor = descriptors[index];
+            if (!descriptor || state.loadedShards.has(path)) {
+                return;
+            }
+            state.loadedShards.add(path);
+            getDataByTab(descriptor.tab).push(...payloads[index]);
+            if (descriptor.compare_path) {
+                state.compareSnapshot.groups.push(...compareGroups[index]);
+            }
+            if (descriptor.display_path) {
+                // 行的 rank 是整个 tab 的排序位置，按分片追加后仍可直接排序
+                const rows = state.displaySnapshot.tabs[descriptor.tab] || [];
+                state.displaySnapshot.tabs[descriptor.tab] = rows.concat(displayRows[index]);
+                delete state.displayLookups[descriptor.tab];
+            }
+            touchedTabs.add(descriptor.tab);
+        });
+
+        touchedTabs.forEach((tab) => getDataByTab(tab).sort(compareEntriesByVersionDesc));
+        state.totalLoadedEntries =
+            state.singleChipData.length +
+            state.multiChipData.length +
+            state.multiNodeData.length;
+        return touchedTabs.size > 0;
+    }
+
+    function getShardFacet(tab, field) {
+        return [...new Set(
+            state.shardIndex.shards
+                .filter((shard) => shard.tab === tab)
+                .map((shard) => shard[field])
+                .filter(Boolean)
+        )];
+    }
+
+    // 按当前 tab 的 hardware / model 筛选补齐缺失分片；'all' 会拉取该 tab 的全部分片
+    async function ensureShardsForCurrentView() {
+        if (!state.shardIndex) {
+            return false;
+        }
+
+        const tab = state.currentTab;
+        let loaded = false;
+        if (getDataByTab(tab).length === 0) {
+            const defaultShard = state.shardIndex.tabs?.[tab]?.default_shard;
+            if (!defaultShard) {
+                return false;
+            }
+            loaded = await loadShards([defaultShard]);
+            initializeFilters([tab]);
+        }
+
+        const filters = state.filters[tab];
+        const wanted = state.shardIndex.shards
+            .filter((shard) => shard.tab === tab)
+            .filter((shard) => !filters.hardware || filters.hardware === 'all' || shard.hardware === filters.hardware)
+            .filter((shard) => !filters.model || filters.model === 'all' || shard.model === filters.model)
+            .map((shard) => shard.path);
+        return (await loadShards(wanted)) || loaded;
+    }
+
+    function refreshShardedView() {
+        if (!state.shardIndex) {
+            return;
+        }
+        ensureShardsForCurrentView()
+            .then((loaded) => {
+                if (loaded) {
+                    renderFilters();
+                    renderTable();
+                }
+            })
+            .catch((error) => console.warn('[Leaderboard] Failed to load shard:', error));
+    }
+
     function getWorkloadId(entry) {
         const direct = entry.workload?.name || entry.workload_name || entry.metadata?.workload;
         const normalizedDirect = normalizeWorkloadId(direct);
@@ -826,9 +962,90 @@
         });
     }
 
+    function setDisplaySnapshot(snapshot) {
+        state.displaySnapshot = snapshot;
+        state.displayLookups = {};
+    }
+
+    function getDisplayLookup(tab) {
+        const rows = state.displaySnapshot?.tabs?.[tab];
+        if (!Array.isArray(rows)) {
+            return null;
+        }
+        if (!state.displayLookups[tab]) {
+            const byVariant = new Map();
+            const seriesSize = new Map();
+            rows.forEach((row) => {
+                row.variants.forEach((entryId) => byVariant.set(entryId, row));
+                seriesSize.set(row.series, (seriesSize.get(row.series) || 0) + 1);
+            });
+            state.displayLookups[tab] = { byVariant, seriesSize };
+        }
+        return state.displayLookups[tab];
+    }
+
+    // 使用 leaderboard_display.json 的预计算分组、排序与趋势；
+    // 只要有一个可见 entry 不在快照中或某个分组只部分可见，就返回 null 回退到实时聚合
+    function getPrecomputedDisplayRows(entries, selectedWorkload) {
+        const lookup = getDisplayLookup(state.currentTab);
+        if (!lookup || entries.length === 0) {
+            return null;
+        }
+
+        const byId = new Map();
+        for (const entry of entries) {
+            if (!entry.entry_id || !lookup.byVariant.has(entry.entry_id)) {
+                return null;
+            }
+            byId.set(entry.entry_id, entry);
+        }
+
+        const rows = [];
+        const seen = new Set();
+        for (const entry of entries) {
+            const row = lookup.byVariant.get(entry.entry_id);
+            if (seen.has(row)) {
+                continue;
+            }
+            seen.add(row);
+            const variants = row.variants.map((entryId) => byId.get(entryId));
+            if (variants.some((variant) => !variant) || !byId.has(row.entry_id)) {
+                return null;
+            }
+            rows.push({
+                row,
+                entry: {
+                    ...byId.get(row.entry_id),
+                    displayVersion: row.display_version,
+                    versionVariants: variants,
+                },
+            });
+        }
+
+        const rankField = selectedWorkload === 'all' ? 'all' : 'workload';
+        rows.sort((a, b) => a.row.rank[rankField] - b.row.rank[rankField]);
+        const sortedEntries = rows.map(({ entry }) => entry);
+
+        // 预计算趋势按单条 series（同引擎同配置）的完整版本序列计算，只在当前视图恰好是这条序列时可直接复用
+        const series = rows[0].row.series;
+        const isWholeSeries = selectedWorkload !== 'all' &&
+            rows.every(({ row }) => row.series === series) &&
+            rows.length === lookup.seriesSize.get(series);
+        const withTrends = isWholeSeries
+            ? rows.map(({ row, entry }) => ({
+                ...entry,
+                trends: row.trends,
+                baselineTrends: row.baseline_trends,
+                isBaseline: row.is_baseline,
+            }))
+            : null;
+
+        return { sortedEntries, withTrends };
+    }
+
     // 初始化筛选器默认值（选择第一个可用配置）
-    function initializeFilters() {
-        ['single-chip', 'multi-chip', 'multi-node'].forEach(tab => {
+    function initializeFilters(tabs = ['single-chip', 'multi-chip', 'multi-node']) {
+        tabs.forEach(tab => {
             const data = getDataByTab(tab);
             if (data.length > 0) {
                 const first = data[0];
@@ -861,6 +1078,9 @@
                 selectEl.addEventListener('change', () => {
                     state.filters[state.currentTab][filterType] = selectEl.value;
                     renderTable();
+                    if (filterType === 'hardware' || filterType === 'model') {
+                        refreshShardedView();
+                    }
                 });
             }
         });
@@ -905,6 +1125,7 @@
         renderFilters();
         renderViewControls();
         renderTable();
+        refreshShardedView();
     }
 
     function renderViewControls() {
@@ -928,8 +1149,13 @@
 
         // Extract unique values
         const engineOptions = getUniqueValues(data, d => getEngine(d));
-        const hardwareOptions = getUniqueValues(data, d => d.hardware.chip_model);
-        const modelOptions = getUniqueValues(data, d => d.model.name);
+        // 分片模式下 hardware / model 选项来自 index，未加载的分片也可选
+        const hardwareOptions = state.shardIndex
+            ? getShardFacet(state.currentTab, 'hardware')
+            : getUniqueValues(data, d => d.hardware.chip_model);
+        const modelOptions = state.shardIndex
+            ? getShardFacet(state.currentTab, 'model')
+            : getUniqueValues(data, d => d.model.name);
         const versionOptions = getVersionOptions(data);
         const dynamicWorkloads = getUniqueValues(data, d => getWorkloadId(d));
         const workloadOptions = ['all', 'Q1', 'Q2', 'Q3', 'Q4', 'Q5', 'Q6', 'Q7', 'Q8'];
@@ -1005,8 +1231,13 @@
 
         const comparisonView = applyComparisonView(filtered, viewOptions);
         const visibleEntries = comparisonView.visibleEntries;
-        const mergedEntries = aggregateVersionBuilds(visibleEntries);
-        const sortedFiltered = sortForDisplay(mergedEntries, filters.workload);
+        const precomputed = getPrecomputedDisplayRows(visibleEntries, filters.workload);
+        const mergedEntries = precomputed
+            ? precomputed.sortedEntries
+            : aggregateVersionBuilds(visibleEntries);
+        const sortedFiltered = precomputed
+            ? precomputed.sortedEntries
+            : sortForDisplay(mergedEntries, filters.workload);
 
         renderCoverage(comparisonView);
 
@@ -1023,7 +1254,7 @@
         renderDataStats(data.length, filtered.length, visibleEntries.length, mergedEntries.length, comparisonView);
         renderOverview(sortedFiltered, comparisonView, viewOptions);
 
-        const withTrends = buildTrendRows(sortedFiltered, filters.workload);
+        const withTrends = precomputed?.withTrends || buildTrendRows(sortedFiltered, filters.workload);
 
         // Render rows
         tbody.innerHTML = withTrends.map((entry, index) => {
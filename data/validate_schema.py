@@ -6,12 +6,15 @@ import sys
 from pathlib import Path
 
 try:
-    from jsonschema import Draft7Validator
+    import jsonschema  # noqa: F401
 except ImportError:
     print("❌ Error: jsonschema library not found")
     print("Install with: pip install jsonschema")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+from compiled_schema import FastPathValidator  # noqa: E402
+
 
 def load_schema() -> dict:
     """Load the JSON Schema file."""
@@ -28,7 +31,7 @@ def load_data(file_path: str) -> dict | list[dict]:
 
 def validate_data(data: dict | list[dict], schema: dict) -> tuple[bool, str]:
     """Validate data against schema and return readable diagnostics."""
-    validator = Draft7Validator(schema)
+    validator = FastPathValidator(schema)
     errors = sorted(validator.iter_errors(data), key=lambda error: list(error.path))
     if not errors:
         return True, "✅ Validation passed"
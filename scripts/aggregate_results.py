@@ -4,8 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
+import re
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import UTC, datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -14,12 +23,60 @@ try:
 except ImportError as exc:  # pragma: no cover - environment dependent
     raise SystemExit("jsonschema is required: pip install jsonschema") from exc
 
+from columnar_snapshot import encode_columnar
+from compare_matrix import COMPARE_MATRIX_SCHEMA_VERSION, build_compare_matrix_snapshot
+from compare_stats import build_compare_stats_snapshot, require_numpy
+from compiled_schema import FastPathValidator
+from entry_view import (
+    EntryView,
+    build_idempotency_key,
+    entry_order_key,
+    entry_sort_key,
+    group_by_scope,
+)
+from latency_histogram import fold_run_histograms, with_run_histograms
+from leaderboard_db import sync_db, synced_run_id
+from leaderboard_display import (
+    DISPLAY_SNAPSHOT_SCHEMA_VERSION,
+    DISPLAY_TABS,
+    build_display_snapshot,
+    classify_display_tab,
+)
+from manifest_discovery import discover_manifests
+from pipeline_profile import PipelineProfiler, profile_stage
+from scaling_curves import (
+    SCALING_SNAPSHOT_SCHEMA_VERSION,
+    build_scaling_snapshot,
+    curve_family_key,
+    entry_family_key,
+)
+from snapshot_publish import (
+    publish_snapshots,
+    remove_precompressed,
+    snapshot_hashes,
+    unpublish_snapshots,
+    write_precompressed,
+)
+from snapshot_writer import write_json_array, write_json_document
+
+SchemaValidator = Draft7Validator | FastPathValidator
 
 SUPPORTED_MANIFEST_SCHEMA_VERSIONS = {
     "leaderboard-export-manifest/v1",
     "leaderboard-export-manifest/v2",
 }
 COMPARE_SNAPSHOT_SCHEMA_VERSION = "leaderboard-compare-snapshot/v1"
+INCREMENTAL_STATE_SCHEMA_VERSION = "aggregate-incremental-state/v2"
+SHARD_INDEX_SCHEMA_VERSION = "leaderboard-shard-index/v1"
+SHARD_DIRNAME = "shards"
+# --incremental state lives outside the source tree (``/.cache/`` is ignored).
+STATE_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "aggregate_results"
+# With --jobs, artifacts go to the pool in chunks of ARTIFACT_CHUNK_SIZE and at
+# most ARTIFACT_WINDOW chunks per worker are in flight.
+ARTIFACT_CHUNK_SIZE = 64
+ARTIFACT_WINDOW = 4
+# Stored with each artifact fingerprint, see ``entry_groups``.
+GROUP_FIELDS = ("key", "scope", "family", "tab")
 
 
 def load_schema(schema_path: Path) -> dict[str, Any]:
@@ -27,7 +84,7 @@ def load_schema(schema_path: Path) -> dict[str, Any]:
 
 
 def validate_entry(
-    entry: dict[str, Any], validator: Draft7Validator, *, source: Path
+    entry: dict[str, Any], validator: SchemaValidator, *, source: Path
 ) -> dict[str, Any]:
     errors = sorted(validator.iter_errors(entry), key=lambda error: list(error.path))
     if errors:
@@ -41,100 +98,8 @@ def validate_entry(
 def prefer_newer_entry(
     current: dict[str, Any], candidate: dict[str, Any]
 ) -> dict[str, Any]:
-    def parse_timestamp(entry: dict[str, Any]) -> int:
-        metadata = entry.get("metadata") or {}
-        for field in ("submitted_at", "release_date"):
-            raw = metadata.get(field)
-            if isinstance(raw, str) and raw:
-                try:
-                    return int(
-                        datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp()
-                    )
-                except ValueError:
-                    continue
-        return 0
-
-    current_ts = parse_timestamp(current)
-    candidate_ts = parse_timestamp(candidate)
-    if candidate_ts != current_ts:
-        return candidate if candidate_ts > current_ts else current
-
-    current_tps = float(current.get("metrics", {}).get("throughput_tps") or 0.0)
-    candidate_tps = float(candidate.get("metrics", {}).get("throughput_tps") or 0.0)
-    if candidate_tps != current_tps:
-        return candidate if candidate_tps > current_tps else current
-    return current
-
-
-def build_idempotency_key(entry: dict[str, Any]) -> str:
-    metadata = entry.get("metadata") or {}
-    key = metadata.get("idempotency_key")
-    if not isinstance(key, str) or not key.strip():
-        raise ValueError("leaderboard entry is missing metadata.idempotency_key")
-    return key
-
-
-def extract_workload_name(entry: dict[str, Any]) -> str:
-    workload = entry.get("workload") or {}
-    if isinstance(workload, dict):
-        for key in ("name", "workload_id", "suite_id"):
-            value = workload.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-
-    notes = str((entry.get("metadata") or {}).get("notes") or "")
-    for workload_name in ("Q1", "Q2", "Q3", "Q4", "Q5", "Q6", "Q7", "Q8"):
-        if workload_name in notes.upper():
-            return workload_name
-    return "LEGACY"
-
-
-def build_compare_scope_key(entry: dict[str, Any]) -> str:
-    model = str((entry.get("model") or {}).get("name") or "unknown-model")
-    hardware = str(
-        (entry.get("hardware") or {}).get("chip_model") or "unknown-hardware"
-    )
-    precision = str((entry.get("model") or {}).get("precision") or "unknown-precision")
-    workload = extract_workload_name(entry)
-    config_type = str(entry.get("config_type") or "unknown-config")
-    chip_count = int((entry.get("hardware") or {}).get("chip_count") or 0)
-    node_count = int((entry.get("cluster") or {}).get("node_count") or 1)
-    return "|".join(
-        [
-            model,
-            hardware,
-            precision,
-            workload,
-            config_type,
-            str(chip_count),
-            str(node_count),
-        ]
-    )
-
-
-def build_compare_engine_summary(entry: dict[str, Any]) -> dict[str, Any]:
-    metrics = entry.get("metrics") or {}
-    metadata = entry.get("metadata") or {}
-    return {
-        "engine": str(entry.get("engine") or metadata.get("engine") or "unknown"),
-        "engine_version": str(
-            entry.get("engine_version") or metadata.get("engine_version") or "unknown"
-        ),
-        "entry_id": str(entry.get("entry_id") or ""),
-        "submitted_at": metadata.get("submitted_at"),
-        "canonical_path": entry.get("canonical_path"),
-        "metrics": {
-            "ttft_ms": float(metrics.get("ttft_ms") or 0.0),
-            "tbt_ms": float(metrics.get("tbt_ms") or 0.0),
-            "throughput_tps": float(metrics.get("throughput_tps") or 0.0),
-            "output_throughput_tps": float(
-                metrics.get("output_throughput_tps")
-                or metrics.get("throughput_tps")
-                or 0.0
-            ),
-            "error_rate": float(metrics.get("error_rate") or 0.0),
-        },
-    }
+    """The entry with the larger ``entry_sort_key``; ``current`` on a tie."""
+    return candidate if entry_sort_key(candidate) > entry_sort_key(current) else current
 
 
 def compute_relative_delta(
@@ -204,71 +169,29 @@ def select_preferred_pair(
     return None
 
 
-def build_compare_snapshot(entries: list[dict[str, Any]]) -> dict[str, Any]:
-    grouped: dict[str, dict[str, Any]] = {}
-    for entry in entries:
-        scope_key = build_compare_scope_key(entry)
-        group = grouped.setdefault(
-            scope_key,
-            {
-                "scope_key": scope_key,
-                "scope": {
-                    "model": str(
-                        (entry.get("model") or {}).get("name") or "unknown-model"
-                    ),
-                    "hardware": str(
-                        (entry.get("hardware") or {}).get("chip_model")
-                        or "unknown-hardware"
-                    ),
-                    "precision": str(
-                        (entry.get("model") or {}).get("precision")
-                        or "unknown-precision"
-                    ),
-                    "workload": extract_workload_name(entry),
-                    "config_type": str(entry.get("config_type") or "unknown-config"),
-                    "chip_count": int(
-                        (entry.get("hardware") or {}).get("chip_count") or 0
-                    ),
-                    "node_count": int(
-                        (entry.get("cluster") or {}).get("node_count") or 1
-                    ),
-                },
-                "category": "multi"
-                if int((entry.get("cluster") or {}).get("node_count") or 1) > 1
-                else "single",
-                "entries_by_engine": {},
-            },
-        )
-        engine = str(
-            entry.get("engine")
-            or (entry.get("metadata") or {}).get("engine")
-            or "unknown"
-        )
-        existing = group["entries_by_engine"].get(engine)
-        group["entries_by_engine"][engine] = (
-            prefer_newer_entry(existing, entry) if existing is not None else entry
-        )
-
+def build_compare_snapshot(
+    entries: Iterable[dict[str, Any] | EntryView],
+) -> dict[str, Any]:
+    grouped = group_by_scope(entries)
     groups_payload: list[dict[str, Any]] = []
     preferred_pairs: list[dict[str, Any]] = []
     for group in grouped.values():
-        representative_entries = list(group["entries_by_engine"].values())
-        if len(representative_entries) < 2:
+        representatives = list(group["entries_by_engine"].values())
+        if len(representatives) < 2:
             continue
-        preferred_pair = select_preferred_pair(representative_entries)
+        views_by_id = {id(view.entry): view for view in representatives}
+        preferred_pair = select_preferred_pair([view.entry for view in representatives])
         if preferred_pair is None:
             continue
 
         left_entry, right_entry = preferred_pair
-        left_summary = build_compare_engine_summary(left_entry)
-        right_summary = build_compare_engine_summary(right_entry)
+        left_summary = views_by_id[id(left_entry)].compare_summary()
+        right_summary = views_by_id[id(right_entry)].compare_summary()
         payload = {
             "scope_key": group["scope_key"],
             "category": group["category"],
             "scope": group["scope"],
-            "engines": [
-                build_compare_engine_summary(item) for item in representative_entries
-            ],
+            "engines": [view.compare_summary() for view in representatives],
             "preferred_pair": {
                 "left": left_summary,
                 "right": right_summary,
@@ -285,6 +208,14 @@ def build_compare_snapshot(entries: list[dict[str, Any]]) -> dict[str, Any]:
                         left_summary["metrics"]["tbt_ms"],
                         right_summary["metrics"]["tbt_ms"],
                     ),
+                    "ttft_p99_pct_left_vs_right": compute_relative_delta(
+                        left_summary["metrics"]["ttft_p99_ms"],
+                        right_summary["metrics"]["ttft_p99_ms"],
+                    ),
+                    "tbt_p99_pct_left_vs_right": compute_relative_delta(
+                        left_summary["metrics"]["tbt_p99_ms"],
+                        right_summary["metrics"]["tbt_p99_ms"],
+                    ),
                 },
                 "winners": {
                     "throughput": metric_winner(
@@ -302,6 +233,16 @@ def build_compare_snapshot(entries: list[dict[str, Any]]) -> dict[str, Any]:
                         right_summary["metrics"]["tbt_ms"],
                         higher_is_better=False,
                     ),
+                    "ttft_p99": metric_winner(
+                        left_summary["metrics"]["ttft_p99_ms"],
+                        right_summary["metrics"]["ttft_p99_ms"],
+                        higher_is_better=False,
+                    ),
+                    "tbt_p99": metric_winner(
+                        left_summary["metrics"]["tbt_p99_ms"],
+                        right_summary["metrics"]["tbt_p99_ms"],
+                        higher_is_better=False,
+                    ),
                 },
             },
         }
@@ -324,16 +265,339 @@ def build_compare_snapshot(entries: list[dict[str, Any]]) -> dict[str, Any]:
     }
 
 
-def load_manifest_entries(
-    source_dir: Path, validator: Draft7Validator
-) -> list[dict[str, Any]]:
-    manifest_files = sorted(source_dir.rglob("leaderboard_manifest.json"))
-    if not manifest_files:
-        raise ValueError(f"No leaderboard_manifest.json found under: {source_dir}")
+def compute_schema_digest(schema: dict[str, Any]) -> str:
+    return hashlib.sha256(
+        json.dumps(schema, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    ).hexdigest()
+
+
+def default_state_path(source_dir: Path) -> Path:
+    """``--state-file`` default: one file per source dir under ``STATE_CACHE_DIR``."""
+    digest = hashlib.sha256(str(source_dir.resolve()).encode("utf-8")).hexdigest()
+    return STATE_CACHE_DIR / f"{digest[:16]}.json"
 
-    entries: list[dict[str, Any]] = []
+
+def load_incremental_state(state_path: Path, schema_digest: str) -> dict[str, Any]:
+    """Load the artifact fingerprints, discarding them when the schema or format
+    changed."""
+    empty = {
+        "schema_version": INCREMENTAL_STATE_SCHEMA_VERSION,
+        "schema_digest": schema_digest,
+        "artifacts": {},
+    }
+    if not state_path.is_file():
+        return empty
+    try:
+        payload = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return empty
+    if (
+        not isinstance(payload, dict)
+        or payload.get("schema_version") != INCREMENTAL_STATE_SCHEMA_VERSION
+        or payload.get("schema_digest") != schema_digest
+        or not isinstance(payload.get("artifacts"), dict)
+    ):
+        return empty
+    return payload
+
+
+def write_incremental_state(state_path: Path, state: dict[str, Any]) -> None:
+    write_json_document(state_path, state, indent=None, separators=(",", ":"))
+
+
+def entry_groups(entry: dict[str, Any]) -> dict[str, str]:
+    """The snapshot groups ``entry`` feeds, kept next to its fingerprint: its
+    idempotency key, compare scope, scaling family and display tab."""
+    view = EntryView(entry)
+    return {
+        "key": build_idempotency_key(entry),
+        "scope": view.scope_key,
+        "family": entry_family_key(view),
+        "tab": classify_display_tab(entry),
+    }
+
+
+def fingerprint_manifests(manifest_files: list[Path]) -> dict[str, list[int]]:
+    fingerprints = {}
+    for path in manifest_files:
+        stat = path.stat()
+        fingerprints[str(path)] = [stat.st_mtime_ns, stat.st_size]
+    return fingerprints
+
+
+def artifacts_unchanged(artifacts: dict[str, dict[str, Any]]) -> bool:
+    """Whether every fingerprinted artifact still has its mtime and size."""
+    for path, fingerprint in artifacts.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) != (
+            fingerprint["mtime_ns"],
+            fingerprint["size"],
+        ):
+            return False
+    return True
+
+
+def dirty_groups(
+    previous: dict[str, dict[str, Any]], current: dict[str, dict[str, Any]]
+) -> dict[str, set[str]]:
+    """Scopes, scaling families and display tabs that may differ between the
+    runs that recorded the artifact fingerprints ``previous`` and ``current``.
+
+    Changed, added and removed artifacts mark their groups, before and after.
+    Dedup picks one winner per idempotency key across groups, so the groups
+    of unchanged artifacts sharing one of their keys are marked too.
+    """
+    touched: list[dict[str, Any]] = []
+    for path in previous.keys() | current.keys():
+        before, after = previous.get(path), current.get(path)
+        if before is None or after is None or before["sha256"] != after["sha256"]:
+            touched.extend(record for record in (before, after) if record is not None)
+    keys = {record["key"] for record in touched}
+    records = [*touched, *(item for item in current.values() if item["key"] in keys)]
+    return {
+        field: {record[field] for record in records}
+        for field in ("scope", "family", "tab")
+    }
+
+
+def marker_fingerprint(output_dir: Path) -> dict[str, Any] | None:
+    """Identifies the ``last_updated.json`` a run wrote, to tell whether the
+    snapshots next to it are still that run's."""
+    marker = output_dir / "last_updated.json"
+    try:
+        raw = marker.read_bytes()
+        mtime_ns = marker.stat().st_mtime_ns
+    except OSError:
+        return None
+    return {"mtime_ns": mtime_ns, "sha256": hashlib.sha256(raw).hexdigest()}
+
+
+def load_previous_snapshots(output_dir: Path) -> dict[str, dict[str, Any]] | None:
+    """The grouped snapshots of the last run, or ``None`` if one is unusable."""
+    previous = {}
+    for name, schema_version in (
+        ("leaderboard_compare.json", COMPARE_SNAPSHOT_SCHEMA_VERSION),
+        ("leaderboard_compare_v2.json", COMPARE_MATRIX_SCHEMA_VERSION),
+        ("leaderboard_scaling.json", SCALING_SNAPSHOT_SCHEMA_VERSION),
+        ("leaderboard_display.json", DISPLAY_SNAPSHOT_SCHEMA_VERSION),
+    ):
+        try:
+            payload = json.loads((output_dir / name).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("schema_version") != (
+            schema_version
+        ):
+            return None
+        previous[name] = payload
+    return previous
+
+
+def reuse_clean_groups(
+    previous: dict[str, Any],
+    fresh: dict[str, Any],
+    dirty: set[str],
+    *,
+    group_key: Callable[[dict[str, Any]], str],
+    lists: dict[str, str],
+    sort_key: Callable[[dict[str, Any]], Any],
+) -> dict[str, Any]:
+    """``fresh``, built from the ``dirty`` groups only, plus every group of
+    ``previous`` outside them. ``lists`` maps each group list to its count."""
+    for field, count in lists.items():
+        kept = [item for item in previous[field] if group_key(item) not in dirty]
+        fresh[field] = sorted([*kept, *fresh[field]], key=sort_key)
+        fresh[count] = len(fresh[field])
+    return fresh
+
+
+def build_group_snapshots(
+    views: list[EntryView],
+    *,
+    previous: dict[str, dict[str, Any]] | None = None,
+    dirty: dict[str, set[str]] | None = None,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """The compare, compare_v2 and scaling snapshots.
+
+    With ``previous`` (see ``load_previous_snapshots``) and ``dirty`` (see
+    ``dirty_groups``) only the dirty scopes and families are rebuilt; the
+    output equals a full rebuild.
+    """
+    if previous is None or dirty is None:
+        return (
+            build_compare_snapshot(views),
+            build_compare_matrix_snapshot(views),
+            build_scaling_snapshot(views),
+        )
+    scopes, families = dirty["scope"], dirty["family"]
+    in_scope = [view for view in views if view.scope_key in scopes]
+    compare = reuse_clean_groups(
+        previous["leaderboard_compare.json"],
+        build_compare_snapshot(in_scope),
+        scopes,
+        group_key=lambda item: item["scope_key"],
+        lists={"groups": "group_count", "preferred_pairs": "preferred_pair_count"},
+        sort_key=lambda item: str(item.get("scope_key") or ""),
+    )
+    compare_matrix = reuse_clean_groups(
+        previous["leaderboard_compare_v2.json"],
+        build_compare_matrix_snapshot(in_scope),
+        scopes,
+        group_key=lambda item: item["scope_key"],
+        lists={"groups": "group_count"},
+        sort_key=lambda item: item["scope_key"],
+    )
+    scaling = reuse_clean_groups(
+        previous["leaderboard_scaling.json"],
+        build_scaling_snapshot(
+            [view for view in views if entry_family_key(view) in families]
+        ),
+        families,
+        group_key=curve_family_key,
+        lists={"curves": "curve_count"},
+        sort_key=lambda item: (item["scope_key"], item["engine"]),
+    )
+    return compare, compare_matrix, scaling
+
+
+def build_display(
+    entries: list[dict[str, Any]],
+    *,
+    previous: dict[str, Any] | None = None,
+    tabs: set[str] | None = None,
+) -> dict[str, Any]:
+    """``build_display_snapshot``; with ``previous`` only ``tabs`` are rebuilt.
+
+    Ranks and trends span a whole tab, so a tab is the smallest unit.
+    """
+    if previous is None or tabs is None:
+        return build_display_snapshot(entries)
+    display = build_display_snapshot(
+        entry for entry in entries if classify_display_tab(entry) in tabs
+    )
+    rebuilt = display["tabs"]
+    display["tabs"] = {
+        tab: rows
+        for tab in DISPLAY_TABS
+        if (rows := rebuilt.get(tab) if tab in tabs else previous["tabs"].get(tab))
+    }
+    display["row_count"] = sum(len(rows) for rows in display["tabs"].values())
+    return display
+
+
+def parse_artifact(
+    raw: bytes, validator: SchemaValidator, *, source: Path
+) -> dict[str, Any]:
+    payload = json.loads(raw.decode("utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError(
+            f"{source}: standard leaderboard artifact must be a JSON object"
+        )
+    return validate_entry(payload, validator, source=source)
+
+
+def load_artifact(
+    artifact_path: Path,
+    validator: SchemaValidator,
+    *,
+    known_digest: str | None = None,
+) -> tuple[dict[str, Any], str, bool]:
+    """Read, hash and validate one artifact.
+
+    Returns ``(entry, digest, validated)``. Validation is skipped when the
+    content hashes to ``known_digest``: an earlier run already validated it.
+    """
+    raw = artifact_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    if known_digest is not None and digest == known_digest:
+        return json.loads(raw), digest, False
+    return parse_artifact(raw, validator, source=artifact_path), digest, True
+
+
+_worker_validator: SchemaValidator | None = None
+
+
+def _init_artifact_worker(schema: dict[str, Any]) -> None:
+    global _worker_validator
+    _worker_validator = FastPathValidator(schema)
+
+
+def _load_artifact_in_worker(
+    task: tuple[Path, str | None],
+) -> tuple[dict[str, Any], str, bool]:
+    artifact_path, known_digest = task
+    assert _worker_validator is not None
+    return load_artifact(artifact_path, _worker_validator, known_digest=known_digest)
+
+
+def _load_artifact_timed(
+    artifact_path: Path, validator: SchemaValidator, known_digest: str | None
+) -> tuple[dict[str, Any], str, bool, tuple[int, int, int]]:
+    started = time.perf_counter_ns()
+    entry, digest, validated = load_artifact(
+        artifact_path, validator, known_digest=known_digest
+    )
+    return entry, digest, validated, (started, time.perf_counter_ns(), os.getpid())
+
+
+def _load_artifact_timed_in_worker(
+    task: tuple[Path, str | None],
+) -> tuple[dict[str, Any], str, bool, tuple[int, int, int]]:
+    artifact_path, known_digest = task
+    assert _worker_validator is not None
+    return _load_artifact_timed(artifact_path, _worker_validator, known_digest)
+
+
+def _load_chunk_in_worker(load: Callable[[Any], Any], chunk: list[Any]) -> list[Any]:
+    return [load(task) for task in chunk]
+
+
+def _bounded_map(
+    executor: ProcessPoolExecutor,
+    load: Callable[[Any], Any],
+    tasks: Iterable[Any],
+    *,
+    jobs: int,
+) -> Iterator[Any]:
+    """``executor.map`` in order, with at most ``jobs * ARTIFACT_WINDOW`` chunks
+    submitted and not yet consumed, so parsed entries never pile up ahead of
+    the consumer."""
+    it = iter(tasks)
+    in_flight: deque[Future[list[Any]]] = deque()
+    while True:
+        while len(in_flight) < jobs * ARTIFACT_WINDOW:
+            chunk = list(islice(it, ARTIFACT_CHUNK_SIZE))
+            if not chunk:
+                break
+            in_flight.append(executor.submit(_load_chunk_in_worker, load, chunk))
+        if not in_flight:
+            return
+        yield from in_flight.popleft().result()
+
+
+def _iter_manifest_records(
+    manifest_files: list[Path],
+    profiler: PipelineProfiler | None = None,
+) -> Iterator[tuple[Path, dict[str, Any], Path]]:
     for manifest_path in manifest_files:
-        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if profiler is not None:
+            started = time.perf_counter_ns()
+            raw = manifest_path.read_bytes()
+            payload = json.loads(raw)
+            profiler.count("manifests_read")
+            profiler.count("bytes_read", len(raw))
+            profiler.span(
+                str(manifest_path),
+                started,
+                time.perf_counter_ns(),
+                category="manifest",
+                args={"bytes": len(raw), "records": len(payload.get("entries") or [])},
+            )
+        else:
+            payload = json.loads(manifest_path.read_text(encoding="utf-8"))
         if payload.get("schema_version") not in SUPPORTED_MANIFEST_SCHEMA_VERSIONS:
             raise ValueError(
                 f"{manifest_path}: unsupported schema_version {payload.get('schema_version')!r}"
@@ -357,84 +621,500 @@ def load_manifest_entries(
                 raise ValueError(
                     f"{manifest_path}: missing leaderboard artifact {artifact_path}"
                 )
+            yield manifest_path, record, artifact_path
 
-            payload = json.loads(artifact_path.read_text(encoding="utf-8"))
-            if not isinstance(payload, dict):
-                raise ValueError(
-                    f"{artifact_path}: standard leaderboard artifact must be a JSON object"
-                )
 
-            validated = validate_entry(payload, validator, source=artifact_path)
+def load_manifest_entries(
+    source_dir: Path,
+    validator: SchemaValidator,
+    *,
+    state: dict[str, Any] | None = None,
+    jobs: int = 1,
+    profiler: PipelineProfiler | None = None,
+    changed: list[dict[str, Any]] | None = None,
+    manifest_files: list[Path] | None = None,
+) -> list[dict[str, Any]]:
+    """Load and validate every artifact referenced by manifests under source_dir.
+
+    The list form of ``iter_manifest_entries``; see there for the options.
+    """
+    return list(
+        iter_manifest_entries(
+            source_dir,
+            validator,
+            state=state,
+            jobs=jobs,
+            profiler=profiler,
+            changed=changed,
+            manifest_files=manifest_files,
+        )
+    )
+
+
+def iter_manifest_entries(
+    source_dir: Path,
+    validator: SchemaValidator,
+    *,
+    state: dict[str, Any] | None = None,
+    jobs: int = 1,
+    profiler: PipelineProfiler | None = None,
+    changed: list[dict[str, Any]] | None = None,
+    manifest_files: list[Path] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield each validated artifact referenced by manifests under source_dir.
+
+    Entries are yielded in manifest order as they are parsed, so a consumer
+    that keeps only some of them (``split_entries`` keeps one per
+    idempotency key) never holds the whole artifact tree. Errors are raised
+    when the generator reaches the failing artifact; ``state`` is updated once
+    it is exhausted.
+
+    When ``state`` is given (see ``load_incremental_state``), artifacts whose
+    content hash matches its fingerprint are parsed without schema validation,
+    and the fingerprints are replaced with the artifacts seen in this run, so
+    removed artifacts drop out of the next aggregation. Only fingerprints and
+    ``entry_groups`` are kept; the artifacts themselves are the store the
+    entries are read from.
+
+    With ``jobs > 1`` artifacts are parsed and validated in a process pool.
+    Results are consumed in manifest order, so the returned list and the first
+    error raised are the same as for the serial path. Only a bounded window of
+    chunks is submitted ahead of the consumer (see ``_bounded_map``), so
+    ``--stream`` stays memory-bounded with ``--jobs``.
+
+    ``profiler`` receives a trace span per manifest and per parsed artifact and
+    the ``bytes_read`` / ``entries_validated`` / ``artifacts_reused`` counters.
+
+    Entries validated in this run (not matched by ``state``) are also appended to
+    ``changed`` when it is given. ``manifest_files`` defaults to
+    ``discover_manifests(source_dir)`` without pruning or cache.
+    """
+    if manifest_files is None:
+        manifest_files, _ = discover_manifests(source_dir)
+    if not manifest_files:
+        raise ValueError(f"No leaderboard_manifest.json found under: {source_dir}")
+
+    # Manifests are cheap to read, so they are planned up front; a manifest
+    # error is only raised once every artifact listed before it has loaded.
+    planned: list[tuple[Path, dict[str, Any], Path]] = []
+    planning_error: ValueError | None = None
+    try:
+        planned.extend(_iter_manifest_records(manifest_files, profiler))
+    except ValueError as exc:
+        planning_error = exc
+
+    cache = state.get("artifacts") if state is not None else None
+    fresh_cache: dict[str, dict[str, Any]] = {}
+    stats: list[os.stat_result | None] = []
+    tasks: list[tuple[Path, str | None]] = []
+    for _, _, artifact_path in planned:
+        cached = cache.get(str(artifact_path)) if cache is not None else None
+        tasks.append((artifact_path, cached.get("sha256") if cached else None))
+        stats.append(artifact_path.stat() if cache is not None else None)
+
+    if jobs > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_artifact_worker,
+            initargs=(validator.schema,),
+        )
+        loaded = _bounded_map(
+            executor,
+            _load_artifact_in_worker
+            if profiler is None
+            else _load_artifact_timed_in_worker,
+            tasks,
+            jobs=jobs,
+        )
+    elif profiler is None:
+        executor = None
+        loaded = (
+            load_artifact(path, validator, known_digest=digest)
+            for path, digest in tasks
+        )
+    else:
+        executor = None
+        loaded = (
+            _load_artifact_timed(path, validator, digest) for path, digest in tasks
+        )
+
+    entry_count = 0
+    reused_count = 0
+    try:
+        for (manifest_path, record, artifact_path), stat in zip(planned, stats):
+            if profiler is None:
+                entry, digest, validated = next(loaded)
+            else:
+                entry, digest, validated, (started, ended, pid) = next(loaded)
+                size = (
+                    stat.st_size if stat is not None else artifact_path.stat().st_size
+                )
+                profiler.count("bytes_read", size)
+                profiler.count("entries_validated" if validated else "artifacts_reused")
+                profiler.span(
+                    str(artifact_path),
+                    started,
+                    ended,
+                    category="artifact",
+                    pid=pid,
+                    args={"bytes": size, "validated": validated},
+                )
+            if not validated:
+                reused_count += 1
+            elif changed is not None:
+                changed.append(entry)
+            if stat is not None:
+                previous = cache.get(str(artifact_path)) if not validated else None
+                fresh_cache[str(artifact_path)] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": digest,
+                    **(
+                        {field: previous[field] for field in GROUP_FIELDS}
+                        if previous is not None
+                        else entry_groups(entry)
+                    ),
+                }
 
             expected_key = record.get("idempotency_key")
-            if expected_key != build_idempotency_key(validated):
+            if expected_key != build_idempotency_key(entry):
                 raise ValueError(
                     f"{artifact_path}: metadata.idempotency_key mismatch with {manifest_path}"
                 )
 
-            entries.append(validated)
-    return entries
+            entry_count += 1
+            yield entry
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if planning_error is not None:
+        raise planning_error
+
+    if state is not None:
+        state["artifacts"] = fresh_cache
+        state["last_run"] = {
+            "artifact_count": entry_count,
+            "reused": reused_count,
+            "reloaded": entry_count - reused_count,
+        }
 
 
 def split_entries(
-    entries: list[dict[str, Any]],
+    entries: Iterable[dict[str, Any]],
+    profiler: PipelineProfiler | None = None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    deduped: dict[str, dict[str, Any]] = {}
+    """Dedup by idempotency key and split into single / multi-node entries.
+
+    Dedup stores each key's first entry as is; ``entry_sort_key`` is only
+    computed when a later entry collides with it. When several runs of a key
+    carry ``metrics.latency_histograms``, the kept entry is replaced by a copy
+    with the histograms merged across those runs. ``EntryView``s are left to
+    the compare pass, which is the first one to read more than the key.
+    """
+    # Per key: [sort key of the kept entry, filled in on the first collision,
+    # kept entry].
+    deduped: dict[str, list[Any]] = {}
+    # Latency histograms of keys that collided; see ``_fold_latency_run``.
+    latency_runs: dict[str, list[Any]] = {}
+    total = 0
     for entry in entries:
+        total += 1
         key = build_idempotency_key(entry)
-        current = deduped.get(key)
-        deduped[key] = (
-            prefer_newer_entry(current, entry) if current is not None else entry
-        )
+        slot = deduped.get(key)
+        if slot is None:
+            deduped[key] = [None, entry]
+            continue
+        current_key, current = slot
+        if current_key is None:
+            current_key = slot[0] = entry_sort_key(current)
+            if (current.get("metrics") or {}).get("latency_histograms"):
+                _fold_latency_run(latency_runs, key, current)
+        if (entry.get("metrics") or {}).get("latency_histograms"):
+            _fold_latency_run(latency_runs, key, entry)
+        candidate_key = entry_sort_key(entry)
+        if candidate_key > current_key:
+            slot[0] = candidate_key
+            slot[1] = entry
+    if profiler is not None:
+        profiler.count("duplicates_dropped", total - len(deduped))
 
     single: list[dict[str, Any]] = []
     multi: list[dict[str, Any]] = []
-    for entry in deduped.values():
-        node_count = int((entry.get("cluster") or {}).get("node_count") or 1)
-        if node_count > 1:
+    # ``entry_order_key`` per entry, reusing the timestamp of collided keys.
+    single_order: list[tuple[str, str, str, int]] = []
+    multi_order: list[tuple[str, str, str, int]] = []
+    for key, (sort_key, entry) in deduped.items():
+        state = latency_runs.get(key) if latency_runs else None
+        if state is not None and len(state[1]) + state[2] > 1:
+            # Repeat runs pool their latency samples into the kept entry.
+            entry = with_run_histograms(entry, state[0], len(state[1]) + state[2])
+        order = entry_order_key(entry, sort_key[0] if sort_key else None)
+        cluster = entry.get("cluster")
+        if cluster and int(cluster.get("node_count") or 1) > 1:
             multi.append(entry)
+            multi_order.append(order)
         else:
             single.append(entry)
+            single_order.append(order)
+    return _sorted_by(single, single_order), _sorted_by(multi, multi_order)
 
-    def sort_key(item: dict[str, Any]) -> tuple[str, str, str, str]:
-        return (
-            str(item.get("engine") or ""),
-            str(item.get("model", {}).get("name") or ""),
-            str(item.get("workload", {}).get("name") or ""),
-            str(item.get("metadata", {}).get("submitted_at") or ""),
+
+def _sorted_by(
+    entries: list[dict[str, Any]], keys: list[tuple[str, str, str, int]]
+) -> list[dict[str, Any]]:
+    """``entries`` stably sorted by the parallel ``keys``."""
+    return [entries[index] for index in sorted(range(len(keys)), key=keys.__getitem__)]
+
+
+def _fold_latency_run(
+    latency_runs: dict[str, list[Any]], key: str, entry: dict[str, Any]
+) -> None:
+    """Fold ``entry``'s latency histograms into ``latency_runs[key]``.
+
+    The state is ``[merged histograms, entry_ids seen, runs without an
+    entry_id]``: one running merge per key instead of every run's histograms,
+    and a listed-twice entry_id is only counted once.
+    """
+    histograms = (entry.get("metrics") or {}).get("latency_histograms")
+    if not histograms:
+        return
+    state = latency_runs.get(key)
+    if state is None:
+        state = latency_runs[key] = [None, set(), 0]
+    entry_id = entry.get("entry_id")
+    if entry_id:
+        if entry_id in state[1]:
+            return
+        state[1].add(entry_id)
+    else:
+        state[2] += 1
+    state[0] = fold_run_histograms(state[0], histograms)
+
+
+def _slugify(value: str) -> str:
+    slug = re.sub(r"[^a-z0-9._-]+", "-", value.strip().lower()).strip("-")
+    return re.sub(r"-+", "-", slug) or "unknown"
+
+
+def build_shard_path(tab: str, hardware: str, model: str) -> str:
+    digest = hashlib.sha1(f"{hardware}\0{model}".encode()).hexdigest()[:8]
+    return f"{tab}/{_slugify(hardware)}__{_slugify(model)}-{digest}.json"
+
+
+def build_shard_sidecar_path(path: str, kind: str) -> str:
+    return f"{path.removesuffix('.json')}.{kind}.json"
+
+
+def build_shard_layout(
+    entries: Iterable[dict[str, Any]],
+    *,
+    compare: dict[str, Any] | None = None,
+    display: dict[str, Any] | None = None,
+) -> tuple[dict[str, Any], dict[str, list[dict[str, Any]]]]:
+    """Group entries into one shard per display tab + hardware + model.
+
+    A shard holds every engine for its hardware/model pair, so each compare
+    scope is complete inside a single shard and the page can render from it
+    alone. The index carries enough facets to fill the hardware/model filters
+    without fetching any shard.
+
+    With ``compare`` / ``display``, each shard also gets the compare groups
+    and display rows of its entries in ``<shard>.compare.json`` /
+    ``<shard>.display.json`` (``compare_path`` / ``display_path`` in the
+    index), so the page never needs the full snapshots. Display rows keep
+    their tab-wide ``rank``. Returns the index and every file by path.
+    """
+    shards: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        tab = classify_display_tab(entry)
+        hardware = str((entry.get("hardware") or {}).get("chip_model") or "")
+        model = str((entry.get("model") or {}).get("name") or "")
+        path = build_shard_path(tab, hardware, model)
+        shard = shards.setdefault(
+            path,
+            {
+                "path": path,
+                "tab": tab,
+                "hardware": hardware,
+                "model": model,
+                "engines": set(),
+                "precisions": set(),
+                "entries": [],
+            },
         )
+        shard["engines"].add(
+            str(
+                entry.get("engine")
+                or (entry.get("metadata") or {}).get("engine")
+                or "unknown"
+            )
+        )
+        shard["precisions"].add(str((entry.get("model") or {}).get("precision") or ""))
+        shard["entries"].append(entry)
+
+    files = {path: shard["entries"] for path, shard in shards.items()}
+    sidecars: dict[str, dict[str, list[dict[str, Any]]]] = {}
+    if compare is not None or display is not None:
+        # A compare scope and a display series never span two shards.
+        shard_by_scope = {}
+        shard_by_entry = {}
+        for path, shard in shards.items():
+            for entry in shard["entries"]:
+                shard_by_scope[EntryView(entry).scope_key] = path
+                shard_by_entry[entry.get("entry_id")] = path
+        for path in shards:
+            sidecars[path] = {}
+            if compare is not None:
+                sidecars[path]["compare"] = []
+            if display is not None:
+                sidecars[path]["display"] = []
+        if compare is not None:
+            for group in compare["groups"]:
+                sidecars[shard_by_scope[group["scope_key"]]]["compare"].append(group)
+        if display is not None:
+            for rows in display["tabs"].values():
+                for row in rows:
+                    sidecars[shard_by_entry[row["entry_id"]]]["display"].append(row)
 
-    single.sort(key=sort_key)
-    multi.sort(key=sort_key)
-    return single, multi
+    descriptors: list[dict[str, Any]] = []
+    tabs: dict[str, dict[str, Any]] = {}
+    for path in sorted(shards):
+        shard = shards[path]
+        descriptor = {
+            "path": path,
+            "tab": shard["tab"],
+            "hardware": shard["hardware"],
+            "model": shard["model"],
+            "entry_count": len(shard["entries"]),
+            "engines": sorted(shard["engines"]),
+            "precisions": sorted(shard["precisions"]),
+        }
+        for kind, items in sidecars.get(path, {}).items():
+            descriptor[f"{kind}_path"] = build_shard_sidecar_path(path, kind)
+            files[descriptor[f"{kind}_path"]] = items
+        descriptors.append(descriptor)
+        summary = tabs.setdefault(
+            shard["tab"], {"entry_count": 0, "shard_count": 0, "default_shard": None}
+        )
+        summary["entry_count"] += descriptor["entry_count"]
+        summary["shard_count"] += 1
+
+    for tab, summary in tabs.items():
+        # Default to the shard with the widest engine coverage, then the most rows.
+        candidates = [item for item in descriptors if item["tab"] == tab]
+        summary["default_shard"] = max(
+            candidates,
+            key=lambda item: (len(item["engines"]), item["entry_count"]),
+        )["path"]
+
+    index = {
+        "schema_version": SHARD_INDEX_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "entry_count": sum(item["entry_count"] for item in descriptors),
+        "tabs": {tab: tabs[tab] for tab in DISPLAY_TABS if tab in tabs},
+        "shards": descriptors,
+    }
+    return index, files
+
+
+def write_shards(
+    output_dir: Path,
+    entries: Iterable[dict[str, Any]],
+    *,
+    compare: dict[str, Any] | None = None,
+    display: dict[str, Any] | None = None,
+    precompress: bool = False,
+) -> dict[str, Any]:
+    shard_dir = output_dir / SHARD_DIRNAME
+    index, shard_files = build_shard_layout(entries, compare=compare, display=display)
+    for path, items in shard_files.items():
+        write_json_array(shard_dir / path, items)
+        if precompress:
+            write_precompressed(shard_dir / path)
+        else:
+            remove_precompressed(shard_dir / path)
+    write_json_document(shard_dir / "index.json", index)
+    if precompress:
+        write_precompressed(shard_dir / "index.json")
+    else:
+        remove_precompressed(shard_dir / "index.json")
+
+    # Drop shards left over from earlier runs only after the new index is live.
+    live = {shard_dir / path for path in shard_files}
+    for tab in DISPLAY_TABS:
+        for stale in (shard_dir / tab).glob("*.json*"):
+            if stale.with_name(re.sub(r"\.(gz|br)$", "", stale.name)) not in live:
+                stale.unlink()
+    return index
 
 
 def write_outputs(
     output_dir: Path,
-    single: list[dict[str, Any]],
-    multi: list[dict[str, Any]],
+    single: Iterable[dict[str, Any]],
+    multi: Iterable[dict[str, Any]],
     compare: dict[str, Any],
+    *,
+    display: dict[str, Any] | None = None,
+    compare_matrix: dict[str, Any] | None = None,
+    compare_stats: dict[str, Any] | None = None,
+    scaling: dict[str, Any] | None = None,
+    shards: bool = True,
+    columnar: bool = False,
+    precompress: bool = False,
 ) -> None:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    (output_dir / "leaderboard_single.json").write_text(
-        json.dumps(single, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    (output_dir / "leaderboard_multi.json").write_text(
-        json.dumps(multi, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    (output_dir / "leaderboard_compare.json").write_text(
-        json.dumps(compare, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    (output_dir / "last_updated.json").write_text(
-        json.dumps(
-            {"last_updated": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")}, indent=2
+    # Each snapshot is replaced atomically; last_updated.json goes last so the
+    # freshness marker never points at snapshots that are still being written.
+    # Precompressed and content-hashed copies are opt-in: they are for the
+    # publish step, and without them output_dir holds one file per snapshot.
+    materialize = shards or columnar
+    single = list(single) if materialize else single
+    multi = list(multi) if materialize else multi
+    snapshots = ["leaderboard_single.json", "leaderboard_multi.json"]
+    write_json_array(output_dir / "leaderboard_single.json", single)
+    write_json_array(output_dir / "leaderboard_multi.json", multi)
+    if columnar:
+        for name, rows in (("single", single), ("multi", multi)):
+            snapshots.append(f"leaderboard_{name}.columnar.json")
+            write_json_document(
+                output_dir / snapshots[-1],
+                encode_columnar(rows),
+                indent=None,
+                separators=(",", ":"),
+            )
+    snapshots.append("leaderboard_compare.json")
+    write_json_document(output_dir / "leaderboard_compare.json", compare)
+    if compare_matrix is not None:
+        snapshots.append("leaderboard_compare_v2.json")
+        write_json_document(output_dir / "leaderboard_compare_v2.json", compare_matrix)
+    if compare_stats is not None:
+        snapshots.append("leaderboard_compare_stats.json")
+        write_json_document(
+            output_dir / "leaderboard_compare_stats.json", compare_stats
         )
-        + "\n",
-        encoding="utf-8",
-    )
+    if scaling is not None:
+        snapshots.append("leaderboard_scaling.json")
+        write_json_document(output_dir / "leaderboard_scaling.json", scaling)
+    if display is not None:
+        snapshots.append("leaderboard_display.json")
+        write_json_document(output_dir / "leaderboard_display.json", display)
+    if shards:
+        write_shards(
+            output_dir,
+            [*single, *multi],
+            compare=compare,
+            display=display,
+            precompress=precompress,
+        )
+
+    marker: dict[str, Any] = {
+        "last_updated": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+    }
+    if precompress:
+        marker["snapshots"] = snapshot_hashes(publish_snapshots(output_dir, snapshots))
+    else:
+        unpublish_snapshots(output_dir, snapshots)
+    write_json_document(output_dir / "last_updated.json", marker)
 
 
 def parse_args() -> argparse.Namespace:
@@ -462,23 +1142,359 @@ def parse_args() -> argparse.Namespace:
         / "leaderboard_v1.schema.json",
         help="Path to the website leaderboard schema.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse validated entries for artifacts unchanged since the previous run.",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=None,
+        help=(
+            "Incremental state file (default: one file per --source-dir under "
+            ".cache/aggregate_results/)."
+        ),
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help=(
+            "Skip directories whose name or path relative to --source-dir matches "
+            "GLOB during manifest discovery (repeatable, e.g. 'raw_logs')."
+        ),
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Do not look for manifests more than this many directories deep.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for artifact parsing and validation (0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Dedup artifacts as they are parsed instead of loading them all first; "
+            "peak memory follows unique entries, not raw artifacts."
+        ),
+    )
+    parser.add_argument(
+        "--no-shards",
+        action="store_true",
+        help="Skip the per hardware/model shard layout under <output-dir>/shards/.",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help=(
+            "Also write .gz/.br siblings, content-hashed copies and "
+            "snapshot_index.json for publishing (off by default)."
+        ),
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Also write dictionary-encoded leaderboard_{single,multi}.columnar.json.",
+    )
+    parser.add_argument(
+        "--sqlite-out",
+        type=Path,
+        help=(
+            "Upsert deduplicated entries into this SQLite index "
+            "(query it with scripts/leaderboard_db.py)."
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help=(
+            "Also write leaderboard_compare_stats.json: repeat-run statistics and "
+            "bootstrap confidence intervals per scope and engine (needs numpy)."
+        ),
+    )
+    parser.add_argument(
+        "--bootstrap-resamples",
+        type=int,
+        default=1000,
+        help="Bootstrap resamples per confidence interval (with --stats).",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the bootstrap intervals (with --stats).",
+    )
+    parser.add_argument(
+        "--stats-seed",
+        type=int,
+        default=0,
+        help="Random seed for bootstrap resampling (with --stats).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-stage wall time, tracemalloc allocations and counters.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        help="Write Chrome trace JSON with spans per stage, manifest and artifact.",
+    )
+    args = parser.parse_args()
+    if args.bootstrap_resamples < 1:
+        parser.error("--bootstrap-resamples must be >= 1")
+    if not 0 < args.confidence < 1:
+        parser.error("--confidence must be between 0 and 1 (exclusive)")
+    return args
 
 
 def main() -> None:
     args = parse_args()
-    validator = Draft7Validator(load_schema(args.schema))
-    entries = load_manifest_entries(args.source_dir, validator)
-    single, multi = split_entries(entries)
-    compare = build_compare_snapshot(single + multi)
-    write_outputs(args.output_dir, single, multi, compare)
+    if args.stats and args.stream:
+        raise SystemExit("❌ --stats reads every repeat run; drop --stream to use it")
+    if args.stats:
+        require_numpy()
+    schema = load_schema(args.schema)
+    validator = FastPathValidator(schema)
+    state_path = args.state_file or default_state_path(args.source_dir)
+    state = (
+        load_incremental_state(state_path, compute_schema_digest(schema))
+        if args.incremental
+        else None
+    )
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    profiler = (
+        PipelineProfiler(trace=args.trace_out is not None, allocations=args.profile)
+        if args.profile or args.trace_out is not None
+        else None
+    )
+    previous_run_id = state.get("run_id") if state is not None else None
+    changed = [] if state is not None and args.sqlite_out is not None else None
+    # What the outputs depend on besides the artifacts; a change rebuilds them.
+    signature = {
+        "output_dir": str(args.output_dir.resolve()),
+        "shards": not args.no_shards,
+        "columnar": args.columnar,
+        "precompress": args.precompress,
+        "stats": (
+            [args.bootstrap_resamples, args.confidence, args.stats_seed]
+            if args.stats
+            else None
+        ),
+    }
+    with profile_stage(profiler, "discover"):
+        manifest_files, walk = discover_manifests(
+            args.source_dir,
+            exclude=args.exclude,
+            max_depth=args.max_depth,
+            cache=state.setdefault("discovery", {}) if state is not None else None,
+        )
+    if profiler is not None:
+        for name, value in walk.items():
+            profiler.count(name, value)
 
-    print("✅ Aggregation complete")
-    print(f"  source manifests: {args.source_dir}")
+    # The outputs in output_dir are the previous run's if last_updated.json is
+    # the one it wrote; only then can its groups be reused or the run skipped.
+    recorded = state.get("outputs") if state is not None else None
+    outputs_current = (
+        recorded is not None
+        and recorded["signature"]["output_dir"] == signature["output_dir"]
+        and recorded["marker"] == marker_fingerprint(args.output_dir)
+    )
+    manifests = fingerprint_manifests(manifest_files) if state is not None else None
+    if (
+        state is not None
+        and outputs_current
+        and recorded["signature"] == signature
+        and state.get("manifests") == manifests
+        and artifacts_unchanged(state["artifacts"])
+        and (
+            args.sqlite_out is None or synced_run_id(args.sqlite_out) == previous_run_id
+        )
+    ):
+        # Same manifests and artifacts as the run that wrote the outputs:
+        # nothing is loaded, rebuilt or rewritten.
+        count = len(state["artifacts"])
+        state["last_run"] = {"artifact_count": count, "reused": count, "reloaded": 0}
+        db_sync = None
+        if args.sqlite_out is not None:
+            db_sync = sync_db(
+                args.sqlite_out,
+                [],
+                changed=[],
+                previous_run_id=previous_run_id,
+                run_id=previous_run_id,
+            )
+        write_incremental_state(state_path, state)
+        _print_run(args, manifest_files, walk, state, state_path)
+        print(
+            f"  unchanged since the previous run; nothing rewritten in {args.output_dir}"
+        )
+        _print_db_sync(args, db_sync)
+        _print_profile(args, profiler)
+        return
+
+    previous_artifacts = state["artifacts"] if state is not None else {}
+    loaded = iter_manifest_entries(
+        args.source_dir,
+        validator,
+        state=state,
+        jobs=jobs,
+        profiler=profiler,
+        changed=changed,
+        manifest_files=manifest_files,
+    )
+    if args.stream:
+        # Dedup consumes artifacts as they are parsed and keeps one winner per
+        # idempotency key, so duplicates are dropped before the next is read.
+        with profile_stage(profiler, "ingest"):
+            single, multi = split_entries(loaded, profiler)
+        entries = None
+    else:
+        with profile_stage(profiler, "load"):
+            entries = list(loaded)
+        with profile_stage(profiler, "dedup"):
+            single, multi = split_entries(entries, profiler)
+    previous = dirty = None
+    if state is not None:
+        state["run_id"] = uuid.uuid4().hex
+        state["manifests"] = manifests
+        if outputs_current:
+            previous = load_previous_snapshots(args.output_dir)
+            dirty = dirty_groups(previous_artifacts, state["artifacts"])
+    with profile_stage(profiler, "compare"):
+        compare, compare_matrix, scaling = build_group_snapshots(
+            [EntryView(entry) for entry in single + multi],
+            previous=previous,
+            dirty=dirty,
+        )
+    if profiler is not None:
+        profiler.count("compare_groups", compare["group_count"])
+    compare_stats = None
+    if entries is not None and args.stats:
+        # Repeat runs sharing an idempotency key are gone after dedup, so the
+        # statistics are built from every loaded entry.
+        with profile_stage(profiler, "stats"):
+            compare_stats = build_compare_stats_snapshot(
+                entries,
+                resamples=args.bootstrap_resamples,
+                confidence=args.confidence,
+                seed=args.stats_seed,
+            )
+    with profile_stage(profiler, "display"):
+        display = build_display(
+            single + multi,
+            previous=previous["leaderboard_display.json"] if previous else None,
+            tabs=dirty["tab"] if dirty is not None else None,
+        )
+    db_sync = None
+    if args.sqlite_out is not None:
+        with profile_stage(profiler, "sqlite"):
+            db_sync = sync_db(
+                args.sqlite_out,
+                single + multi,
+                changed=changed,
+                previous_run_id=previous_run_id,
+                run_id=state["run_id"] if state is not None else None,
+            )
+    with profile_stage(profiler, "write"):
+        write_outputs(
+            args.output_dir,
+            single,
+            multi,
+            compare,
+            display=display,
+            compare_matrix=compare_matrix,
+            compare_stats=compare_stats,
+            scaling=scaling,
+            shards=not args.no_shards,
+            columnar=args.columnar,
+            precompress=args.precompress,
+        )
+        if state is not None:
+            state["outputs"] = {
+                "signature": signature,
+                "marker": marker_fingerprint(args.output_dir),
+            }
+            write_incremental_state(state_path, state)
+
+    _print_run(args, manifest_files, walk, state, state_path)
+    if previous is not None and dirty is not None:
+        print(
+            f"  rebuilt groups: {len(dirty['scope'])} scopes, "
+            f"{len(dirty['family'])} scaling families, {len(dirty['tab'])} tabs"
+        )
     print(f"  leaderboard_single.json: {len(single)} entries")
     print(f"  leaderboard_multi.json: {len(multi)} entries")
     print(f"  leaderboard_compare.json: {compare['group_count']} compare groups")
+    print(
+        f"  leaderboard_compare_v2.json: {compare_matrix['group_count']} "
+        "N-way compare groups"
+    )
+    print(
+        f"  leaderboard_scaling.json: {scaling['curve_count']} scaling curves, "
+        f"{sum(curve['knee'] is not None for curve in scaling['curves'])} saturated"
+    )
+    if compare_stats is not None:
+        print(
+            f"  leaderboard_compare_stats.json: {compare_stats['group_count']} groups, "
+            f"{compare_stats['confidence']:.0%} bootstrap intervals"
+        )
+    print(f"  leaderboard_display.json: {display['row_count']} display rows")
+    _print_db_sync(args, db_sync)
+    if not args.no_shards:
+        print(f"  {SHARD_DIRNAME}/index.json: per hardware/model shards")
+    if args.columnar:
+        print("  leaderboard_{single,multi}.columnar.json: columnar snapshots")
+    if args.precompress:
+        print("  snapshot_index.json: content-hashed snapshots with .gz/.br siblings")
     print(f"  output dir: {args.output_dir}")
+    _print_profile(args, profiler)
+
+
+def _print_run(
+    args: argparse.Namespace,
+    manifest_files: list[Path],
+    walk: dict[str, int],
+    state: dict[str, Any] | None,
+    state_path: Path,
+) -> None:
+    print("✅ Aggregation complete")
+    print(f"  source manifests: {args.source_dir}")
+    print(
+        f"  discovery: {len(manifest_files)} manifests; listed {walk['dirs_listed']} "
+        f"dirs / {walk['files_seen']} files, {walk['dirs_cached']} dirs from cache, "
+        f"{walk['dirs_pruned']} pruned"
+    )
+    if state is not None:
+        print(
+            f"  incremental: {state['last_run']['reused']} reused, "
+            f"{state['last_run']['reloaded']} reloaded ({state_path})"
+        )
+
+
+def _print_db_sync(args: argparse.Namespace, db_sync: dict[str, Any] | None) -> None:
+    if db_sync is not None:
+        print(
+            f"  {args.sqlite_out}: {db_sync['upserted']} upserted "
+            f"({'incremental' if db_sync['incremental'] else 'full'}), "
+            f"{db_sync['rows']} rows"
+        )
+
+
+def _print_profile(args: argparse.Namespace, profiler: PipelineProfiler | None) -> None:
+    if profiler is not None and args.profile:
+        print("\n".join(profiler.summary_lines()))
+    if profiler is not None and args.trace_out is not None:
+        profiler.write_trace(args.trace_out)
+        print(f"  trace: {args.trace_out}")
 
 
 if __name__ == "__main__":
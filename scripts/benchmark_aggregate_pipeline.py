@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""Time each aggregation stage at several dataset sizes and compare to a baseline.
+
+Synthetic export trees come from ``generate_rich_data.py``. Each dataset size is
+benchmarked in a fresh process so memory from a previous size does not leak into
+the next one. Per stage the suite records the best wall time over ``--rounds``,
+entries/sec and peak RSS (the high-water mark is reset before every stage on
+Linux; elsewhere the process-wide ``ru_maxrss`` is reported).
+
+Results are written to ``--output``. With a stored ``--baseline`` the run exits
+non-zero when a stage is slower, or uses more memory, than the baseline by more
+than the configured thresholds. ``--update-baseline`` stores the current results
+as the new baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+from aggregate_results import (
+    _iter_manifest_records,
+    build_compare_snapshot,
+    load_schema,
+    split_entries,
+    validate_entry,
+    write_outputs,
+)
+from compare_matrix import build_compare_matrix_snapshot
+from compiled_schema import FastPathValidator
+from entry_view import EntryView
+from generate_rich_data import iter_entries, write_export_tree
+from leaderboard_display import build_display_snapshot
+from manifest_discovery import discover_manifests
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BENCHMARK_SCHEMA_VERSION = "aggregate-pipeline-benchmark/v1"
+STAGES = ("discover", "load", "validate", "dedup", "compare", "display", "write")
+DEFAULT_SCHEMA = ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json"
+DEFAULT_BASELINE = ROOT_DIR / "benchmarks" / "aggregate_pipeline_baseline.json"
+DEFAULT_OUTPUT = ROOT_DIR / "benchmarks" / "aggregate_pipeline_results.json"
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+_STATUS = Path("/proc/self/status")
+
+
+def _reset_peak_rss() -> None:
+    try:
+        _CLEAR_REFS.write_text("5")
+    except OSError:
+        pass
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size since the last reset (or process start)."""
+    try:
+        for line in _STATUS.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_stage(run: Callable[[], Any], rounds: int) -> tuple[Any, dict[str, float]]:
+    best = float("inf")
+    peak = 0
+    result = None
+    for _ in range(rounds):
+        result = None
+        gc.collect()
+        _reset_peak_rss()
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+        peak = max(peak, peak_rss_bytes())
+    return result, {"seconds": best, "peak_rss_bytes": peak}
+
+
+def benchmark_tree(
+    source_dir: Path,
+    output_dir: Path,
+    *,
+    schema_path: Path = DEFAULT_SCHEMA,
+    rounds: int = 1,
+    precompress: bool = False,
+) -> dict[str, Any]:
+    """Run every stage of ``aggregate_results.main`` on one export tree."""
+    validator = FastPathValidator(load_schema(schema_path))
+    timings: dict[str, dict[str, float]] = {}
+
+    def stage(name: str, run: Callable[[], Any]) -> Any:
+        result, timings[name] = _run_stage(run, rounds)
+        return result
+
+    planned = stage(
+        "discover",
+        lambda: list(_iter_manifest_records(discover_manifests(source_dir)[0])),
+    )
+    payloads = stage(
+        "load",
+        lambda: [json.loads(path.read_bytes()) for _, _, path in planned],
+    )
+    entries = stage(
+        "validate",
+        lambda: [
+            validate_entry(payload, validator, source=path)
+            for payload, (_, _, path) in zip(payloads, planned)
+        ],
+    )
+    single, multi = stage("dedup", lambda: split_entries(entries))
+
+    def compare_snapshots() -> tuple[dict[str, Any], dict[str, Any]]:
+        views = [EntryView(entry) for entry in single + multi]
+        return build_compare_snapshot(views), build_compare_matrix_snapshot(views)
+
+    compare, compare_matrix = stage("compare", compare_snapshots)
+    display = stage("display", lambda: build_display_snapshot(single + multi))
+    stage(
+        "write",
+        lambda: write_outputs(
+            output_dir,
+            single,
+            multi,
+            compare,
+            display=display,
+            compare_matrix=compare_matrix,
+            precompress=precompress,
+        ),
+    )
+
+    count = len(entries)
+    return {
+        "entries": count,
+        "stages": {
+            name: {
+                "seconds": round(timing["seconds"], 6),
+                "entries_per_sec": round(count / timing["seconds"], 1)
+                if timing["seconds"] > 0
+                else None,
+                "peak_rss_bytes": int(timing["peak_rss_bytes"]),
+            }
+            for name, timing in timings.items()
+        },
+    }
+
+
+def _benchmark_size(
+    size: int, seed: int, rounds: int, precompress: bool, schema_path: str
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="aggregate-bench-") as tmp:
+        source_dir = Path(tmp) / "source"
+        write_export_tree(
+            iter_entries(size, seed=seed), source_dir, entries_per_manifest=10000
+        )
+        return benchmark_tree(
+            source_dir,
+            Path(tmp) / "out",
+            schema_path=Path(schema_path),
+            rounds=rounds,
+            precompress=precompress,
+        )
+
+
+def run_suite(
+    sizes: list[int],
+    *,
+    seed: int = 0,
+    rounds: int = 1,
+    precompress: bool = False,
+    schema_path: Path = DEFAULT_SCHEMA,
+) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[str(size)] = executor.submit(
+                _benchmark_size, size, seed, rounds, precompress, str(schema_path)
+            ).result()
+    return {
+        "schema_version": BENCHMARK_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "rounds": rounds,
+        "precompress": precompress,
+        "sizes": results,
+    }
+
+
+def compare_to_baseline(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    threshold: float,
+    rss_threshold: float,
+    min_seconds: float = 0.05,
+) -> list[dict[str, Any]]:
+    """Return stage regressions of ``results`` against ``baseline``.
+
+    Only sizes and stages present in both are compared. Stages that take less
+    than ``min_seconds`` in both runs are too noisy to judge on wall time.
+    """
+    regressions = []
+    for size, current in results.get("sizes", {}).items():
+        reference = baseline.get("sizes", {}).get(size)
+        if reference is None:
+            continue
+        for stage, now in current["stages"].items():
+            before = reference["stages"].get(stage)
+            if before is None:
+                continue
+            checks = [("peak_rss_bytes", rss_threshold)]
+            if max(now["seconds"], before["seconds"]) >= min_seconds:
+                checks.insert(0, ("seconds", threshold))
+            for metric, limit in checks:
+                old, new = before[metric], now[metric]
+                if old and new > old * (1 + limit):
+                    regressions.append(
+                        {
+                            "size": size,
+                            "stage": stage,
+                            "metric": metric,
+                            "baseline": old,
+                            "current": new,
+                            "change": round(new / old - 1, 4),
+                        }
+                    )
+    return regressions
+
+
+def _print_results(results: dict[str, Any]) -> None:
+    for size, result in results["sizes"].items():
+        print(f"📊 {size} entries")
+        for stage, timing in result["stages"].items():
+            rate = timing["entries_per_sec"]
+            print(
+                f"  {stage:<9} {timing['seconds'] * 1000:>11.1f} ms  "
+                f"{rate if rate is not None else float('inf'):>12,.0f} entries/s  "
+                f"peak RSS {timing['peak_rss_bytes'] / 2**20:>8.1f} MiB"
+            )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default="1000,10000",
+        help="Comma-separated dataset sizes (entries).",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Best-of rounds per stage."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--schema", type=Path, default=DEFAULT_SCHEMA)
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Benchmark write_outputs with .gz/.br siblings and hashed copies.",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative wall-time regression per stage (0.25 = +25%%).",
+    )
+    parser.add_argument(
+        "--rss-threshold",
+        type=float,
+        default=0.25,
+        help="Allowed relative peak-RSS regression per stage.",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=0.05,
+        help="Skip wall-time checks for stages faster than this in both runs.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing.",
+    )
+    args = parser.parse_args()
+    try:
+        args.sizes = [int(item) for item in args.sizes.split(",") if item]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+    if not args.sizes or min(args.sizes) < 1 or args.rounds < 1:
+        parser.error("--sizes must be positive and --rounds >= 1")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    results = run_suite(
+        args.sizes,
+        seed=args.seed,
+        rounds=args.rounds,
+        precompress=args.precompress,
+        schema_path=args.schema,
+    )
+    _print_results(results)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    print(f"  results: {args.output}")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"  baseline updated: {args.baseline}")
+        return 0
+    if not args.baseline.is_file():
+        print(
+            f"  no baseline at {args.baseline}; run with --update-baseline to store one"
+        )
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare_to_baseline(
+        results,
+        baseline,
+        threshold=args.threshold,
+        rss_threshold=args.rss_threshold,
+        min_seconds=args.min_seconds,
+    )
+    if not regressions:
+        print(f"✅ no stage regressed against {args.baseline}")
+        return 0
+    print(f"❌ {len(regressions)} stage regression(s) against {args.baseline}:")
+    for item in regressions:
+        print(
+            f"  {item['size']:>8} {item['stage']:<9} {item['metric']:<15} "
+            f"{item['baseline']} -> {item['current']} ({item['change']:+.1%})"
+        )
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Compare size and parse time of row-oriented and columnar leaderboard snapshots."""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from columnar_snapshot import decode_columnar, encode_columnar
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SCALED_METRICS = ("ttft_ms", "tbt_ms", "tpot_ms", "throughput_tps", "peak_mem_mb")
+
+
+def scale_entries(
+    entries: list[dict[str, Any]], factor: int, *, seed: int = 0
+) -> list[dict[str, Any]]:
+    """Replicate ``entries`` ``factor`` times with fresh ids and jittered metrics."""
+    rng = random.Random(seed)
+    scaled = []
+    for round_index in range(factor):
+        for entry in entries:
+            clone = copy.deepcopy(entry)
+            clone["entry_id"] = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            metrics = clone.get("metrics") or {}
+            for name in SCALED_METRICS:
+                value = metrics.get(name)
+                if isinstance(value, float):
+                    metrics[name] = round(value * rng.uniform(0.9, 1.1), 3)
+            metadata = clone.get("metadata") or {}
+            if metadata.get("idempotency_key"):
+                metadata["idempotency_key"] += f"|r{round_index}"
+            scaled.append(clone)
+    return scaled
+
+
+def _best_seconds(run: Any, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(entries: list[dict[str, Any]], *, rounds: int) -> dict[str, Any]:
+    rows_text = json.dumps(entries, indent=2, ensure_ascii=False) + "\n"
+    columnar_text = (
+        json.dumps(encode_columnar(entries), separators=(",", ":"), ensure_ascii=False)
+        + "\n"
+    )
+    if decode_columnar(json.loads(columnar_text)) != entries:
+        raise SystemExit("columnar round trip does not reproduce the entries")
+
+    rows_seconds = _best_seconds(lambda: json.loads(rows_text), rounds)
+    columnar_seconds = _best_seconds(lambda: json.loads(columnar_text), rounds)
+    decode_seconds = _best_seconds(
+        lambda: decode_columnar(json.loads(columnar_text)), rounds
+    )
+    rows_bytes = len(rows_text.encode("utf-8"))
+    columnar_bytes = len(columnar_text.encode("utf-8"))
+    return {
+        "entries": len(entries),
+        "rows_bytes": rows_bytes,
+        "columnar_bytes": columnar_bytes,
+        "size_reduction": round(1 - columnar_bytes / rows_bytes, 3),
+        "rows_parse_ms": round(rows_seconds * 1000, 3),
+        "columnar_parse_ms": round(columnar_seconds * 1000, 3),
+        "columnar_rebuild_ms": round(decode_seconds * 1000, 3),
+        "parse_reduction": round(1 - columnar_seconds / rows_seconds, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "data_file",
+        nargs="?",
+        type=Path,
+        default=ROOT_DIR / "data" / "leaderboard_single.json",
+    )
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payload = json.loads(args.data_file.read_text(encoding="utf-8"))
+    entries = payload if isinstance(payload, list) else [payload]
+    datasets = (
+        (args.data_file.name, entries),
+        (f"scaled x{args.scale}", scale_entries(entries, args.scale, seed=args.seed)),
+    )
+
+    for label, rows in datasets:
+        result = measure(rows, rounds=args.rounds)
+        print(f"📊 {label}: {result['entries']} entries")
+        print(
+            f"  size    rows {result['rows_bytes']:>12,} B   "
+            f"columnar {result['columnar_bytes']:>12,} B   "
+            f"(-{result['size_reduction']:.1%})"
+        )
+        print(
+            f"  parse   rows {result['rows_parse_ms']:>10.3f} ms   "
+            f"columnar {result['columnar_parse_ms']:>10.3f} ms   "
+            f"(-{result['parse_reduction']:.1%}); "
+            f"parse + rebuild rows {result['columnar_rebuild_ms']:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""Compare dedup + compare grouping with and without ``EntryView`` on a large set.
+
+The reference path is the pre-``EntryView`` implementation of ``split_entries``
+and the grouping half of ``build_compare_snapshot`` (scope key and scope dict
+extracted separately, engine summaries built twice per representative entry,
+both timestamps re-parsed on every ``prefer_newer_entry`` comparison).
+Synthetic entries are shallow copies of one ``generate_rich_data`` sweep that
+share nested dicts except ``metadata``, so a 1M-entry set fits in a few GB.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+from datetime import datetime
+from typing import Any
+
+from aggregate_results import (
+    build_compare_snapshot,
+    select_preferred_pair,
+    split_entries,
+)
+from entry_view import (
+    EntryView,
+    build_compare_engine_summary,
+    build_idempotency_key,
+    extract_workload_name,
+)
+from generate_rich_data import ENGINES, HARDWARE_CONFIGS, iter_entries, iter_sweep
+
+
+def synthetic_entries(count: int, *, seed: int = 0) -> list[dict[str, Any]]:
+    """``count`` entries; roughly every other sweep repeats earlier idempotency keys."""
+    sweep = sum(1 for _ in iter_sweep(list(HARDWARE_CONFIGS), list(ENGINES)))
+    templates = list(iter_entries(min(count, sweep), seed=seed))
+    runs = max(1, -(-count // len(templates)))
+    distinct_runs = max(1, runs // 2)
+    entries = []
+    for index in range(count):
+        template = templates[index % len(templates)]
+        run = index // len(templates)
+        metadata = dict(template["metadata"])
+        metadata["idempotency_key"] += f"|r{run % distinct_runs}"
+        metadata["submitted_at"] = f"2026-02-{1 + run % 28:02d}T{run % 24:02d}:00:00Z"
+        entry = dict(template)
+        entry["metadata"] = metadata
+        entries.append(entry)
+    return entries
+
+
+def reference_prefer_newer_entry(
+    current: dict[str, Any], candidate: dict[str, Any]
+) -> dict[str, Any]:
+    def parse_timestamp(entry: dict[str, Any]) -> int:
+        metadata = entry.get("metadata") or {}
+        for field in ("submitted_at", "release_date"):
+            raw = metadata.get(field)
+            if isinstance(raw, str) and raw:
+                try:
+                    return int(
+                        datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp()
+                    )
+                except ValueError:
+                    continue
+        return 0
+
+    current_ts = parse_timestamp(current)
+    candidate_ts = parse_timestamp(candidate)
+    if candidate_ts != current_ts:
+        return candidate if candidate_ts > current_ts else current
+
+    current_tps = float(current.get("metrics", {}).get("throughput_tps") or 0.0)
+    candidate_tps = float(candidate.get("metrics", {}).get("throughput_tps") or 0.0)
+    if candidate_tps != current_tps:
+        return candidate if candidate_tps > current_tps else current
+    return current
+
+
+def reference_split_entries(
+    entries: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    deduped: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        key = build_idempotency_key(entry)
+        current = deduped.get(key)
+        deduped[key] = (
+            reference_prefer_newer_entry(current, entry)
+            if current is not None
+            else entry
+        )
+
+    single: list[dict[str, Any]] = []
+    multi: list[dict[str, Any]] = []
+    for entry in deduped.values():
+        node_count = int((entry.get("cluster") or {}).get("node_count") or 1)
+        if node_count > 1:
+            multi.append(entry)
+        else:
+            single.append(entry)
+
+    def sort_key(item: dict[str, Any]) -> tuple[str, str, str, str]:
+        return (
+            str(item.get("engine") or ""),
+            str(item.get("model", {}).get("name") or ""),
+            str(item.get("workload", {}).get("name") or ""),
+            str(item.get("metadata", {}).get("submitted_at") or ""),
+        )
+
+    single.sort(key=sort_key)
+    multi.sort(key=sort_key)
+    return single, multi
+
+
+def reference_scope_key(entry: dict[str, Any]) -> str:
+    model = str((entry.get("model") or {}).get("name") or "unknown-model")
+    hardware = str(
+        (entry.get("hardware") or {}).get("chip_model") or "unknown-hardware"
+    )
+    precision = str((entry.get("model") or {}).get("precision") or "unknown-precision")
+    workload = extract_workload_name(entry)
+    config_type = str(entry.get("config_type") or "unknown-config")
+    chip_count = int((entry.get("hardware") or {}).get("chip_count") or 0)
+    node_count = int((entry.get("cluster") or {}).get("node_count") or 1)
+    return "|".join(
+        [
+            model,
+            hardware,
+            precision,
+            workload,
+            config_type,
+            str(chip_count),
+            str(node_count),
+        ]
+    )
+
+
+def reference_compare_groups(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    grouped: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        scope_key = reference_scope_key(entry)
+        group = grouped.setdefault(
+            scope_key,
+            {
+                "scope_key": scope_key,
+                "scope": {
+                    "model": str(
+                        (entry.get("model") or {}).get("name") or "unknown-model"
+                    ),
+                    "hardware": str(
+                        (entry.get("hardware") or {}).get("chip_model")
+                        or "unknown-hardware"
+                    ),
+                    "precision": str(
+                        (entry.get("model") or {}).get("precision")
+                        or "unknown-precision"
+                    ),
+                    "workload": extract_workload_name(entry),
+                    "config_type": str(entry.get("config_type") or "unknown-config"),
+                    "chip_count": int(
+                        (entry.get("hardware") or {}).get("chip_count") or 0
+                    ),
+                    "node_count": int(
+                        (entry.get("cluster") or {}).get("node_count") or 1
+                    ),
+                },
+                "entries_by_engine": {},
+            },
+        )
+        engine = str(
+            entry.get("engine")
+            or (entry.get("metadata") or {}).get("engine")
+            or "unknown"
+        )
+        existing = group["entries_by_engine"].get(engine)
+        group["entries_by_engine"][engine] = (
+            reference_prefer_newer_entry(existing, entry)
+            if existing is not None
+            else entry
+        )
+
+    payloads = []
+    for group in grouped.values():
+        representatives = list(group["entries_by_engine"].values())
+        pair = select_preferred_pair(representatives)
+        if len(representatives) < 2 or pair is None:
+            continue
+        payloads.append(
+            {
+                "scope_key": group["scope_key"],
+                "scope": group["scope"],
+                "engines": [
+                    build_compare_engine_summary(item) for item in representatives
+                ],
+                "left": build_compare_engine_summary(pair[0]),
+                "right": build_compare_engine_summary(pair[1]),
+            }
+        )
+    return sorted(payloads, key=lambda item: item["scope_key"])
+
+
+def _timed(run: Any) -> tuple[Any, float]:
+    gc.collect()
+    started = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - started
+
+
+def _reference_path(entries: list[dict[str, Any]]) -> tuple[Any, float, float]:
+    (single, multi), split_s = _timed(lambda: reference_split_entries(entries))
+    groups, compare_s = _timed(lambda: reference_compare_groups(single + multi))
+    return (single + multi, groups), split_s, compare_s
+
+
+def _view_path(entries: list[dict[str, Any]]) -> tuple[Any, float, float]:
+    (single, multi), split_s = _timed(lambda: split_entries(entries))
+    snapshot, compare_s = _timed(
+        lambda: build_compare_snapshot([EntryView(entry) for entry in single + multi])
+    )
+    groups = [
+        {
+            "scope_key": group["scope_key"],
+            "scope": group["scope"],
+            "engines": group["engines"],
+            "left": group["preferred_pair"]["left"],
+            "right": group["preferred_pair"]["right"],
+        }
+        for group in snapshot["groups"]
+    ]
+    return (single + multi, groups), split_s, compare_s
+
+
+def measure(entries: list[dict[str, Any]], *, rounds: int = 3) -> dict[str, Any]:
+    """Best-of-``rounds`` timings; the two paths alternate which one runs first."""
+    (deduped, groups), _, _ = _reference_path(entries)
+    if _view_path(entries)[0] != (deduped, groups):
+        raise SystemExit("EntryView output differs from the reference path")
+    counts = {"deduped": len(deduped), "compare_groups": len(groups)}
+    del deduped, groups
+
+    best = {name: [float("inf"), float("inf")] for name in ("reference", "view")}
+    paths = [("reference", _reference_path), ("view", _view_path)]
+    for round_index in range(rounds):
+        for name, run in paths if round_index % 2 == 0 else paths[::-1]:
+            _, split_s, compare_s = run(entries)
+            best[name][0] = min(best[name][0], split_s)
+            best[name][1] = min(best[name][1], compare_s)
+    return {
+        "entries": len(entries),
+        **counts,
+        "reference_split_s": round(best["reference"][0], 3),
+        "reference_compare_s": round(best["reference"][1], 3),
+        "view_split_s": round(best["view"][0], 3),
+        "view_compare_s": round(best["view"][1], 3),
+        "speedup": round(sum(best["reference"]) / sum(best["view"]), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    entries = synthetic_entries(args.entries, seed=args.seed)
+    # Keep full collections from rescanning the synthetic set on every round.
+    gc.collect()
+    gc.freeze()
+    result = measure(entries, rounds=args.rounds)
+    print(
+        f"📊 {result['entries']:,} entries -> {result['deduped']:,} after dedup, "
+        f"{result['compare_groups']:,} compare groups"
+    )
+    print(
+        f"  reference  split {result['reference_split_s']:>8.3f} s   "
+        f"compare {result['reference_compare_s']:>8.3f} s"
+    )
+    print(
+        f"  EntryView  split {result['view_split_s']:>8.3f} s   "
+        f"compare {result['view_compare_s']:>8.3f} s   ({result['speedup']:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
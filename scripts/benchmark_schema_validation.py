@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Compare entries/sec of the generic jsonschema path and the compiled fast path."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    from jsonschema import Draft7Validator
+except ImportError as exc:  # pragma: no cover - environment dependent
+    raise SystemExit("jsonschema is required: pip install jsonschema") from exc
+
+from compiled_schema import FastPathValidator
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def _generic_errors(validator: Draft7Validator, entry: dict[str, Any]) -> list[Any]:
+    return sorted(validator.iter_errors(entry), key=lambda error: list(error.path))
+
+
+def _fast_errors(validator: FastPathValidator, entry: dict[str, Any]) -> list[Any]:
+    return sorted(validator.iter_errors(entry), key=lambda error: list(error.path))
+
+
+def benchmark(
+    entries: list[dict[str, Any]], schema: dict[str, Any], *, rounds: int
+) -> dict[str, Any]:
+    generic = Draft7Validator(schema)
+    fast = FastPathValidator(schema)
+    if fast.check is None:
+        raise SystemExit("schema could not be compiled; fast path is disabled")
+
+    for entry in entries:
+        if bool(_generic_errors(generic, entry)) != bool(_fast_errors(fast, entry)):
+            raise SystemExit(f"fast path disagrees on entry {entry.get('entry_id')}")
+
+    results: dict[str, Any] = {"entries": len(entries), "rounds": rounds}
+    for name, run in (
+        ("jsonschema", lambda entry: _generic_errors(generic, entry)),
+        ("compiled", lambda entry: _fast_errors(fast, entry)),
+    ):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for entry in entries:
+                run(entry)
+        elapsed = time.perf_counter() - started
+        results[name] = {
+            "seconds": round(elapsed, 4),
+            "entries_per_sec": round(len(entries) * rounds / elapsed, 1),
+        }
+    results["speedup"] = round(
+        results["compiled"]["entries_per_sec"]
+        / results["jsonschema"]["entries_per_sec"],
+        2,
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "data_file",
+        nargs="?",
+        type=Path,
+        default=ROOT_DIR / "data" / "leaderboard_single.json",
+    )
+    parser.add_argument(
+        "--schema",
+        type=Path,
+        default=ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json",
+    )
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    payload = json.loads(args.data_file.read_text(encoding="utf-8"))
+    entries = payload if isinstance(payload, list) else [payload]
+    schema = json.loads(args.schema.read_text(encoding="utf-8"))
+    results = benchmark(entries, schema, rounds=args.rounds)
+
+    print(f"📊 {args.data_file}: {results['entries']} entries x {args.rounds} rounds")
+    for name in ("jsonschema", "compiled"):
+        print(
+            f"  {name:<10} {results[name]['entries_per_sec']:>12,.1f} entries/sec"
+            f"  ({results[name]['seconds']}s)"
+        )
+    print(f"  speedup    {results['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
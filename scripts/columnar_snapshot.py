@@ -0,0 +1,178 @@
+"""Columnar encoding for leaderboard entry snapshots.
+
+Entries in ``leaderboard_single.json`` repeat the same nested ``versions``,
+``environment``, ``kv_cache_config`` and ``hardware`` blocks, so most of the
+row-oriented file is duplicated keys and values. The columnar form stores
+
+* one column per leaf path (``metrics.ttft_ms``, ``hardware.chip_model``, ...),
+  either as a typed numeric array (``int`` / ``float``), a dictionary-encoded
+  array of scalars (``dict``: unique values + integer codes) or raw JSON values
+  (``json``, for list-valued leaves);
+* one *shape* per distinct key layout: the entry's nested key order with each
+  leaf replaced by its column index, so absent keys, ``null`` values and key
+  order all survive the round trip.
+
+``decode_columnar`` rebuilds row dicts equal to the input, including the
+``int`` / ``float`` distinction of every number.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+COLUMNAR_SNAPSHOT_SCHEMA_VERSION = "leaderboard-columnar/v1"
+
+Shape = dict[str, Any]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _column_kind(values: list[Any]) -> str:
+    present = [value for value in values if value is not None]
+    if any(isinstance(value, list) for value in present):
+        return "json"
+    if present and all(_is_number(value) for value in present):
+        if all(isinstance(value, int) for value in present):
+            return "int"
+        if all(isinstance(value, float) for value in present):
+            return "float"
+    return "dict"
+
+
+def _encode_column(path: list[str], values: list[Any]) -> dict[str, Any]:
+    kind = _column_kind(values)
+    column: dict[str, Any] = {"path": path, "kind": kind}
+    if kind != "dict":
+        column["values"] = values
+        return column
+
+    codes: dict[tuple[type, Any], int] = {}
+    dictionary: list[Any] = []
+    encoded = []
+    for value in values:
+        # Keyed by type so True / 1 / 1.0 stay distinct dictionary values.
+        token = (type(value), value)
+        code = codes.get(token)
+        if code is None:
+            code = codes[token] = len(dictionary)
+            dictionary.append(value)
+        encoded.append(code)
+    column["dictionary"] = dictionary
+    column["codes"] = encoded
+    return column
+
+
+def encode_columnar(entries: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Encode row dicts into the ``leaderboard-columnar/v1`` document."""
+    column_index: dict[tuple[str, ...], int] = {}
+    column_values: list[list[Any]] = []
+    shape_index: dict[str, int] = {}
+    shapes: list[Shape] = []
+    shape_codes: list[int] = []
+    row_count = 0
+
+    def build_shape(node: dict[str, Any], prefix: tuple[str, ...]) -> Shape:
+        shape: Shape = {}
+        for key, value in node.items():
+            path = (*prefix, key)
+            if isinstance(value, dict):
+                shape[key] = build_shape(value, path)
+                continue
+            index = column_index.get(path)
+            if index is None:
+                index = column_index[path] = len(column_values)
+                column_values.append([None] * row_count)
+            column_values[index].append(value)
+            shape[key] = index
+        return shape
+
+    for entry in entries:
+        shape = build_shape(entry, ())
+        # Columns absent from this row's shape get a placeholder; the shape,
+        # not the placeholder, decides whether the key exists.
+        for values in column_values:
+            if len(values) == row_count:
+                values.append(None)
+        shape_key = json.dumps(shape, separators=(",", ":"))
+        code = shape_index.get(shape_key)
+        if code is None:
+            code = shape_index[shape_key] = len(shapes)
+            shapes.append(shape)
+        shape_codes.append(code)
+        row_count += 1
+
+    paths = sorted(column_index, key=column_index.__getitem__)
+    return {
+        "schema_version": COLUMNAR_SNAPSHOT_SCHEMA_VERSION,
+        "row_count": row_count,
+        "shapes": shapes,
+        "shape_codes": shape_codes,
+        "columns": [
+            _encode_column(list(path), column_values[index])
+            for index, path in enumerate(paths)
+        ],
+    }
+
+
+def _column_values(column: dict[str, Any]) -> list[Any]:
+    if column["kind"] == "dict":
+        dictionary = column["dictionary"]
+        return [dictionary[code] for code in column["codes"]]
+    values = column["values"]
+    if column["kind"] == "float":
+        # JSON writers may print integral floats without a fraction.
+        return [value if value is None else float(value) for value in values]
+    return values
+
+
+def _build_rows(
+    shape: Shape, columns: list[list[Any]], rows: list[int] | None, count: int
+) -> list[dict[str, Any]]:
+    """Build the dicts of ``shape`` for ``rows`` (``None`` = every row) column-wise."""
+    keys = list(shape)
+    if not keys:
+        return [{} for _ in range(count)]
+    parts = []
+    for value in shape.values():
+        if isinstance(value, dict):
+            parts.append(_build_rows(value, columns, rows, count))
+        elif rows is None:
+            parts.append(columns[value])
+        else:
+            column = columns[value]
+            parts.append([column[row] for row in rows])
+    return [dict(zip(keys, values)) for values in zip(*parts)]
+
+
+def decode_columnar(payload: dict[str, Any]) -> list[dict[str, Any]]:
+    """Rebuild the row dicts from an ``encode_columnar`` document."""
+    if payload.get("schema_version") != COLUMNAR_SNAPSHOT_SCHEMA_VERSION:
+        raise ValueError(
+            f"unsupported columnar snapshot: {payload.get('schema_version')!r}"
+        )
+    columns = [_column_values(column) for column in payload["columns"]]
+    shapes = payload["shapes"]
+    shape_codes = payload["shape_codes"]
+    if len(shapes) == 1:
+        return _build_rows(shapes[0], columns, None, len(shape_codes))
+
+    rows_by_shape: dict[int, list[int]] = {}
+    for row, code in enumerate(shape_codes):
+        rows_by_shape.setdefault(code, []).append(row)
+    entries: list[dict[str, Any]] = [{}] * len(shape_codes)
+    for code, rows in rows_by_shape.items():
+        for row, entry in zip(
+            rows, _build_rows(shapes[code], columns, rows, len(rows))
+        ):
+            entries[row] = entry
+    return entries
+
+
+def load_columnar_snapshot(path: Path) -> list[dict[str, Any]]:
+    """Read a columnar snapshot file and return the row-oriented entries."""
+    return decode_columnar(json.loads(path.read_text(encoding="utf-8")))
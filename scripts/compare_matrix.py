@@ -0,0 +1,125 @@
+"""N-way compare snapshot (``leaderboard-compare-snapshot/v2``).
+
+The v1 snapshot from ``build_compare_snapshot`` keeps one preferred left/right
+pair per scope for the homepage head-to-head cards. v2 ranks every engine of a
+scope and carries the full pairwise delta matrix per compare metric. Each
+group's metrics are read once into one column per metric; ranks and the delta
+matrix are derived from those columns instead of summarising pair by pair.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from entry_view import EntryView, group_by_scope
+
+COMPARE_MATRIX_SCHEMA_VERSION = "leaderboard-compare-snapshot/v2"
+# (metric, higher_is_better)
+COMPARE_METRICS = (
+    ("throughput_tps", True),
+    ("ttft_ms", False),
+    ("tbt_ms", False),
+    ("ttft_p99_ms", False),
+    ("tbt_p99_ms", False),
+    ("error_rate", False),
+)
+
+
+def metric_value(metrics: dict[str, Any], name: str) -> float | None:
+    value = metrics.get(name)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def rank_column(
+    values: list[float | None], *, higher_is_better: bool
+) -> list[int | None]:
+    """Competition ranks (1, 2, 2, 4) per value; missing values stay unranked."""
+    first_rank: dict[float, int] = {}
+    ordered = sorted(
+        (value for value in values if value is not None), reverse=higher_is_better
+    )
+    for position, value in enumerate(ordered, start=1):
+        first_rank.setdefault(value, position)
+    return [first_rank[value] if value is not None else None for value in values]
+
+
+def delta_matrix(values: list[float | None]) -> list[list[float | None]]:
+    """``matrix[i][j]`` is row engine ``i`` vs column engine ``j`` in percent.
+
+    Same value as ``compute_relative_delta(values[i], values[j])``.
+    """
+    divisors = [abs(value) if value else None for value in values]
+    return [
+        [
+            round(((left - right) / divisor) * 100.0, 4)
+            if left is not None and divisor is not None
+            else None
+            for right, divisor in zip(values, divisors)
+        ]
+        if left is not None
+        else [None] * len(values)
+        for left in values
+    ]
+
+
+def build_matrix_group(group: dict[str, Any]) -> dict[str, Any]:
+    """Rank all engines of one ``group_by_scope`` group on every compare metric."""
+    views: list[EntryView] = sorted(
+        group["entries_by_engine"].values(), key=lambda view: view.engine
+    )
+    engines = [view.engine for view in views]
+    rows = [view.entry.get("metrics") or {} for view in views]
+    metrics: dict[str, Any] = {}
+    for name, higher_is_better in COMPARE_METRICS:
+        column = [metric_value(row, name) for row in rows]
+        ranks = rank_column(column, higher_is_better=higher_is_better)
+        metrics[name] = {
+            "values": column,
+            "ranks": ranks,
+            "ranking": [
+                engines[index]
+                for index in sorted(
+                    (index for index, rank in enumerate(ranks) if rank is not None),
+                    key=lambda index: (ranks[index], engines[index]),
+                )
+            ],
+            "delta_pct": delta_matrix(column),
+        }
+    return {
+        "scope_key": group["scope_key"],
+        "category": group["category"],
+        "scope": group["scope"],
+        "engines": engines,
+        "summaries": [view.compare_summary() for view in views],
+        "metrics": metrics,
+    }
+
+
+def build_compare_matrix_snapshot(
+    entries: Iterable[dict[str, Any] | EntryView],
+) -> dict[str, Any]:
+    """Every scope with at least two engines, ranked N-way on each compare metric.
+
+    ``engines`` fixes the row/column order of each group's ``values``,
+    ``ranks`` and ``delta_pct``; ``ranking`` lists engines best first.
+    """
+    groups = [
+        build_matrix_group(group)
+        for group in group_by_scope(entries).values()
+        if len(group["entries_by_engine"]) >= 2
+    ]
+    groups.sort(key=lambda item: item["scope_key"])
+    return {
+        "schema_version": COMPARE_MATRIX_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "metrics": [
+            {"name": name, "higher_is_better": higher_is_better}
+            for name, higher_is_better in COMPARE_METRICS
+        ],
+        "group_count": len(groups),
+        "groups": groups,
+    }
@@ -0,0 +1,249 @@
+"""Repeat-run statistics per compare scope and engine (``--stats``).
+
+``build_compare_snapshot`` compares one representative run per engine, so any
+float difference picks a winner. Here every distinct run (by ``entry_id``) of
+the engine version the representative comes from (the newest) is kept per
+scope and engine; per metric we report run count, mean, sample
+stddev, median and a percentile bootstrap confidence interval of the mean.
+A metric only has a winner when the best engine's interval is clear of every
+other engine's interval; overlapping intervals are ``parity``.
+
+Statistics are computed with NumPy over all (scope, engine) segments of a
+metric at once: samples live in one flat array ordered by segment, and means,
+medians and bootstrap resamples are segment reductions (``np.add.reduceat``)
+instead of per-group loops. NumPy is only needed for this mode.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from compare_matrix import COMPARE_METRICS, metric_value
+from entry_view import EntryView, as_entry_view
+
+COMPARE_STATS_SCHEMA_VERSION = "leaderboard-compare-stats/v1"
+# Bootstrap resamples are drawn in chunks of at most this many samples.
+BOOTSTRAP_CHUNK_SIZE = 1 << 22
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise SystemExit("numpy is required for compare statistics: pip install numpy")
+
+
+def group_runs(
+    entries: Iterable[dict[str, Any] | EntryView],
+) -> dict[str, dict[str, Any]]:
+    """Like ``group_by_scope`` but keeps every distinct run per engine.
+
+    Only runs of the newest run's ``engine_version`` are kept, so releases of
+    one engine are never pooled into the same sample.
+    """
+    grouped: dict[str, dict[str, Any]] = {}
+    for view in map(as_entry_view, entries):
+        run_id = (view.engine, str(view.entry.get("entry_id") or id(view.entry)))
+        group = grouped.get(view.scope_key)
+        if group is None:
+            group = grouped[view.scope_key] = {
+                "scope_key": view.scope_key,
+                "scope": view.scope,
+                "category": view.category,
+                "runs_by_engine": {},
+                "_seen": set(),
+            }
+        seen = group["_seen"]
+        if run_id in seen:
+            continue
+        seen.add(run_id)
+        group["runs_by_engine"].setdefault(view.engine, []).append(view)
+    for group in grouped.values():
+        del group["_seen"]
+        for engine, views in group["runs_by_engine"].items():
+            newest = max(views, key=lambda view: view.sort_key).entry
+            version = _engine_version(newest)
+            group["runs_by_engine"][engine] = [
+                view.entry for view in views if _engine_version(view.entry) == version
+            ]
+    return grouped
+
+
+def _engine_version(entry: dict[str, Any]) -> str:
+    return str(
+        entry.get("engine_version")
+        or (entry.get("metadata") or {}).get("engine_version")
+        or "unknown"
+    )
+
+
+def segment_stats(
+    values: Any,
+    sizes: Any,
+    *,
+    resamples: int,
+    confidence: float,
+    rng: Any,
+) -> dict[str, Any]:
+    """Per-segment statistics of ``values`` split into consecutive ``sizes`` runs.
+
+    Returns arrays (one item per segment) ``mean``, ``stddev`` (NaN for a
+    single run), ``median``, ``ci_low`` and ``ci_high``.
+    """
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    segment = np.repeat(np.arange(len(sizes)), sizes)
+    mean = np.add.reduceat(values, starts) / sizes
+    deviation = values - mean[segment]
+    variance = np.add.reduceat(deviation * deviation, starts) / np.maximum(sizes - 1, 1)
+    stddev = np.where(sizes > 1, np.sqrt(variance), np.nan)
+    ordered = values[np.lexsort((values, segment))]
+    median = (ordered[starts + (sizes - 1) // 2] + ordered[starts + sizes // 2]) / 2
+
+    # Each resample draws, for every sample slot, a random sample of the same
+    # segment; segment sums of the drawn values give all bootstrap means at once.
+    boot_means = np.empty((resamples, len(sizes)))
+    offsets = starts[segment]
+    spans = sizes[segment]
+    per_chunk = max(1, BOOTSTRAP_CHUNK_SIZE // len(values))
+    for first in range(0, resamples, per_chunk):
+        count = min(per_chunk, resamples - first)
+        draws = offsets + (rng.random((count, len(values))) * spans).astype(np.int64)
+        boot_means[first : first + count] = (
+            np.add.reduceat(values[draws], starts, axis=1) / sizes
+        )
+    tail = (1.0 - confidence) / 2
+    ci_low, ci_high = np.quantile(boot_means, [tail, 1.0 - tail], axis=0)
+    return {
+        "mean": mean,
+        "stddev": stddev,
+        "median": median,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+    }
+
+
+def interval_winner(
+    stats: list[dict[str, Any]], *, higher_is_better: bool, min_runs: int = 2
+) -> str:
+    """Engine whose interval is clear of every other engine's, else ``parity``.
+
+    ``unknown`` when fewer than two engines report the metric or any engine has
+    fewer than ``min_runs`` runs.
+    """
+    if len(stats) < 2 or any(item["runs"] < min_runs for item in stats):
+        return "unknown"
+    best = (max if higher_is_better else min)(stats, key=lambda item: item["mean"])
+    for other in stats:
+        if other is best:
+            continue
+        if higher_is_better and best["ci_low"] <= other["ci_high"]:
+            return "parity"
+        if not higher_is_better and best["ci_high"] >= other["ci_low"]:
+            return "parity"
+    return str(best["engine"])
+
+
+def _rounded(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 6)
+
+
+def build_compare_stats_snapshot(
+    entries: Iterable[dict[str, Any] | EntryView],
+    *,
+    resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: int = 0,
+    min_runs: int = 2,
+) -> dict[str, Any]:
+    """Repeat-run statistics and interval verdicts for scopes with 2+ engines.
+
+    Pass entries before dedup (``split_entries`` keeps one run per
+    idempotency key). The same entries and ``seed`` give the same intervals.
+    """
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    groups = sorted(
+        (
+            group
+            for group in group_runs(entries).values()
+            if len(group["runs_by_engine"]) >= 2
+        ),
+        key=lambda group: group["scope_key"],
+    )
+    payloads = [
+        {
+            "scope_key": group["scope_key"],
+            "category": group["category"],
+            "scope": group["scope"],
+            "engines": sorted(group["runs_by_engine"]),
+            "metrics": {},
+        }
+        for group in groups
+    ]
+
+    for name, higher_is_better in COMPARE_METRICS:
+        # One segment per (group, engine) that reports the metric.
+        segments: list[tuple[int, str]] = []
+        samples: list[float] = []
+        sizes: list[int] = []
+        for group_index, (group, payload) in enumerate(zip(groups, payloads)):
+            for engine in payload["engines"]:
+                column = [
+                    value
+                    for value in (
+                        metric_value(entry.get("metrics") or {}, name)
+                        for entry in group["runs_by_engine"][engine]
+                    )
+                    if value is not None
+                ]
+                if column:
+                    segments.append((group_index, engine))
+                    samples.extend(column)
+                    sizes.append(len(column))
+
+        per_group: list[list[dict[str, Any]]] = [[] for _ in groups]
+        if segments:
+            result = segment_stats(
+                np.asarray(samples, dtype=np.float64),
+                np.asarray(sizes, dtype=np.int64),
+                resamples=resamples,
+                confidence=confidence,
+                rng=rng,
+            )
+            for index, (group_index, engine) in enumerate(segments):
+                per_group[group_index].append(
+                    {
+                        "engine": engine,
+                        "engine_version": _engine_version(
+                            groups[group_index]["runs_by_engine"][engine][0]
+                        ),
+                        "runs": sizes[index],
+                        **{
+                            key: _rounded(result[key][index])
+                            for key in ("mean", "stddev", "median", "ci_low", "ci_high")
+                        },
+                    }
+                )
+        for payload, stats in zip(payloads, per_group):
+            payload["metrics"][name] = {
+                "stats": stats,
+                "winner": interval_winner(
+                    stats, higher_is_better=higher_is_better, min_runs=min_runs
+                ),
+            }
+
+    return {
+        "schema_version": COMPARE_STATS_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "confidence": confidence,
+        "bootstrap_resamples": resamples,
+        "seed": seed,
+        "min_runs": min_runs,
+        "group_count": len(payloads),
+        "groups": payloads,
+    }
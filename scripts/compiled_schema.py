@@ -0,0 +1,377 @@
+"""Compile the leaderboard JSON Schema into specialized Python checks.
+
+``Draft7Validator.iter_errors`` walks the schema generically for every entry,
+which is wasted work when nearly every entry is valid. ``compile_schema`` turns
+the schema into nested closures that only answer "is this instance valid?";
+``FastPathValidator`` uses that answer for the common case and falls back to
+the full jsonschema error report whenever the compiled check fails.
+
+Only the keywords used by ``leaderboard_v1.schema.json`` (plus a few trivial
+neighbours) are compiled. Any other keyword raises ``UnsupportedSchemaError``
+and ``FastPathValidator`` then always takes the jsonschema path, so the fast
+path can never accept an instance that jsonschema would reject.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterator
+from typing import Any
+
+try:
+    from jsonschema import Draft7Validator
+except ImportError as exc:  # pragma: no cover - environment dependent
+    raise SystemExit("jsonschema is required: pip install jsonschema") from exc
+
+
+Check = Callable[[Any], bool]
+
+# Keywords that never affect validity under Draft 7 without a format checker.
+ANNOTATION_KEYWORDS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "$defs",
+    "definitions",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "format",
+}
+
+
+class UnsupportedSchemaError(ValueError):
+    """Raised when a schema uses a keyword the compiler does not implement."""
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+TYPE_CHECKS: dict[str, Check] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "number": _is_number,
+    "integer": _is_integer,
+}
+
+
+def _json_equal(left: Any, right: Any) -> bool:
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(
+            _json_equal(left[key], right[key]) for key in left
+        )
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(
+            _json_equal(a, b) for a, b in zip(left, right)
+        )
+    if _is_number(left) and _is_number(right):
+        return left == right
+    return type(left) is type(right) and left == right
+
+
+def _resolve_pointer(root: dict[str, Any], ref: str) -> Any:
+    if not ref.startswith("#"):
+        raise UnsupportedSchemaError(f"remote $ref is not supported: {ref}")
+    node: Any = root
+    for part in ref[1:].split("/")[1:]:
+        part = part.replace("~1", "/").replace("~0", "~")
+        if isinstance(node, list):
+            node = node[int(part)]
+        elif isinstance(node, dict) and part in node:
+            node = node[part]
+        else:
+            raise UnsupportedSchemaError(f"unresolvable $ref: {ref}")
+    return node
+
+
+def _all_of(checks: list[Check]) -> Check:
+    if not checks:
+        return lambda _value: True
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(value: Any) -> bool:
+        for item in checks:
+            if not item(value):
+                return False
+        return True
+
+    return check
+
+
+class _Compiler:
+    def __init__(self, root: dict[str, Any]) -> None:
+        self.root = root
+        self.refs: dict[str, Check] = {}
+
+    def compile_ref(self, ref: str) -> Check:
+        compiled = self.refs.get(ref)
+        if compiled is not None:
+            return compiled
+
+        # Register a forwarding cell first so recursive references terminate.
+        cell: list[Check] = []
+        self.refs[ref] = lambda value: cell[0](value)
+        cell.append(self.compile(_resolve_pointer(self.root, ref)))
+        self.refs[ref] = cell[0]
+        return cell[0]
+
+    def compile(self, node: Any) -> Check:
+        if node is True or node == {}:
+            return lambda _value: True
+        if node is False:
+            return lambda _value: False
+        if not isinstance(node, dict):
+            raise UnsupportedSchemaError(f"schema node must be an object: {node!r}")
+
+        # Draft 7 ignores every sibling keyword of $ref.
+        if "$ref" in node:
+            return self.compile_ref(node["$ref"])
+
+        checks: list[Check] = []
+        handled = set(ANNOTATION_KEYWORDS)
+
+        if "type" in node:
+            handled.add("type")
+            types = node["type"] if isinstance(node["type"], list) else [node["type"]]
+            try:
+                type_checks = [TYPE_CHECKS[name] for name in types]
+            except KeyError as exc:
+                raise UnsupportedSchemaError(f"unknown type: {exc}") from exc
+            if len(type_checks) == 1:
+                checks.append(type_checks[0])
+            else:
+                checks.append(lambda value: any(item(value) for item in type_checks))
+
+        if "enum" in node:
+            handled.add("enum")
+            options = list(node["enum"])
+            hashable = {
+                option
+                for option in options
+                if isinstance(option, str) or option is None
+            }
+            if len(hashable) == len(options):
+                checks.append(
+                    lambda value: (
+                        (value is None or isinstance(value, str)) and value in hashable
+                    )
+                )
+            else:
+                checks.append(
+                    lambda value: any(_json_equal(value, option) for option in options)
+                )
+
+        if "const" in node:
+            handled.add("const")
+            expected = node["const"]
+            checks.append(lambda value: _json_equal(value, expected))
+
+        if "pattern" in node:
+            handled.add("pattern")
+            search = re.compile(node["pattern"]).search
+            checks.append(
+                lambda value: not isinstance(value, str) or search(value) is not None
+            )
+
+        for keyword, holds in (
+            ("minLength", lambda value, bound: len(value) >= bound),
+            ("maxLength", lambda value, bound: len(value) <= bound),
+        ):
+            if keyword in node:
+                handled.add(keyword)
+                bound = node[keyword]
+                checks.append(
+                    lambda value, holds=holds, bound=bound: (
+                        not isinstance(value, str) or holds(value, bound)
+                    )
+                )
+
+        for keyword, holds in (
+            ("minimum", lambda value, bound: value >= bound),
+            ("maximum", lambda value, bound: value <= bound),
+            ("exclusiveMinimum", lambda value, bound: value > bound),
+            ("exclusiveMaximum", lambda value, bound: value < bound),
+        ):
+            if keyword in node:
+                handled.add(keyword)
+                bound = node[keyword]
+                checks.append(
+                    lambda value, holds=holds, bound=bound: (
+                        not _is_number(value) or holds(value, bound)
+                    )
+                )
+
+        if "required" in node:
+            handled.add("required")
+            required = tuple(node["required"])
+            checks.append(
+                lambda value: (
+                    not isinstance(value, dict) or all(key in value for key in required)
+                )
+            )
+
+        properties: dict[str, Any] = node.get("properties") or {}
+        if "properties" in node:
+            handled.add("properties")
+            compiled_properties = [
+                (key, self.compile(subschema)) for key, subschema in properties.items()
+            ]
+
+            def check_properties(value: Any) -> bool:
+                if not isinstance(value, dict):
+                    return True
+                for key, item in compiled_properties:
+                    if key in value and not item(value[key]):
+                        return False
+                return True
+
+            checks.append(check_properties)
+
+        patterns = [
+            (re.compile(pattern).search, self.compile(subschema))
+            for pattern, subschema in (node.get("patternProperties") or {}).items()
+        ]
+        if "patternProperties" in node:
+            handled.add("patternProperties")
+            if patterns:
+
+                def check_patterns(value: Any) -> bool:
+                    if not isinstance(value, dict):
+                        return True
+                    for key, item in value.items():
+                        for search, pattern_check in patterns:
+                            if search(key) is not None and not pattern_check(item):
+                                return False
+                    return True
+
+                checks.append(check_patterns)
+
+        if "additionalProperties" in node:
+            handled.add("additionalProperties")
+            additional = node["additionalProperties"]
+            if additional is not True:
+                known = set(properties)
+                extra_check = self.compile(additional)
+                searches = [search for search, _ in patterns]
+                checks.append(
+                    lambda value: (
+                        not isinstance(value, dict)
+                        or all(
+                            extra_check(item)
+                            for key, item in value.items()
+                            if key not in known
+                            and not any(search(key) is not None for search in searches)
+                        )
+                    )
+                )
+
+        if "propertyNames" in node:
+            handled.add("propertyNames")
+            name_check = self.compile(node["propertyNames"])
+            checks.append(
+                lambda value: (
+                    not isinstance(value, dict) or all(name_check(key) for key in value)
+                )
+            )
+
+        for keyword, holds in (
+            ("minProperties", lambda value, bound: len(value) >= bound),
+            ("maxProperties", lambda value, bound: len(value) <= bound),
+        ):
+            if keyword in node:
+                handled.add(keyword)
+                bound = node[keyword]
+                checks.append(
+                    lambda value, holds=holds, bound=bound: (
+                        not isinstance(value, dict) or holds(value, bound)
+                    )
+                )
+
+        if "items" in node:
+            handled.add("items")
+            if not isinstance(node["items"], (dict, bool)):
+                raise UnsupportedSchemaError("tuple-form items is not supported")
+            item_check = self.compile(node["items"])
+            checks.append(
+                lambda value: (
+                    not isinstance(value, list)
+                    or all(item_check(item) for item in value)
+                )
+            )
+
+        for keyword, holds in (
+            ("minItems", lambda value, bound: len(value) >= bound),
+            ("maxItems", lambda value, bound: len(value) <= bound),
+        ):
+            if keyword in node:
+                handled.add(keyword)
+                bound = node[keyword]
+                checks.append(
+                    lambda value, holds=holds, bound=bound: (
+                        not isinstance(value, list) or holds(value, bound)
+                    )
+                )
+
+        if "allOf" in node:
+            handled.add("allOf")
+            checks.extend(self.compile(item) for item in node["allOf"])
+
+        if "anyOf" in node:
+            handled.add("anyOf")
+            any_checks = [self.compile(item) for item in node["anyOf"]]
+            checks.append(lambda value: any(item(value) for item in any_checks))
+
+        if "oneOf" in node:
+            handled.add("oneOf")
+            one_checks = [self.compile(item) for item in node["oneOf"]]
+            checks.append(
+                lambda value: sum(1 for item in one_checks if item(value)) == 1
+            )
+
+        unsupported = set(node) - handled
+        if unsupported:
+            raise UnsupportedSchemaError(
+                f"unsupported schema keywords: {', '.join(sorted(unsupported))}"
+            )
+        return _all_of(checks)
+
+
+def compile_schema(schema: dict[str, Any]) -> Check:
+    """Compile ``schema`` into a predicate that is exact for valid instances."""
+    return _Compiler(schema).compile(schema)
+
+
+class FastPathValidator:
+    """Drop-in for ``Draft7Validator.iter_errors`` with a compiled fast path."""
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        self.schema = schema
+        self.full = Draft7Validator(schema)
+        try:
+            self.check: Check | None = compile_schema(schema)
+        except UnsupportedSchemaError:
+            self.check = None
+
+    def is_valid(self, instance: Any) -> bool:
+        if self.check is not None and self.check(instance):
+            return True
+        return self.full.is_valid(instance)
+
+    def iter_errors(self, instance: Any) -> Iterator[Any]:
+        if self.check is not None and self.check(instance):
+            return iter(())
+        return self.full.iter_errors(instance)
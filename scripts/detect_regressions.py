@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Flag version-over-version performance regressions in the leaderboard history.
+
+Entries are grouped into series (engine + compare scope), each series is
+ordered by engine version, and every version is compared with the previous
+one. A throughput drop or a ttft / tbt / peak memory increase beyond its
+threshold is a regression. Missing, boolean and non-positive values are
+skipped, as on the page. The report is JSON and the exit status is 1 when
+any regression is found, so the script can gate a publish step.
+
+One dict pass builds the series and each series is sorted once, so a run is
+O(n log n) in the number of entries with no pairwise scans across versions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from compare_matrix import metric_value
+from entry_view import EntryView
+from leaderboard_display import get_engine, get_engine_version
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+REGRESSION_REPORT_SCHEMA_VERSION = "leaderboard-regression-report/v1"
+DEFAULT_INPUTS = (
+    ROOT_DIR / "data" / "leaderboard_single.json",
+    ROOT_DIR / "data" / "leaderboard_multi.json",
+)
+# (metric, higher_is_better, default threshold in percent, CLI flag)
+REGRESSION_METRICS = (
+    ("throughput_tps", True, 5.0, "--throughput-threshold"),
+    ("ttft_ms", False, 10.0, "--ttft-threshold"),
+    ("tbt_ms", False, 10.0, "--tbt-threshold"),
+    ("peak_mem_mb", False, 10.0, "--peak-mem-threshold"),
+)
+
+
+def version_key(version: str) -> tuple[int, ...]:
+    """Sort key equal to ``leaderboard_display.compare_versions`` ordering."""
+    parts = []
+    for part in version.split("."):
+        match = re.match(r"\s*[+-]?\d+", part)
+        parts.append(int(match.group()) if match else 0)
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
+
+def build_series(
+    entries: Iterable[dict[str, Any]],
+    engines: set[str] | None = None,
+) -> dict[tuple[str, str], list[tuple[str, EntryView]]]:
+    """``(engine, scope_key)`` -> ``[(version, view)]`` ordered oldest first.
+
+    Several runs of one version keep the newest (``entry_sort_key``), as dedup
+    does.
+    """
+    latest: dict[tuple[str, str], dict[str, EntryView]] = {}
+    for entry in entries:
+        engine = get_engine(entry)
+        if engines is not None and engine not in engines:
+            continue
+        view = EntryView(entry)
+        versions = latest.setdefault((engine, view.scope_key), {})
+        version = get_engine_version(entry) or "unknown"
+        current = versions.get(version)
+        if current is None or view.sort_key > current.sort_key:
+            versions[version] = view
+    return {
+        key: sorted(
+            versions.items(),
+            key=lambda item: (version_key(item[0]), item[1].sort_key),
+        )
+        for key, versions in latest.items()
+    }
+
+
+def detect_regressions(
+    entries: Iterable[dict[str, Any]],
+    thresholds: dict[str, float],
+    *,
+    engines: set[str] | None = None,
+    latest_only: bool = False,
+) -> dict[str, Any]:
+    """Regression report for consecutive versions of every series.
+
+    ``thresholds`` maps each metric in ``REGRESSION_METRICS`` to the allowed
+    change in percent. With ``latest_only`` only the newest version of each
+    series is checked against the one before it.
+    """
+    series = build_series(entries, engines)
+    regressions: list[dict[str, Any]] = []
+    comparisons = 0
+    for (engine, scope_key), versions in sorted(series.items()):
+        pairs = list(zip(versions, versions[1:]))
+        if latest_only:
+            pairs = pairs[-1:]
+        for (previous_version, previous), (version, current) in pairs:
+            comparisons += 1
+            previous_metrics = previous.entry.get("metrics") or {}
+            current_metrics = current.entry.get("metrics") or {}
+            for metric, higher_is_better, _, _ in REGRESSION_METRICS:
+                before = metric_value(previous_metrics, metric)
+                after = metric_value(current_metrics, metric)
+                # Placeholder runs report 0, which the page shows as missing.
+                if before is None or after is None or before <= 0 or after <= 0:
+                    continue
+                delta_pct = (after - before) / abs(before) * 100.0
+                worse_pct = -delta_pct if higher_is_better else delta_pct
+                if worse_pct <= thresholds[metric]:
+                    continue
+                regressions.append(
+                    {
+                        "engine": engine,
+                        "scope_key": scope_key,
+                        "scope": current.scope,
+                        "metric": metric,
+                        "previous_version": previous_version,
+                        "version": version,
+                        "previous_value": before,
+                        "value": after,
+                        "delta_pct": round(delta_pct, 4),
+                        "threshold_pct": thresholds[metric],
+                        "previous_entry_id": previous.entry.get("entry_id"),
+                        "entry_id": current.entry.get("entry_id"),
+                    }
+                )
+
+    return {
+        "schema_version": REGRESSION_REPORT_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "thresholds_pct": thresholds,
+        "latest_only": latest_only,
+        "series_count": len(series),
+        "comparison_count": comparisons,
+        "regression_count": len(regressions),
+        "regressions": regressions,
+    }
+
+
+def load_entries(
+    inputs: list[Path], source_dir: Path | None, schema_path: Path
+) -> Iterable[dict[str, Any]]:
+    """Entries of the given snapshots, or a stream of ``source_dir`` artifacts."""
+    if source_dir is not None:
+        from aggregate_results import iter_manifest_entries, load_schema
+        from compiled_schema import FastPathValidator
+
+        return iter_manifest_entries(
+            source_dir, FastPathValidator(load_schema(schema_path))
+        )
+    entries: list[dict[str, Any]] = []
+    for path in inputs:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(payload, list):
+            raise ValueError(f"{path}: expected a JSON array of leaderboard entries")
+        entries.extend(payload)
+    return entries
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--input",
+        type=Path,
+        action="append",
+        help=(
+            "Leaderboard snapshot (JSON array) to scan; repeatable "
+            "(default: data/leaderboard_single.json and data/leaderboard_multi.json)."
+        ),
+    )
+    parser.add_argument(
+        "--source-dir",
+        type=Path,
+        help="Scan a benchmark export (leaderboard_manifest.json tree) instead.",
+    )
+    parser.add_argument(
+        "--schema",
+        type=Path,
+        default=ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json",
+        help="Schema used to validate --source-dir artifacts.",
+    )
+    parser.add_argument(
+        "--engines",
+        help="Comma-separated engines to check (default: all).",
+    )
+    parser.add_argument(
+        "--latest-only",
+        action="store_true",
+        help="Only compare the newest version of each series with the previous one.",
+    )
+    for metric, _, default, flag in REGRESSION_METRICS:
+        parser.add_argument(
+            flag,
+            dest=f"{metric}_threshold",
+            type=float,
+            default=default,
+            help=f"Allowed {metric} change in percent (default: {default}).",
+        )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Write the JSON report here instead of stdout.",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    # --source-dir artifacts are parsed lazily, so read errors surface while
+    # the series are built.
+    try:
+        report = detect_regressions(
+            load_entries(
+                args.input or list(DEFAULT_INPUTS), args.source_dir, args.schema
+            ),
+            {
+                metric: getattr(args, f"{metric}_threshold")
+                for metric, _, _, _ in REGRESSION_METRICS
+            },
+            engines=set(args.engines.split(",")) if args.engines else None,
+            latest_only=args.latest_only,
+        )
+    except (OSError, ValueError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 2
+    text = json.dumps(report, indent=2, ensure_ascii=False) + "\n"
+    if args.output is None:
+        sys.stdout.write(text)
+    else:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text, encoding="utf-8")
+
+    summary = (
+        f"{report['regression_count']} regressions in "
+        f"{report['comparison_count']} version comparisons "
+        f"across {report['series_count']} series"
+    )
+    print(("❌ " if report["regressions"] else "✅ ") + summary, file=sys.stderr)
+    for item in report["regressions"]:
+        print(
+            f"  {item['engine']} {item['previous_version']} -> {item['version']} "
+            f"{item['metric']} {item['delta_pct']:+.1f}% ({item['scope_key']})",
+            file=sys.stderr,
+        )
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,261 @@
+"""Normalized per-entry fields shared by dedup, compare grouping and summaries.
+
+``split_entries`` and ``build_compare_snapshot`` used to walk the same nested
+entry dicts several times each (scope key, then scope dict, then the workload
+notes scan again, engine summaries twice per representative entry).
+``EntryView`` extracts those fields once per entry for the compare passes;
+dedup only reads the idempotency key and works on the entries themselves.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+WORKLOAD_NOTE_NAMES = ("Q1", "Q2", "Q3", "Q4", "Q5", "Q6", "Q7", "Q8")
+# Tail-latency fields the compare summary carries; ``None`` when not reported.
+PERCENTILE_METRICS = ("ttft_p50_ms", "ttft_p99_ms", "tbt_p50_ms", "tbt_p99_ms")
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_timestamp(raw: str) -> int | None:
+    """Whole seconds since the epoch for an ISO-8601 string, ``None`` if invalid."""
+    try:
+        return int(datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return None
+
+
+def entry_timestamp(entry: dict[str, Any]) -> int:
+    """``metadata.submitted_at``, else ``metadata.release_date``, else 0."""
+    metadata = entry.get("metadata") or {}
+    raw = metadata.get("submitted_at")
+    if raw and isinstance(raw, str):
+        # Fast path for the common case; dedup calls this on every collision.
+        timestamp = parse_timestamp(raw)
+        if timestamp is not None:
+            return timestamp
+    for field in ("submitted_at", "release_date"):
+        raw = metadata.get(field)
+        if isinstance(raw, str) and raw:
+            timestamp = parse_timestamp(raw)
+            if timestamp is not None:
+                return timestamp
+    return 0
+
+
+def entry_sort_key(entry: dict[str, Any]) -> tuple[int, float]:
+    """Typed ``(timestamp, throughput_tps)`` key; the larger key is the newer run.
+
+    ``max(entries, key=entry_sort_key)`` picks the entry dedup keeps;
+    ``sorted(entries, key=entry_sort_key)`` orders runs oldest first.
+    """
+    throughput = (entry.get("metrics") or {}).get("throughput_tps")
+    return entry_timestamp(entry), float(throughput or 0.0)
+
+
+def entry_order_key(
+    entry: dict[str, Any], timestamp: int | None = None
+) -> tuple[str, str, str, int]:
+    """``split_entries`` output order: engine, model, workload, then time.
+
+    ``timestamp`` is ``entry_timestamp(entry)`` when the caller already has it.
+    """
+    workload = entry.get("workload") or {}
+    return (
+        str(entry.get("engine") or ""),
+        str((entry.get("model") or {}).get("name") or ""),
+        str(workload.get("name") or "") if isinstance(workload, dict) else "",
+        entry_timestamp(entry) if timestamp is None else timestamp,
+    )
+
+
+def build_idempotency_key(entry: dict[str, Any]) -> str:
+    metadata = entry.get("metadata") or {}
+    key = metadata.get("idempotency_key")
+    if not isinstance(key, str) or not key.strip():
+        raise ValueError("leaderboard entry is missing metadata.idempotency_key")
+    return key
+
+
+def extract_workload_name(entry: dict[str, Any]) -> str:
+    workload = entry.get("workload") or {}
+    if isinstance(workload, dict):
+        for key in ("name", "workload_id", "suite_id"):
+            value = workload.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip()
+
+    notes = str((entry.get("metadata") or {}).get("notes") or "")
+    for workload_name in WORKLOAD_NOTE_NAMES:
+        if workload_name in notes.upper():
+            return workload_name
+    return "LEGACY"
+
+
+def build_compare_scope_key(entry: dict[str, Any]) -> str:
+    return EntryView(entry).scope_key
+
+
+def _optional_float(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def build_compare_engine_summary(entry: dict[str, Any]) -> dict[str, Any]:
+    metrics = entry.get("metrics") or {}
+    metadata = entry.get("metadata") or {}
+    return {
+        "engine": str(entry.get("engine") or metadata.get("engine") or "unknown"),
+        "engine_version": str(
+            entry.get("engine_version") or metadata.get("engine_version") or "unknown"
+        ),
+        "entry_id": str(entry.get("entry_id") or ""),
+        "submitted_at": metadata.get("submitted_at"),
+        "canonical_path": entry.get("canonical_path"),
+        "metrics": {
+            "ttft_ms": float(metrics.get("ttft_ms") or 0.0),
+            "tbt_ms": float(metrics.get("tbt_ms") or 0.0),
+            "throughput_tps": float(metrics.get("throughput_tps") or 0.0),
+            "output_throughput_tps": float(
+                metrics.get("output_throughput_tps")
+                or metrics.get("throughput_tps")
+                or 0.0
+            ),
+            "error_rate": float(metrics.get("error_rate") or 0.0),
+            **{name: _optional_float(metrics.get(name)) for name in PERCENTILE_METRICS},
+        },
+    }
+
+
+SCOPE_FIELDS = (
+    "model",
+    "hardware",
+    "precision",
+    "workload",
+    "config_type",
+    "chip_count",
+    "node_count",
+)
+
+
+class EntryView:
+    """One entry plus the fields aggregation reads from it.
+
+    Fields are extracted on first access and cached, so the compare scope is
+    built once however many compare passes read it.
+    ``scope_key`` matches ``build_compare_scope_key``; ``sort_key`` is
+    ``entry_sort_key(entry)`` and may be handed in when already computed.
+    """
+
+    __slots__ = (
+        "entry",
+        "node_count",
+        "_engine",
+        "_scope_values",
+        "_scope_key",
+        "_sort_key",
+        "_summary",
+    )
+
+    def __init__(
+        self, entry: dict[str, Any], sort_key: tuple[int, float] | None = None
+    ) -> None:
+        self.entry = entry
+        self._sort_key = sort_key
+        cluster = entry.get("cluster")
+        self.node_count = int(cluster.get("node_count") or 1) if cluster else 1
+        self._engine: str | None = None
+        self._scope_values: tuple[str, str, str, str, str, int, int] | None = None
+        self._scope_key: str | None = None
+        self._summary: dict[str, Any] | None = None
+
+    @property
+    def engine(self) -> str:
+        if self._engine is None:
+            entry = self.entry
+            self._engine = str(
+                entry.get("engine")
+                or (entry.get("metadata") or {}).get("engine")
+                or "unknown"
+            )
+        return self._engine
+
+    @property
+    def category(self) -> str:
+        return "multi" if self.node_count > 1 else "single"
+
+    @property
+    def scope_values(self) -> tuple[str, str, str, str, str, int, int]:
+        if self._scope_values is None:
+            entry = self.entry
+            model = entry.get("model") or {}
+            hardware = entry.get("hardware") or {}
+            self._scope_values = (
+                str(model.get("name") or "unknown-model"),
+                str(hardware.get("chip_model") or "unknown-hardware"),
+                str(model.get("precision") or "unknown-precision"),
+                extract_workload_name(entry),
+                str(entry.get("config_type") or "unknown-config"),
+                int(hardware.get("chip_count") or 0),
+                self.node_count,
+            )
+        return self._scope_values
+
+    @property
+    def scope_key(self) -> str:
+        if self._scope_key is None:
+            model, hardware, precision, workload, config, chips, nodes = (
+                self.scope_values
+            )
+            self._scope_key = (
+                f"{model}|{hardware}|{precision}|{workload}|{config}|{chips}|{nodes}"
+            )
+        return self._scope_key
+
+    @property
+    def scope(self) -> dict[str, Any]:
+        return dict(zip(SCOPE_FIELDS, self.scope_values))
+
+    @property
+    def sort_key(self) -> tuple[int, float]:
+        if self._sort_key is None:
+            self._sort_key = entry_sort_key(self.entry)
+        return self._sort_key
+
+    def compare_summary(self) -> dict[str, Any]:
+        """``build_compare_engine_summary(entry)``, computed on first use."""
+        if self._summary is None:
+            self._summary = build_compare_engine_summary(self.entry)
+        return self._summary
+
+
+def as_entry_view(item: dict[str, Any] | EntryView) -> EntryView:
+    return item if type(item) is EntryView else EntryView(item)
+
+
+def group_by_scope(
+    entries: Iterable[dict[str, Any] | EntryView],
+) -> dict[str, dict[str, Any]]:
+    """Compare groups keyed by ``scope_key``, keeping each engine's newest view.
+
+    Each group holds ``scope_key``, ``scope``, ``category`` and
+    ``entries_by_engine`` (engine -> the view with the largest ``sort_key``).
+    """
+    grouped: dict[str, dict[str, Any]] = {}
+    for view in map(as_entry_view, entries):
+        group = grouped.get(view.scope_key)
+        if group is None:
+            group = grouped[view.scope_key] = {
+                "scope_key": view.scope_key,
+                "scope": view.scope,
+                "category": view.category,
+                "entries_by_engine": {},
+            }
+        existing = group["entries_by_engine"].get(view.engine)
+        if existing is None or view.sort_key > existing.sort_key:
+            group["entries_by_engine"][view.engine] = view
+    return grouped
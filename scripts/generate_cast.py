@@ -1,90 +1,383 @@
+"""Generate the website's asciinema demo cast from a SageLLM service.
+
+The service's ``/health`` and ``/v1/models`` responses are fetched
+concurrently and recorded into a JSON Lines fixture. The cast is then rendered
+from the fixture, one event per line, written straight to disk.
+``--record FIXTURE`` keeps the fixture, and ``--replay FIXTURE`` renders the
+same cast again with no network access (``local_openai_server.py`` is a
+stand-in service to record from).
+
+``--stream-chat`` adds a streaming ``/v1/chat/completions`` request, sent once
+both GETs are done so its timings carry no contention from them. Each SSE
+chunk is recorded with its arrival offset and appears in the cast at that
+time, so the demo shows real token pacing; typed commands keep a fixed typing
+speed. The measured TTFT / TBT are printed after the completion and written to
+a sidecar JSON next to the cast (``<output>.timing.json``).
+"""
+
 from __future__ import annotations
 
 import argparse
 import json
+import math
+import tempfile
+import threading
 import time
 import urllib.error
 import urllib.request
+from array import array
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-
+from typing import Any, TextIO
 
 PROMPT = "\u001b[1;32muser@sagellm\u001b[0m:\u001b[1;34m~\u001b[0m$ "
+CAST_FIXTURE_VERSION = "sagellm-cast-fixture/v1"
+CAST_TIMING_VERSION = "sagellm-cast-timing/v1"
+DEFAULT_CHAT_PROMPT = "Hello, world!"
+DEFAULT_TIMEOUT = 10.0
 
 
-def _http_get(url: str) -> str:
-    with urllib.request.urlopen(url, timeout=10) as resp:  # noqa: S310
+def _http_get(url: str, timeout: float = DEFAULT_TIMEOUT) -> str:
+    with urllib.request.urlopen(url, timeout=timeout) as resp:  # noqa: S310
         return resp.read().decode("utf-8")
 
 
-def _safe_get(url: str) -> str:
+def _safe_get(url: str, timeout: float = DEFAULT_TIMEOUT) -> str:
     try:
-        return _http_get(url)
+        return _http_get(url, timeout)
     except urllib.error.HTTPError as exc:
         return f"HTTP {exc.code}: {exc.reason}"
     except Exception as exc:  # noqa: BLE001
         return f"ERROR: {exc}"
 
 
-def create_cast_file(filename: str, *, base_url: str, model: str, port: int) -> None:
-    events: list[list[object]] = []
-    header = {
-        "version": 2,
-        "width": 100,
-        "height": 24,
-        "timestamp": int(time.time()),
-        "env": {"SHELL": "/bin/bash", "TERM": "xterm-256color"},
-    }
-    current_time = 0.0
+def _record_chat(
+    sink: Callable[[dict[str, Any]], None],
+    base_url: str,
+    *,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    timeout: float,
+) -> None:
+    """Stream one chat completion into ``sink``, one record per SSE chunk."""
+    body = json.dumps(
+        {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+    ).encode("utf-8")
+    request = urllib.request.Request(
+        f"{base_url}/v1/chat/completions",
+        data=body,
+        headers={"Content-Type": "application/json", "Accept": "text/event-stream"},
+        method="POST",
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:  # noqa: S310
+            sink({"endpoint": "chat", "status": resp.status})
+            for raw in resp:
+                line = raw.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                offset = round(time.perf_counter() - started, 6)
+                sink({"endpoint": "chat", "t": offset, "data": data})
+    except urllib.error.HTTPError as exc:
+        sink(
+            {
+                "endpoint": "chat",
+                "status": exc.code,
+                "body": f"HTTP {exc.code}: {exc.reason}",
+            }
+        )
+    except Exception as exc:  # noqa: BLE001
+        sink({"endpoint": "chat", "status": 0, "body": f"ERROR: {exc}"})
+
+
+def record_fixture(
+    fixture_path: Path,
+    *,
+    base_url: str,
+    model: str,
+    prompt: str = DEFAULT_CHAT_PROMPT,
+    max_tokens: int = 32,
+    timeout: float = DEFAULT_TIMEOUT,
+    stream_chat: bool = False,
+) -> None:
+    """Fetch every endpoint and append records as they arrive.
+
+    The two GETs run concurrently. With ``stream_chat`` the timed chat stream
+    starts once both are done, so its TTFT does not include them.
+    """
+    fixture_path.parent.mkdir(parents=True, exist_ok=True)
+    lock = threading.Lock()
+    with fixture_path.open("w", encoding="utf-8") as f:
+
+        def sink(record: dict[str, Any]) -> None:
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with lock:
+                f.write(line)
+
+        sink(
+            {
+                "fixture": CAST_FIXTURE_VERSION,
+                "base_url": base_url,
+                "model": model,
+                "prompt": prompt,
+                "max_tokens": max_tokens,
+                "recorded_at": int(time.time()),
+            }
+        )
+
+        def get(endpoint: str, path: str) -> None:
+            sink({"endpoint": endpoint, "body": _safe_get(base_url + path, timeout)})
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(get, "health", "/health"),
+                pool.submit(get, "models", "/v1/models"),
+            ]
+            for future in futures:
+                future.result()
+        if stream_chat:
+            _record_chat(
+                sink,
+                base_url,
+                model=model,
+                prompt=prompt,
+                max_tokens=max_tokens,
+                timeout=timeout,
+            )
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    return sorted_values[max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)]
+
+
+def stream_timings(offsets: Sequence[float]) -> dict[str, Any]:
+    """TTFT / TBT summary of content-chunk arrival offsets.
+
+    ``offsets`` are seconds since the request was sent. TTFT is the first
+    offset, TBT the gaps between consecutive chunks, and ``decode_tps`` the
+    chunk rate after the first one. All times are in milliseconds.
+    """
+    summary: dict[str, Any] = {"chunks": len(offsets)}
+    if not offsets:
+        return summary
+    gaps = sorted(b - a for a, b in zip(offsets, offsets[1:]))
+    summary["ttft_ms"] = round(offsets[0] * 1000, 3)
+    summary["total_ms"] = round(offsets[-1] * 1000, 3)
+    if gaps:
+        decode_s = offsets[-1] - offsets[0]
+        summary.update(
+            tbt_ms=round(sum(gaps) / len(gaps) * 1000, 3),
+            tbt_p50_ms=round(_percentile(gaps, 50) * 1000, 3),
+            tbt_p90_ms=round(_percentile(gaps, 90) * 1000, 3),
+            tbt_max_ms=round(gaps[-1] * 1000, 3),
+            decode_tps=round(len(gaps) / decode_s, 3) if decode_s > 0 else None,
+        )
+    return summary
+
+
+def _iter_fixture(fixture_path: Path) -> Iterator[dict[str, Any]]:
+    with fixture_path.open(encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class CastWriter:
+    """Write asciicast v2 events to ``f`` as they are produced."""
 
-    def emit(text: str, *, speed: float = 0.0) -> None:
-        nonlocal current_time
+    def __init__(self, f: TextIO, header: dict[str, Any]) -> None:
+        self.f = f
+        self.current_time = 0.0
+        f.write(json.dumps(header, ensure_ascii=False) + "\n")
+
+    def _event(self, at: float, text: str) -> None:
+        self.f.write(json.dumps([at, "o", text], ensure_ascii=False) + "\n")
+
+    def emit(self, text: str, *, speed: float = 0.0) -> None:
         if speed <= 0:
-            events.append([current_time, "o", text])
-            current_time += 0.08
+            self._event(self.current_time, text)
+            self.current_time += 0.08
             return
         for char in text:
-            events.append([current_time, "o", char])
-            current_time += speed
-
-    def newline(lines: str = "") -> None:
-        emit(lines.replace("\n", "\r\n") + "\r\n")
-
-    def type_command(cmd: str, *, speed: float = 0.055) -> None:
-        nonlocal current_time
-        emit(PROMPT)
-        current_time += 0.35
-        emit(cmd, speed=speed)
-        emit("\r\n")
-        current_time += 0.25
-
-    health_body = _safe_get(f"{base_url}/health").strip()
-    models_body = _safe_get(f"{base_url}/v1/models").strip()
-
-    type_command("pip install isagellm")
-    newline("Requirement already satisfied: isagellm")
-    newline()
-
-    type_command(f"sagellm serve --backend cpu --model {model} --port {port}")
-    newline("🌐 Starting sageLLM Gateway...")
-    newline(f"📦 Model: {model}")
-    newline("🖥️  Backend: cpu")
-    newline(f"✅ OpenAI-compatible API ready at http://localhost:{port}")
-    newline()
-
-    type_command(f"curl http://localhost:{port}/health")
-    newline(health_body)
-    newline()
-
-    type_command(f"curl http://localhost:{port}/v1/models")
-    newline(models_body)
-    newline()
+            self._event(self.current_time, char)
+            self.current_time += speed
+
+    def emit_at(self, offset: float, text: str) -> None:
+        """Emit ``text`` ``offset`` seconds after the current time (no advance)."""
+        self._event(self.current_time + offset, text)
+
+    def newline(self, lines: str = "") -> None:
+        self.emit(lines.replace("\n", "\r\n") + "\r\n")
+
+    def type_command(self, cmd: str, *, speed: float = 0.055) -> None:
+        self.emit(PROMPT)
+        self.current_time += 0.35
+        self.emit(cmd, speed=speed)
+        self.emit("\r\n")
+        self.current_time += 0.25
+
+
+def render_cast(
+    fixture_path: Path,
+    filename: str | Path,
+    *,
+    port: int,
+    timings_path: Path | None = None,
+) -> dict[str, Any] | None:
+    """Render the cast from a recorded fixture without touching the network.
+
+    The fixture is read twice: once for the header and the short
+    ``/health`` / ``/v1/models`` bodies, then again to stream the chat chunks
+    if it has any. Chunk texts are never held in memory; only one 8-byte
+    arrival offset per chunk is kept for the TBT percentiles. Returns the
+    ``stream_timings`` of the completion (``None`` if it failed or was not
+    recorded) and writes them to ``timings_path`` when given.
+    """
+    header: dict[str, Any] = {}
+    bodies: dict[str, str] = {}
+    chat_status: dict[str, Any] = {}
+    for record in _iter_fixture(fixture_path):
+        if "fixture" in record:
+            header = record
+        elif record.get("endpoint") in ("health", "models"):
+            bodies[record["endpoint"]] = record["body"]
+        elif record.get("endpoint") == "chat" and "t" not in record:
+            chat_status = record
+    if header.get("fixture") != CAST_FIXTURE_VERSION:
+        raise SystemExit(f"❌ {fixture_path} is not a {CAST_FIXTURE_VERSION} fixture")
+    model = header["model"]
+    timings = None
 
     output_path = Path(filename)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as f:
-        f.write(json.dumps(header, ensure_ascii=False) + "\n")
-        for event in events:
-            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        cast = CastWriter(
+            f,
+            {
+                "version": 2,
+                "width": 100,
+                "height": 24,
+                "timestamp": header["recorded_at"],
+                "env": {"SHELL": "/bin/bash", "TERM": "xterm-256color"},
+            },
+        )
+        cast.type_command("pip install isagellm")
+        cast.newline("Requirement already satisfied: isagellm")
+        cast.newline()
+
+        cast.type_command(f"sagellm serve --backend cpu --model {model} --port {port}")
+        cast.newline("🌐 Starting sageLLM Gateway...")
+        cast.newline(f"📦 Model: {model}")
+        cast.newline("🖥️  Backend: cpu")
+        cast.newline(f"✅ OpenAI-compatible API ready at http://localhost:{port}")
+        cast.newline()
+
+        cast.type_command(f"curl http://localhost:{port}/health")
+        cast.newline(bodies.get("health", "").strip())
+        cast.newline()
+
+        cast.type_command(f"curl http://localhost:{port}/v1/models")
+        cast.newline(bodies.get("models", "").strip())
+        cast.newline()
+
+        if chat_status:
+            # Only fixtures recorded with --stream-chat have a chat stream.
+            request = json.dumps(
+                {
+                    "model": model,
+                    "messages": [{"role": "user", "content": header["prompt"]}],
+                    "stream": True,
+                },
+                ensure_ascii=False,
+            )
+            cast.type_command(
+                f"curl -N http://localhost:{port}/v1/chat/completions -d '{request}'"
+            )
+            if "body" in chat_status:
+                cast.newline(chat_status["body"])
+            else:
+                last_offset = 0.0
+                offsets = array("d")
+                for record in _iter_fixture(fixture_path):
+                    if record.get("endpoint") != "chat" or "t" not in record:
+                        continue
+                    try:
+                        choices = json.loads(record["data"]).get("choices") or [{}]
+                        text = (choices[0].get("delta") or {}).get("content")
+                    except (ValueError, AttributeError):
+                        continue
+                    if text:
+                        last_offset = max(last_offset, record["t"])
+                        offsets.append(last_offset)
+                        cast.emit_at(last_offset, text)
+                cast.current_time += last_offset
+                cast.newline()
+                timings = stream_timings(offsets)
+                if len(offsets) > 1:
+                    cast.newline(
+                        f"⏱️  TTFT {timings['ttft_ms']:.1f} ms · "
+                        f"TBT {timings['tbt_ms']:.1f} ms · {len(offsets)} chunks"
+                    )
+            cast.newline()
+
+    if timings_path is not None and timings is not None:
+        timings_path.parent.mkdir(parents=True, exist_ok=True)
+        sidecar = {
+            "schema_version": CAST_TIMING_VERSION,
+            "cast": output_path.name,
+            "base_url": header.get("base_url"),
+            "model": model,
+            "prompt": header["prompt"],
+            "recorded_at": header["recorded_at"],
+            **timings,
+        }
+        timings_path.write_text(
+            json.dumps(sidecar, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+    return timings
+
+
+def create_cast_file(
+    filename: str,
+    *,
+    base_url: str,
+    model: str,
+    port: int,
+    prompt: str = DEFAULT_CHAT_PROMPT,
+    max_tokens: int = 32,
+    timeout: float = DEFAULT_TIMEOUT,
+    record: Path | None = None,
+    timings_path: Path | None = None,
+    stream_chat: bool = False,
+) -> dict[str, Any] | None:
+    """Record the live service (into ``record`` if given) and render the cast."""
+    options = {
+        "base_url": base_url,
+        "model": model,
+        "prompt": prompt,
+        "max_tokens": max_tokens,
+        "timeout": timeout,
+        "stream_chat": stream_chat,
+    }
+    if record is not None:
+        record_fixture(record, **options)
+        return render_cast(record, filename, port=port, timings_path=timings_path)
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_path = Path(tmp) / "cast_fixture.jsonl"
+        record_fixture(fixture_path, **options)
+        return render_cast(fixture_path, filename, port=port, timings_path=timings_path)
 
 
 def main() -> None:
@@ -95,13 +388,73 @@ def main() -> None:
     parser.add_argument("--base-url", default="http://localhost:8080")
     parser.add_argument("--model", default="sshleifer/tiny-gpt2")
     parser.add_argument("--port", type=int, default=8888)
-    args = parser.parse_args()
-    create_cast_file(
-        args.output,
-        base_url=args.base_url.rstrip("/"),
-        model=args.model,
-        port=args.port,
+    parser.add_argument("--prompt", default=DEFAULT_CHAT_PROMPT)
+    parser.add_argument("--max-tokens", type=int, default=32)
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="Per-request socket timeout in seconds.",
     )
+    parser.add_argument(
+        "--stream-chat",
+        action="store_true",
+        help=(
+            "Also stream a chat completion, replay its real token pacing and "
+            "write measured TTFT / TBT."
+        ),
+    )
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        metavar="PATH",
+        help="TTFT / TBT sidecar JSON (default: <output>.timing.json).",
+    )
+    parser.add_argument(
+        "--no-timings", action="store_true", help="Do not write the sidecar."
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--record",
+        type=Path,
+        metavar="FIXTURE",
+        help="Keep the recorded responses in this JSON Lines fixture.",
+    )
+    mode.add_argument(
+        "--replay",
+        type=Path,
+        metavar="FIXTURE",
+        help="Render from a recorded fixture with no network access.",
+    )
+    args = parser.parse_args()
+    timings_path = None
+    if not args.no_timings:
+        timings_path = args.timings or Path(args.output).with_suffix(".timing.json")
+    if args.replay is not None:
+        timings = render_cast(
+            args.replay, args.output, port=args.port, timings_path=timings_path
+        )
+    else:
+        timings = create_cast_file(
+            args.output,
+            base_url=args.base_url.rstrip("/"),
+            model=args.model,
+            port=args.port,
+            prompt=args.prompt,
+            max_tokens=args.max_tokens,
+            timeout=args.timeout,
+            record=args.record,
+            timings_path=timings_path,
+            stream_chat=args.stream_chat,
+        )
+    print(f"✅ Cast written: {args.output}")
+    if timings and "tbt_ms" in timings:
+        print(
+            f"  TTFT {timings['ttft_ms']:.1f} ms, TBT {timings['tbt_ms']:.1f} ms "
+            f"(p90 {timings['tbt_p90_ms']:.1f} ms), {timings['chunks']} chunks"
+        )
+    if timings_path is not None and timings is not None:
+        print(f"  timings: {timings_path}")
 
 
 if __name__ == "__main__":
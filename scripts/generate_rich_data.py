@@ -1,9 +1,38 @@
 #!/usr/bin/env python3
-"""生成丰富的测试数据，包括性能回退和多种配置组合"""
+"""生成可复现、可放大的合成 benchmark 导出物，用于压测 leaderboard 聚合流水线。
 
+按 HARDWARE_CONFIGS × MODELS × WORKLOADS × PRECISIONS × ENGINES × 版本 × 并发度做组合扫描，
+扫描一轮后以新的 run 序号继续，直到生成 ``--entries`` 条 entry。``--concurrency 1,4,16``
+为每个组合生成多个负载档位（吞吐随并发度饱和），供 ``leaderboard_scaling.json`` 画曲线；
+``--latency-histograms`` 为每条 entry 附带 ttft / tbt 延迟直方图及 p50/p90/p99；
+``--repeat-runs N`` 让每个组合连续生成 N 次共享同一 idempotency key 的重复 run，
+聚合时会合并它们的直方图。每条 entry 都符合
+``leaderboard_v1.schema.json``，并以 ``leaderboard_manifest.json`` + ``*_leaderboard.json``
+的标准导出结构流式写入磁盘（每 ``--entries-per-manifest`` 条一个 batch 目录），
+``aggregate_results.py --source-dir <output-dir>`` 可直接消费。
+
+同一 ``--seed`` 与参数总是生成逐字节相同的目录树。
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
 import json
+import math
 import random
+import re
+import shutil
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
+
+from latency_histogram import build_histogram, percentile_fields
+
+MANIFEST_SCHEMA_VERSION = "leaderboard-export-manifest/v2"
 
 # 配置参数
 HARDWARE_CONFIGS = {
@@ -80,17 +109,64 @@ MODELS = [
 ]
 
 WORKLOADS = [
-    {"type": "short_input", "prompt": 128, "output": 128},
-    {"type": "long_input", "prompt": 2048, "output": 512},
-    {"type": "pressure_test", "prompt": 512, "output": 256},
+    {"type": "short_input", "name": "Q1", "prompt": 128, "output": 128},
+    {"type": "long_input", "name": "Q2", "prompt": 2048, "output": 512},
+    {"type": "pressure_test", "name": "Q5", "prompt": 512, "output": 256},
 ]
 
 PRECISIONS = ["FP16", "BF16", "INT8", "INT4"]
 
 VERSIONS = ["0.3.2", "0.3.1", "0.3.0", "0.2.5"]
 
+# 引擎 -> 版本（新到旧）；sagellm 沿用 VERSIONS
+ENGINES = {
+    "sagellm": VERSIONS,
+    "vllm": ["0.7.3", "0.7.2", "0.6.6", "0.6.3"],
+    "sglang": ["0.4.3", "0.4.1", "0.3.6", "0.3.5"],
+    "lmdeploy": ["0.7.1", "0.7.0", "0.6.5", "0.6.4"],
+}
+
+ENGINE_FACTORS = {"sagellm": 1.0, "vllm": 0.93, "sglang": 0.97, "lmdeploy": 0.9}
+
+# 按版本新旧位置的性能因子；位置 1（如 sagellm 0.3.1）可能注入性能回退
+VERSION_FACTORS = [1.0, 0.95, 0.90, 0.85]
+
+CONFIG_TYPES = {
+    "single_chip": "single_gpu",
+    "multi_chip": "multi_gpu",
+    "multi_node": "multi_node",
+}
+
+# v0.3.0 分布式有更多问题：(版本位置, 概率)
+REGRESSION_RULES = {
+    "single_chip": (1, 0.2),
+    "multi_chip": (1, 0.15),
+    "multi_node": (2, 0.25),
+}
+
+RELEASE_BASE = datetime(2026, 1, 28, 10, 30, tzinfo=UTC)
+
+# 并发度超过该值后吞吐增长明显放缓（曲线拐点附近）
+SATURATION_CONCURRENCY = 8
+# 每条 entry 的直方图样本数
+HISTOGRAM_SAMPLES = 64
+
+
+def _vendor(chip_model: str) -> str:
+    if "NVIDIA" in chip_model:
+        return "NVIDIA"
+    if "Ascend" in chip_model:
+        return "Huawei"
+    # 昆仑芯不在 schema 的 vendor 枚举中
+    return "Other"
 
-def generate_base_metrics(hardware, model, workload, precision):
+
+def _key_part(value: Any) -> str:
+    slug = re.sub(r"[^a-z0-9._-]+", "-", str(value).strip().lower()).strip("-")
+    return slug or "unknown"
+
+
+def generate_base_metrics(hardware, model, workload, precision, engine, rng):
     """生成基础性能指标"""
     # 基础值（单卡 FP16 Qwen2-7B short_input）
     base_ttft = 45.0
@@ -110,30 +186,29 @@ def generate_base_metrics(hardware, model, workload, precision):
     precision_factors = {"FP16": 1.0, "BF16": 1.05, "INT8": 1.8, "INT4": 2.5}
     precision_factor = precision_factors.get(precision, 1.0)
 
+    engine_factor = ENGINE_FACTORS.get(engine, 1.0)
+
     # 计算指标
     ttft = base_ttft / (chip_factor**0.7) * workload_factor * (1.0 / precision_factor)
-    throughput = base_throughput * chip_factor * precision_factor / model_factor
+    throughput = (
+        base_throughput * chip_factor * precision_factor * engine_factor / model_factor
+    )
     memory = (
         base_memory * model_factor / (2.0 if precision in ["INT8", "INT4"] else 1.0)
     )
 
     return {
-        "ttft_ms": round(ttft + random.uniform(-5, 5), 1),
-        "throughput_tps": round(throughput + random.uniform(-10, 10), 1),
+        "ttft_ms": round(max(ttft / engine_factor + rng.uniform(-5, 5), 1.0), 1),
+        "throughput_tps": round(max(throughput + rng.uniform(-10, 10), 1.0), 1),
         "peak_mem_mb": int(memory * chip_factor),
     }
 
 
-def apply_version_delta(metrics, version, is_regression=False):
+def apply_version_delta(metrics, version_rank, workload, rng, is_regression=False):
     """应用版本差异，包括性能回退"""
-    version_factors = {
-        "0.3.2": 1.0,
-        "0.3.1": 0.95 if not is_regression else 1.03,  # 有些版本会回退
-        "0.3.0": 0.90,
-        "0.2.5": 0.85,
-    }
-
-    factor = version_factors.get(version, 1.0)
+    factor = VERSION_FACTORS[min(version_rank, len(VERSION_FACTORS) - 1)]
+    if is_regression:
+        factor = 1.03
 
     result = metrics.copy()
     result["ttft_ms"] = round(metrics["ttft_ms"] / factor, 1)
@@ -145,39 +220,121 @@ def apply_version_delta(metrics, version, is_regression=False):
     # 添加其他指标
     result["tbt_ms"] = round(1000.0 / result["throughput_tps"] * 10, 1)
     result["tpot_ms"] = result["tbt_ms"]
-    result["error_rate"] = round(random.uniform(0.005, 0.02), 3)
-    result["prefix_hit_rate"] = round(random.uniform(0.82, 0.93), 2)
-    result["kv_used_tokens"] = 2048 * (2 if "long" in str(metrics) else 1)
+    result["error_rate"] = round(rng.uniform(0.005, 0.02), 3)
+    result["prefix_hit_rate"] = round(rng.uniform(0.82, 0.93), 2)
+    result["kv_used_tokens"] = 2048 * (2 if "long" in workload["type"] else 1)
     result["kv_used_bytes"] = result["kv_used_tokens"] * 32768
-    result["evict_count"] = random.randint(1, 5)
-    result["evict_ms"] = round(random.uniform(0.8, 3.5), 1)
+    result["evict_count"] = rng.randint(1, 5)
+    result["evict_ms"] = round(rng.uniform(0.8, 3.5), 1)
     result["spec_accept_rate"] = (
-        round(random.uniform(0.70, 0.82), 2) if random.random() > 0.3 else None
+        round(rng.uniform(0.70, 0.82), 2) if rng.random() > 0.3 else None
     )
 
     return result
 
 
+def apply_concurrency(metrics, concurrency):
+    """按并发度缩放指标：总吞吐按 ``c / (1 + (c - 1) / SATURATION_CONCURRENCY)`` 饱和，
+    单请求的 ttft / tbt 随排队变长。"""
+    if concurrency == 1:
+        return metrics
+    gain = concurrency / (1 + (concurrency - 1) / SATURATION_CONCURRENCY)
+    result = metrics.copy()
+    result["throughput_tps"] = round(metrics["throughput_tps"] * gain, 1)
+    result["ttft_ms"] = round(
+        metrics["ttft_ms"] * (1 + (concurrency - 1) / SATURATION_CONCURRENCY), 1
+    )
+    result["tbt_ms"] = round(metrics["tbt_ms"] * concurrency / gain, 1)
+    result["tpot_ms"] = result["tbt_ms"]
+    return result
+
+
+def add_latency_histograms(metrics, rng):
+    """以 ttft / tbt 为中位数生成对数正态样本，写入直方图与 p50/p90/p99。"""
+    histograms = {
+        name: build_histogram(
+            rng.lognormvariate(math.log(metrics[name]), 0.3)
+            for _ in range(HISTOGRAM_SAMPLES)
+        )
+        for name in ("ttft_ms", "tbt_ms")
+    }
+    metrics.update(percentile_fields(histograms))
+    metrics["latency_histograms"] = histograms
+
+
 def generate_entry(
-    entry_id,
+    rng,
     category,
     hardware,
     model,
     workload,
     precision,
-    version,
-    is_regression=False,
+    engine,
+    version_rank,
+    concurrency=1,
+    run_index=0,
+    repeat=0,
+    latency_histograms=False,
 ):
-    """生成单条数据"""
-    base_metrics = generate_base_metrics(hardware, model, workload, precision)
-    metrics = apply_version_delta(base_metrics, version, is_regression)
+    """生成单条符合 leaderboard_v1 schema 的 entry
+
+    ``repeat`` 是同一 idempotency key 下的第几次重复 run（提交时间依次晚 1 小时）。
+    """
+    versions = ENGINES[engine]
+    engine_version = versions[version_rank]
+    regression_rank, regression_rate = REGRESSION_RULES[category]
+    is_regression = version_rank == regression_rank and rng.random() < regression_rate
+
+    base_metrics = generate_base_metrics(
+        hardware, model, workload, precision, engine, rng
+    )
+    metrics = apply_version_delta(
+        base_metrics, version_rank, workload, rng, is_regression
+    )
+    metrics = apply_concurrency(metrics, concurrency)
+    if latency_histograms:
+        add_latency_histograms(metrics, rng)
+
+    # sagellm_version 为 schema 必填：非 sagellm 引擎记录同批次的 sagellm 基线版本
+    sagellm_version = VERSIONS[min(version_rank, len(VERSIONS) - 1)]
+    if engine == "sagellm":
+        sagellm_version = engine_version
+
+    # 旧版本发布更早；重复 run 在同一版本发布后按天递增
+    release = RELEASE_BASE - timedelta(days=14 * version_rank)
+    submitted = release + timedelta(
+        days=run_index, hours=repeat, minutes=rng.randint(0, 600)
+    )
+    chip_model = hardware["chip_model"]
+    node_count = hardware.get("node_count", 1)
+    config_type = CONFIG_TYPES[category]
+    key = "|".join(
+        _key_part(part)
+        for part in (
+            engine,
+            engine_version,
+            sagellm_version,
+            workload["name"],
+            model["name"],
+            precision,
+            chip_model,
+            hardware["chip_count"],
+            node_count,
+            config_type,
+        )
+    )
+    if concurrency != 1:
+        key = f"{key}|c{concurrency}"
+    if run_index:
+        key = f"{key}|run{run_index}"
+    backend = "cuda" if "NVIDIA" in chip_model else "ascend"
 
     entry = {
-        "entry_id": entry_id,
-        "sagellm_version": version,
-        "config_type": "multi_gpu"
-        if category == "multi_chip"
-        else ("multi_node" if category == "multi_node" else "single_gpu"),
+        "entry_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "engine": engine,
+        "engine_version": engine_version,
+        "sagellm_version": sagellm_version,
+        "config_type": config_type,
         "hardware": {},
         "model": {
             "name": model["name"],
@@ -186,18 +343,19 @@ def generate_entry(
             "quantization": "None" if precision in ["FP16", "BF16"] else precision,
         },
         "workload": {
+            "name": workload["name"],
             "input_length": workload["prompt"],
             "output_length": workload["output"],
             "batch_size": 1,
-            "concurrent_requests": 1,
+            "concurrent_requests": concurrency,
             "dataset": workload["type"],
         },
         "metrics": metrics,
         "cluster": None,
         "versions": {
             "protocol": "0.1.1.0",
-            "backend": "0.3.0.6" if version == "0.3.2" else "0.3.0.5",
-            "core": "0.3.0.5" if version in ["0.3.2", "0.3.1"] else "0.3.0.4",
+            "backend": "0.3.0.6" if version_rank == 0 else "0.3.0.5",
+            "core": "0.3.0.5" if version_rank <= 1 else "0.3.0.4",
             "control_plane": "0.1.1.5",
             "gateway": "0.1.1.5",
             "kv_cache": "0.1.1.6",
@@ -220,229 +378,307 @@ def generate_entry(
             "prefix_cache_enabled": True,
         },
         "metadata": {
-            "submitted_at": f"2026-01-{random.randint(15, 28):02d}T10:30:00Z",
+            "submitted_at": submitted.strftime("%Y-%m-%dT%H:%M:%SZ"),
             "submitter": "IntelliStream Team",
-            "data_source": "automated-benchmark",
-            "reproducible_cmd": f"sage-llm benchmark --model {model['name']} --backend {'cuda' if 'NVIDIA' in hardware['chip_model'] else 'ascend'} --precision {precision}",
-            "git_commit": f"{'abcdef'[random.randint(0, 5)]}{random.randint(1, 9)}{'xyz'[random.randint(0, 2)]}{random.randint(0, 9)}abcd1234",
-            "release_date": f"2026-01-{random.randint(15, 28):02d}",
-            "changelog_url": f"https://github.com/intellistream/sagellm/blob/main/CHANGELOG.md#v{version}",
-            "notes": f"Version {version} {'优化' if not is_regression else '修复问题，性能略有下降'}",
+            "data_source": "synthetic-benchmark",
+            "engine": engine,
+            "engine_version": engine_version,
+            "reproducible_cmd": f"sage-llm benchmark --engine {engine} --model {model['name']} --backend {backend} --precision {precision}",
+            "git_commit": f"{rng.getrandbits(32):08x}",
+            "release_date": release.strftime("%Y-%m-%d"),
+            "changelog_url": f"https://github.com/intellistream/sagellm/blob/main/CHANGELOG.md#v{sagellm_version}",
+            "notes": f"Version {engine_version} {'优化' if not is_regression else '修复问题，性能略有下降'}",
             "verified": True,
+            "idempotency_key": key,
         },
+        "canonical_path": f"canonical/{key.replace('|', '__')}.json",
     }
 
     # 填充硬件信息
     if category == "multi_node":
         entry["hardware"] = {
-            "vendor": "NVIDIA"
-            if "NVIDIA" in hardware["chip_model"]
-            else ("Huawei" if "Ascend" in hardware["chip_model"] else "Kunlun"),
-            "chip_model": hardware["chip_model"],
+            "vendor": _vendor(chip_model),
+            "chip_model": chip_model,
             "chip_count": hardware["chip_count"],
-            "chips_per_node": hardware["chip_count"] // hardware["node_count"],
-            "intra_node_interconnect": "NVLink"
-            if "NVIDIA" in hardware["chip_model"]
-            else "HCCL",
+            "chips_per_node": hardware["chip_count"] // node_count,
+            "intra_node_interconnect": "NVLink" if "NVIDIA" in chip_model else "HCCL",
             "memory_per_chip_gb": hardware["memory"] / hardware["chip_count"],
             "total_memory_gb": hardware["memory"],
         }
         entry["cluster"] = {
-            "node_count": hardware["node_count"],
-            "chip_per_node": hardware["chip_count"] // hardware["node_count"],
+            "node_count": node_count,
+            "comm_backend": hardware["interconnect"],
+            "topology_type": "ring",
+            "chip_per_node": hardware["chip_count"] // node_count,
             "interconnect": hardware["interconnect"],
             "topology": "ring",
             "network_bandwidth_gbps": 400,
         }
     else:
         entry["hardware"] = {
-            "vendor": "NVIDIA"
-            if "NVIDIA" in hardware["chip_model"]
-            else ("Huawei" if "Ascend" in hardware["chip_model"] else "Kunlun"),
-            "chip_model": hardware["chip_model"],
+            "vendor": _vendor(chip_model),
+            "chip_model": chip_model,
             "chip_count": hardware["chip_count"],
             "chips_per_node": hardware["chip_count"],
             "intra_node_interconnect": "NVLink"
-            if hardware["chip_count"] > 1 and "NVIDIA" in hardware["chip_model"]
+            if hardware["chip_count"] > 1 and "NVIDIA" in chip_model
             else "None",
             "memory_per_chip_gb": hardware["memory"] / hardware["chip_count"],
             "total_memory_gb": hardware["memory"],
         }
 
     # 添加驱动版本到 environment
-    if "NVIDIA" in hardware["chip_model"]:
+    if "NVIDIA" in chip_model:
         entry["environment"]["cuda_version"] = hardware.get("cuda_version", "12.1")
         entry["environment"]["driver_version"] = "535.104.05"
-    elif "Ascend" in hardware["chip_model"]:
+    elif "Ascend" in chip_model:
         entry["environment"]["cann_version"] = hardware.get("cann_version", "8.0.RC3")
         entry["environment"]["driver_version"] = "24.1.rc3"
-    elif "Kunlun" in hardware["chip_model"]:
+    elif "Kunlun" in chip_model:
         entry["environment"]["driver_version"] = "3.2.1"
 
     return entry
 
 
-def main():
-    single_data = []
-    multi_data = []
-
-    # 生成单机单卡数据 (丰富配置)
-    configs = [
-        # NVIDIA A100 + Qwen2-7B (多种工作负载和精度)
-        ("NVIDIA A100-80GB", "Qwen2-7B", "short_input", "FP16"),
-        ("NVIDIA A100-80GB", "Qwen2-7B", "long_input", "FP16"),
-        ("NVIDIA A100-80GB", "Qwen2-7B", "short_input", "INT8"),
-        ("NVIDIA A100-80GB", "Qwen2-7B", "pressure_test", "FP16"),
-        # Ascend + Qwen2-7B
-        ("Huawei Ascend 910B", "Qwen2-7B", "short_input", "FP16"),
-        ("Huawei Ascend 910B", "Qwen2-7B", "long_input", "BF16"),
-        # 昆仑芯 + Qwen2-7B
-        ("Kunlun XPU R200", "Qwen2-7B", "short_input", "FP16"),
-        # NVIDIA A100 + Llama-3-8B
-        ("NVIDIA A100-80GB", "Llama-3-8B", "short_input", "FP16"),
-        ("NVIDIA A100-80GB", "Llama-3-8B", "long_input", "INT8"),
-        # Ascend + Llama-3-8B
-        ("Huawei Ascend 910B", "Llama-3-8B", "short_input", "BF16"),
-        # NVIDIA A100 + Qwen2-14B
-        ("NVIDIA A100-80GB", "Qwen2-14B", "short_input", "FP16"),
-        ("NVIDIA A100-80GB", "Qwen2-14B", "short_input", "INT8"),
+def iter_sweep(
+    categories: list[str], engines: list[str], concurrency: list[int] | None = None
+) -> Iterator[tuple[str, dict[str, Any], dict, dict, str, str, int, int]]:
+    """一轮完整组合扫描：(category, hardware, model, workload, precision, engine, rank,
+    并发度)。"""
+    hardware_configs = [
+        (category, hardware)
+        for category in categories
+        for hardware in HARDWARE_CONFIGS[category]
     ]
-
-    for chip_model, model_name, workload_type, precision in configs:
-        hardware = next(
-            h for h in HARDWARE_CONFIGS["single_chip"] if h["chip_model"] == chip_model
+    for (category, hardware), model, workload, precision, engine in itertools.product(
+        hardware_configs, MODELS, WORKLOADS, PRECISIONS, engines
+    ):
+        for version_rank in range(len(ENGINES[engine])):
+            for level in concurrency or (1,):
+                yield (
+                    category,
+                    hardware,
+                    model,
+                    workload,
+                    precision,
+                    engine,
+                    version_rank,
+                    level,
+                )
+
+
+def iter_entries(
+    count: int,
+    *,
+    seed: int,
+    categories: list[str] | None = None,
+    engines: list[str] | None = None,
+    concurrency: list[int] | None = None,
+    repeat_runs: int = 1,
+    latency_histograms: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """按组合扫描顺序惰性生成 ``count`` 条 entry；扫描用尽后进入下一轮 run。
+
+    每个组合连续生成 ``repeat_runs`` 条共享 idempotency key 的 entry。
+    """
+    rng = random.Random(seed)
+    categories = categories or list(HARDWARE_CONFIGS)
+    engines = engines or list(ENGINES)
+    produced = 0
+    for run_index in itertools.count():
+        for combo in iter_sweep(categories, engines, concurrency):
+            for repeat in range(repeat_runs):
+                if produced >= count:
+                    return
+                yield generate_entry(
+                    rng,
+                    *combo,
+                    run_index=run_index,
+                    repeat=repeat,
+                    latency_histograms=latency_histograms,
+                )
+                produced += 1
+
+
+def write_export_tree(
+    entries: Iterator[dict[str, Any]],
+    output_dir: Path,
+    *,
+    entries_per_manifest: int,
+) -> dict[str, int]:
+    """把 entry 流式写成 ``batch_NNNNNN/leaderboard_manifest.json`` + artifact 目录树。
+
+    内存中只保留当前 batch 的 manifest 记录。
+    """
+    batches = 0
+    written = 0
+    records: list[dict[str, Any]] = []
+    batch_dir = output_dir
+
+    def flush() -> None:
+        manifest = {
+            "schema_version": MANIFEST_SCHEMA_VERSION,
+            "generated_at": "2026-01-28T10:30:00Z",
+            "entries": records,
+        }
+        (batch_dir / "leaderboard_manifest.json").write_text(
+            json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
+            encoding="utf-8",
         )
-        model = next(m for m in MODELS if m["name"] == model_name)
-        workload = next(w for w in WORKLOADS if w["type"] == workload_type)
-
-        for version in VERSIONS:
-            # v0.3.1 有 20% 概率性能回退
-            is_regression = version == "0.3.1" and random.random() < 0.2
-
-            entry_id = f"single_{version.replace('.', '_')}_{chip_model.split()[0].lower()}_{model_name.replace('-', '').lower()}_{workload_type}_{precision.lower()}"
-            entry = generate_entry(
-                entry_id,
-                "single_chip",
-                hardware,
-                model,
-                workload,
-                precision,
-                version,
-                is_regression,
-            )
-            single_data.append(entry)
-
-    # 生成单机多卡数据
-    multi_chip_configs = [
-        # NVIDIA A100 4卡
-        ("NVIDIA A100-80GB", 4, "Qwen2-7B", "short_input", "FP16"),
-        ("NVIDIA A100-80GB", 4, "Qwen2-7B", "long_input", "FP16"),
-        ("NVIDIA A100-80GB", 4, "Qwen2-14B", "short_input", "FP16"),
-        ("NVIDIA A100-80GB", 4, "Llama-3-8B", "short_input", "INT8"),
-        # Ascend 8卡
-        ("Huawei Ascend 910B", 8, "Qwen2-14B", "short_input", "BF16"),
-        ("Huawei Ascend 910B", 8, "Llama-3-8B", "long_input", "BF16"),
-        # H100 4卡
-        ("NVIDIA H100-80GB", 4, "Qwen2-7B", "short_input", "FP16"),
-        ("NVIDIA H100-80GB", 4, "Qwen2-14B", "pressure_test", "INT8"),
-    ]
 
-    for (
-        chip_model,
-        chip_count,
-        model_name,
-        workload_type,
-        precision,
-    ) in multi_chip_configs:
-        hardware = next(
-            h
-            for h in HARDWARE_CONFIGS["multi_chip"]
-            if h["chip_model"] == chip_model and h["chip_count"] == chip_count
+    for entry in entries:
+        if written % entries_per_manifest == 0:
+            if records:
+                flush()
+            batch_dir = output_dir / f"batch_{batches:06d}"
+            batch_dir.mkdir(parents=True, exist_ok=True)
+            records = []
+            batches += 1
+
+        artifact_name = f"{written:09d}_leaderboard.json"
+        (batch_dir / artifact_name).write_text(
+            json.dumps(entry, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
         )
-        model = next(m for m in MODELS if m["name"] == model_name)
-        workload = next(w for w in WORKLOADS if w["type"] == workload_type)
-
-        for version in VERSIONS:
-            is_regression = version == "0.3.1" and random.random() < 0.15
-
-            entry_id = f"multichip_{version.replace('.', '_')}_{chip_model.split()[0].lower()}_{chip_count}x_{model_name.replace('-', '').lower()}_{workload_type}_{precision.lower()}"
-            entry = generate_entry(
-                entry_id,
-                "multi_chip",
-                hardware,
-                model,
-                workload,
-                precision,
-                version,
-                is_regression,
-            )
-            single_data.append(entry)
-
-    # 生成多机多卡数据
-    cluster_configs = [
-        # Ascend 2节点
-        ("Huawei Ascend 910B", 8, 2, "Llama-3-70B", "long_input", "BF16"),
-        ("Huawei Ascend 910B", 8, 2, "Qwen2-14B", "short_input", "BF16"),
-        ("Huawei Ascend 910B", 8, 2, "Llama-3-70B", "pressure_test", "BF16"),
-        # NVIDIA A100 4节点
-        ("NVIDIA A100-80GB", 8, 4, "Llama-3-70B", "long_input", "FP16"),
-        ("NVIDIA A100-80GB", 8, 4, "Llama-3-70B", "short_input", "INT8"),
-        # 昆仑芯 2节点
-        ("Kunlun XPU R300", 8, 2, "Qwen2-14B", "long_input", "FP16"),
-        ("Kunlun XPU R300", 8, 2, "Llama-3-8B", "pressure_test", "FP16"),
-    ]
-
-    for (
-        chip_model,
-        chip_count,
-        node_count,
-        model_name,
-        workload_type,
-        precision,
-    ) in cluster_configs:
-        hardware_base = next(
-            h
-            for h in HARDWARE_CONFIGS["multi_node"]
-            if h["chip_model"] == chip_model and h["node_count"] == node_count
+        records.append(
+            {
+                "entry_id": entry["entry_id"],
+                "idempotency_key": entry["metadata"]["idempotency_key"],
+                "canonical_path": entry["canonical_path"],
+                "leaderboard_artifact": artifact_name,
+                "canonical_artifact": f"{written:09d}.canonical.json",
+                "engine": entry["engine"],
+                "workload": entry["workload"]["name"],
+                "config_type": entry["config_type"],
+                "category": "multi" if entry["cluster"] else "single",
+            }
         )
-        hardware = hardware_base.copy()
-        hardware["chip_count"] = chip_count
-
-        model = next(m for m in MODELS if m["name"] == model_name)
-        workload = next(w for w in WORKLOADS if w["type"] == workload_type)
-
-        for version in VERSIONS:
-            is_regression = (
-                version == "0.3.0" and random.random() < 0.25
-            )  # v0.3.0 分布式有更多问题
-
-            entry_id = f"multinode_{version.replace('.', '_')}_{chip_model.split()[0].lower()}_{node_count}n{chip_count}c_{model_name.replace('-', '').lower()}_{workload_type}_{precision.lower()}"
-            entry = generate_entry(
-                entry_id,
-                "multi_node",
-                hardware,
-                model,
-                workload,
-                precision,
-                version,
-                is_regression,
-            )
-            multi_data.append(entry)
+        written += 1
 
-    # 保存数据
-    output_dir = Path(__file__).parent.parent / "data"
-    output_dir.mkdir(exist_ok=True)
+    if records:
+        flush()
+    return {"entries": written, "manifests": batches}
 
-    with open(output_dir / "leaderboard_single.json", "w", encoding="utf-8") as f:
-        json.dump(single_data, f, indent=4, ensure_ascii=False)
 
-    with open(output_dir / "leaderboard_multi.json", "w", encoding="utf-8") as f:
-        json.dump(multi_data, f, indent=4, ensure_ascii=False)
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Generate a reproducible synthetic leaderboard export tree for load testing."
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        required=True,
+        help="Directory receiving batch_*/leaderboard_manifest.json + artifacts.",
+    )
+    parser.add_argument(
+        "--entries", type=int, default=1000, help="Entries to generate."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument(
+        "--entries-per-manifest",
+        type=int,
+        default=10000,
+        help="Artifacts per batch directory / manifest.",
+    )
+    parser.add_argument(
+        "--categories",
+        default=",".join(HARDWARE_CONFIGS),
+        help="Comma-separated subset of: " + ", ".join(HARDWARE_CONFIGS),
+    )
+    parser.add_argument(
+        "--engines",
+        default=",".join(ENGINES),
+        help="Comma-separated subset of: " + ", ".join(ENGINES),
+    )
+    parser.add_argument(
+        "--concurrency",
+        default="1",
+        help="Comma-separated concurrent_requests levels per combination (e.g. 1,4,16).",
+    )
+    parser.add_argument(
+        "--repeat-runs",
+        type=int,
+        default=1,
+        help="Entries per combination sharing one idempotency key.",
+    )
+    parser.add_argument(
+        "--latency-histograms",
+        action="store_true",
+        help="Add ttft / tbt latency histograms and p50/p90/p99 to every entry.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Remove batch_* directories left in --output-dir by a previous run.",
+    )
+    args = parser.parse_args()
+
+    args.categories = [item for item in args.categories.split(",") if item]
+    args.engines = [item for item in args.engines.split(",") if item]
+    for name, chosen, known in (
+        ("--categories", args.categories, HARDWARE_CONFIGS),
+        ("--engines", args.engines, ENGINES),
+    ):
+        unknown = sorted(set(chosen) - set(known))
+        if unknown or not chosen:
+            parser.error(f"{name}: unknown or empty selection {unknown}")
+    if args.entries < 0 or args.entries_per_manifest < 1:
+        parser.error("--entries must be >= 0 and --entries-per-manifest >= 1")
+    try:
+        args.concurrency = [int(item) for item in args.concurrency.split(",") if item]
+    except ValueError:
+        parser.error("--concurrency must be comma-separated integers")
+    if not args.concurrency or min(args.concurrency) < 1:
+        parser.error("--concurrency levels must be >= 1")
+    if len(set(args.concurrency)) != len(args.concurrency):
+        parser.error("--concurrency levels must be distinct")
+    if args.repeat_runs < 1:
+        parser.error("--repeat-runs must be >= 1")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    stale = sorted(args.output_dir.glob("batch_*"))
+    if stale:
+        if not args.force:
+            raise SystemExit(
+                f"{args.output_dir} already contains {len(stale)} batch directories; "
+                "use --force to replace them"
+            )
+        for path in stale:
+            shutil.rmtree(path)
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    stats = write_export_tree(
+        iter_entries(
+            args.entries,
+            seed=args.seed,
+            categories=args.categories,
+            engines=args.engines,
+            concurrency=args.concurrency,
+            repeat_runs=args.repeat_runs,
+            latency_histograms=args.latency_histograms,
+        ),
+        args.output_dir,
+        entries_per_manifest=args.entries_per_manifest,
+    )
+    elapsed = time.perf_counter() - started
 
+    sweep = args.repeat_runs * sum(
+        1 for _ in iter_sweep(args.categories, args.engines, args.concurrency)
+    )
     print("✅ 生成完成！")
-    print(f"  单机数据：{len(single_data)} 条")
-    print(f"  多机数据：{len(multi_data)} 条")
-    print("  包含性能回退样本（绿色箭头）")
+    print(f"  entries: {stats['entries']}（每轮组合扫描 {sweep} 条）")
+    print(f"  manifests: {stats['manifests']}")
+    print(f"  seed: {args.seed}")
+    print(
+        f"  耗时: {elapsed:.2f}s ({stats['entries'] / max(elapsed, 1e-9):,.0f} entries/s)"
+    )
+    print(f"  输出目录: {args.output_dir}")
+    print(
+        f"  下一步: python scripts/aggregate_results.py --source-dir {args.output_dir}"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,171 @@
+"""HDR-style latency histograms for leaderboard entries.
+
+Values are recorded in integer microseconds into log-linear buckets: every
+power-of-two range is split into ``2 ** sub_bucket_bits`` equal sub-buckets,
+so a bucket's width is at most ``2 ** -sub_bucket_bits`` of its value (about
+3 % at the default 5 bits) and values below ``2 ** sub_bucket_bits`` us are
+exact. A histogram is stored as a sparse ``{lower bound: count}`` map::
+
+    {"unit": "us", "sub_bucket_bits": 5, "count": 3, "min_us": 980,
+     "max_us": 1510, "sum_us": 3610, "buckets": {"976": 1, "1120": 1, "1504": 1}}
+
+Bucket grids of different precision nest, so ``merge_histograms`` re-buckets
+the finer ones into the coarsest grid without loss and then adds counts.
+Percentiles are nearest-rank and report the bucket's upper bound (clipped to
+``max_us``), like HdrHistogram's "highest equivalent value".
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+DEFAULT_SUB_BUCKET_BITS = 5
+HISTOGRAM_METRICS = ("ttft_ms", "tbt_ms", "tpot_ms")
+PERCENTILES = (50, 90, 99)
+
+
+def bucket_lower(value_us: int, sub_bucket_bits: int) -> int:
+    """Lower bound of the bucket holding ``value_us``."""
+    shift = value_us.bit_length() - 1 - sub_bucket_bits
+    if shift <= 0:
+        return value_us
+    return (value_us >> shift) << shift
+
+
+def bucket_upper(lower_us: int, sub_bucket_bits: int) -> int:
+    """Largest value (inclusive) in the bucket starting at ``lower_us``."""
+    shift = lower_us.bit_length() - 1 - sub_bucket_bits
+    return lower_us + (1 << shift) - 1 if shift > 0 else lower_us
+
+
+def build_histogram(
+    values_ms: Iterable[float], sub_bucket_bits: int = DEFAULT_SUB_BUCKET_BITS
+) -> dict[str, Any]:
+    """Histogram of millisecond values (negative values are clamped to 0)."""
+    buckets: dict[int, int] = {}
+    count = total = 0
+    low = high = None
+    for value in values_ms:
+        value_us = max(int(round(value * 1000)), 0)
+        lower = bucket_lower(value_us, sub_bucket_bits)
+        buckets[lower] = buckets.get(lower, 0) + 1
+        count += 1
+        total += value_us
+        low = value_us if low is None else min(low, value_us)
+        high = value_us if high is None else max(high, value_us)
+    return _payload(sub_bucket_bits, buckets, count, low, high, total)
+
+
+def _payload(
+    sub_bucket_bits: int,
+    buckets: dict[int, int],
+    count: int,
+    low: int | None,
+    high: int | None,
+    total: int,
+) -> dict[str, Any]:
+    histogram: dict[str, Any] = {
+        "unit": "us",
+        "sub_bucket_bits": sub_bucket_bits,
+        "count": count,
+    }
+    if count:
+        histogram.update(min_us=low, max_us=high, sum_us=total)
+    histogram["buckets"] = {str(lower): buckets[lower] for lower in sorted(buckets)}
+    return histogram
+
+
+def merge_histograms(histograms: Iterable[dict[str, Any]]) -> dict[str, Any] | None:
+    """Sum histograms on the coarsest ``sub_bucket_bits`` among them."""
+    histograms = [item for item in histograms if item and item.get("unit") == "us"]
+    if not histograms:
+        return None
+    bits = min(int(item["sub_bucket_bits"]) for item in histograms)
+    buckets: dict[int, int] = {}
+    count = total = 0
+    lows: list[int] = []
+    highs: list[int] = []
+    for item in histograms:
+        for lower, hits in item.get("buckets", {}).items():
+            merged = bucket_lower(int(lower), bits)
+            buckets[merged] = buckets.get(merged, 0) + int(hits)
+        count += int(item.get("count", 0))
+        total += int(item.get("sum_us", 0))
+        if "min_us" in item:
+            lows.append(int(item["min_us"]))
+            highs.append(int(item["max_us"]))
+    return _payload(
+        bits, buckets, count, min(lows, default=None), max(highs, default=None), total
+    )
+
+
+def histogram_percentile(histogram: dict[str, Any], q: float) -> float | None:
+    """Nearest-rank ``q``-th percentile in milliseconds, ``None`` when empty."""
+    buckets = sorted(
+        (int(lower), int(hits)) for lower, hits in histogram["buckets"].items()
+    )
+    count = sum(hits for _, hits in buckets)
+    if not count:
+        return None
+    rank = max(math.ceil(q / 100 * count), 1)
+    bits = int(histogram["sub_bucket_bits"])
+    seen = 0
+    for lower, hits in buckets:
+        seen += hits
+        if seen >= rank:
+            upper = bucket_upper(lower, bits)
+            if "max_us" in histogram:
+                upper = min(upper, int(histogram["max_us"]))
+            return round(upper / 1000, 3)
+    return None  # pragma: no cover - rank never exceeds count
+
+
+def percentile_fields(histograms: dict[str, Any]) -> dict[str, float]:
+    """``{"ttft_p99_ms": ...}``-style metric fields for every histogram."""
+    fields: dict[str, float] = {}
+    for metric in HISTOGRAM_METRICS:
+        histogram = histograms.get(metric)
+        if not histogram:
+            continue
+        stem = metric.removesuffix("_ms")
+        for q in PERCENTILES:
+            value = histogram_percentile(histogram, q)
+            if value is not None:
+                fields[f"{stem}_p{q}_ms"] = value
+    return fields
+
+
+def fold_run_histograms(
+    merged: dict[str, Any] | None, run: dict[str, Any]
+) -> dict[str, Any]:
+    """Add one run's ``latency_histograms`` to a running per-metric merge.
+
+    ``merge_histograms`` is associative, so folding runs in one at a time
+    gives the same result as merging them all at once.
+    """
+    merged = merged or {}
+    folded: dict[str, Any] = {}
+    for metric in HISTOGRAM_METRICS:
+        histogram = merge_histograms([merged.get(metric), run.get(metric)])
+        if histogram is not None:
+            folded[metric] = histogram
+    return folded
+
+
+def with_run_histograms(
+    entry: dict[str, Any], histograms: dict[str, Any], runs: int
+) -> dict[str, Any]:
+    """Copy of ``entry`` carrying histograms merged over ``runs`` repeat runs.
+
+    Percentiles are recomputed from ``histograms``. ``entry`` itself is left
+    untouched because the incremental state may still hold it.
+    """
+    metrics = {
+        **(entry.get("metrics") or {}),
+        **percentile_fields(histograms),
+        "latency_histograms": histograms,
+        "latency_histogram_runs": runs,
+    }
+    return {**entry, "metrics": metrics}
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""SQLite index of leaderboard entries for ad-hoc queries.
+
+``aggregate_results.py --sqlite-out`` upserts every deduplicated entry into an
+``entries`` table keyed by ``idempotency_key``. Scope fields, engine, version,
+submission time and headline metrics are columns (indexed where queries filter
+on them); the full entry is kept as JSON. Rows are history: an artifact that
+disappears from the export keeps its row.
+
+With ``--incremental`` only artifacts re-parsed in that run are upserted, so
+the cost follows new data. The database remembers the incremental run it last
+synced with (``meta.state_run_id``); when that does not match the state file,
+every entry is upserted again.
+
+Run this file to query the database, e.g.
+``python scripts/leaderboard_db.py --db leaderboard.sqlite --model Qwen2-7B
+--precision INT8 --hardware "Ascend 910B" --best throughput_tps``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from detect_regressions import version_key
+from entry_view import EntryView, build_idempotency_key
+from leaderboard_display import get_engine, get_engine_version
+
+DB_SCHEMA_VERSION = 1
+METRIC_COLUMNS = (
+    "throughput_tps",
+    "ttft_ms",
+    "tbt_ms",
+    "error_rate",
+    "peak_mem_mb",
+)
+LOWER_IS_BETTER = {"ttft_ms", "tbt_ms", "error_rate", "peak_mem_mb"}
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS entries (
+    idempotency_key TEXT PRIMARY KEY,
+    entry_id TEXT,
+    scope_key TEXT NOT NULL,
+    category TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    version_sort TEXT NOT NULL,
+    model TEXT NOT NULL,
+    hardware TEXT NOT NULL,
+    precision TEXT NOT NULL,
+    workload TEXT NOT NULL,
+    config_type TEXT NOT NULL,
+    chip_count INTEGER NOT NULL,
+    node_count INTEGER NOT NULL,
+    submitted_at TEXT,
+    sort_ts INTEGER NOT NULL,
+    sort_tps REAL NOT NULL,
+    {", ".join(f"{name} REAL" for name in METRIC_COLUMNS)},
+    entry_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_scope_key ON entries (scope_key);
+CREATE INDEX IF NOT EXISTS entries_engine ON entries (engine, version_sort);
+CREATE INDEX IF NOT EXISTS entries_engine_version ON entries (engine_version);
+CREATE INDEX IF NOT EXISTS entries_submitted_at ON entries (submitted_at);
+CREATE INDEX IF NOT EXISTS entries_model_hardware
+    ON entries (model, hardware, precision);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+ROW_COLUMNS = (
+    "idempotency_key",
+    "entry_id",
+    "scope_key",
+    "category",
+    "engine",
+    "engine_version",
+    "version_sort",
+    "model",
+    "hardware",
+    "precision",
+    "workload",
+    "config_type",
+    "chip_count",
+    "node_count",
+    "submitted_at",
+    "sort_ts",
+    "sort_tps",
+    *METRIC_COLUMNS,
+    "entry_json",
+)
+# Same rule as dedup: an entry with a smaller ``entry_sort_key`` never
+# replaces a row. An equal key does, so an artifact corrected in place (same
+# submitted_at and throughput) refreshes its row.
+UPSERT_SQL = (
+    f"INSERT INTO entries ({', '.join(ROW_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in ROW_COLUMNS)}) "
+    "ON CONFLICT (idempotency_key) DO UPDATE SET "
+    + ", ".join(
+        f"{column} = excluded.{column}"
+        for column in ROW_COLUMNS
+        if column != "idempotency_key"
+    )
+    + " WHERE (excluded.sort_ts, excluded.sort_tps)"
+    " >= (entries.sort_ts, entries.sort_tps)"
+)
+
+
+def open_db(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version not in (0, DB_SCHEMA_VERSION):
+        conn.close()
+        raise ValueError(
+            f"{path}: unsupported leaderboard db schema version {version}; "
+            "delete it to rebuild"
+        )
+    conn.executescript(SCHEMA_SQL)
+    conn.execute(f"PRAGMA user_version = {DB_SCHEMA_VERSION}")
+    return conn
+
+
+def entry_row(entry: dict[str, Any]) -> tuple[Any, ...]:
+    view = EntryView(entry)
+    model, hardware, precision, workload, config_type, chips, nodes = view.scope_values
+    engine_version = get_engine_version(entry) or "unknown"
+    metrics = entry.get("metrics") or {}
+    return (
+        build_idempotency_key(entry),
+        entry.get("entry_id"),
+        view.scope_key,
+        view.category,
+        get_engine(entry),
+        engine_version,
+        ".".join(f"{part:06d}" for part in version_key(engine_version)),
+        model,
+        hardware,
+        precision,
+        workload,
+        config_type,
+        chips,
+        nodes,
+        (entry.get("metadata") or {}).get("submitted_at"),
+        *view.sort_key,
+        *(
+            float(value) if isinstance(value, (int, float)) else None
+            for value in (metrics.get(name) for name in METRIC_COLUMNS)
+        ),
+        json.dumps(entry, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def upsert_entries(conn: sqlite3.Connection, entries: Iterable[dict[str, Any]]) -> int:
+    """Upsert ``entries`` in one transaction; returns the number of entries given."""
+    count = 0
+
+    def rows() -> Iterable[tuple[Any, ...]]:
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry_row(entry)
+
+    with conn:
+        conn.executemany(UPSERT_SQL, rows())
+    return count
+
+
+def get_meta(conn: sqlite3.Connection, key: str) -> str | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row is not None else None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+    with conn:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+
+def synced_run_id(path: Path) -> str | None:
+    """The incremental run the database at ``path`` was last synced with."""
+    if not path.is_file():
+        return None
+    conn = open_db(path)
+    try:
+        return get_meta(conn, "state_run_id")
+    finally:
+        conn.close()
+
+
+def sync_db(
+    path: Path,
+    entries: list[dict[str, Any]],
+    *,
+    changed: list[dict[str, Any]] | None = None,
+    previous_run_id: str | None = None,
+    run_id: str | None = None,
+) -> dict[str, Any]:
+    """Bring the database at ``path`` up to date with this aggregation.
+
+    ``changed`` (entries re-parsed by an incremental run) is enough when the
+    database was last synced with the incremental run ``previous_run_id``;
+    otherwise all ``entries`` are upserted. ``run_id`` is recorded for the next
+    run.
+    """
+    conn = open_db(path)
+    try:
+        incremental = (
+            changed is not None
+            and previous_run_id is not None
+            and get_meta(conn, "state_run_id") == previous_run_id
+        )
+        upserted = upsert_entries(conn, changed if incremental else entries)
+        if run_id is not None:
+            set_meta(conn, "state_run_id", run_id)
+        else:
+            with conn:
+                conn.execute("DELETE FROM meta WHERE key = 'state_run_id'")
+        total = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    finally:
+        conn.close()
+    return {"incremental": incremental, "upserted": upserted, "rows": total}
+
+
+def query_entries(
+    conn: sqlite3.Connection,
+    *,
+    model: str | None = None,
+    hardware: str | None = None,
+    precision: str | None = None,
+    workload: str | None = None,
+    engine: str | None = None,
+    version: str | None = None,
+    scope_key: str | None = None,
+    since: str | None = None,
+    best: str | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """Matching rows, newest version first.
+
+    ``model`` / ``hardware`` / ``precision`` / ``workload`` match substrings
+    (case-insensitive); the other filters are exact. With ``best`` only the
+    best row for that metric per engine version is returned.
+    """
+    clauses: list[str] = []
+    params: list[Any] = []
+    for column, value in (
+        ("model", model),
+        ("hardware", hardware),
+        ("precision", precision),
+        ("workload", workload),
+    ):
+        if value:
+            clauses.append(f"{column} LIKE ?")
+            params.append(f"%{value}%")
+    for column, value in (
+        ("engine", engine),
+        ("engine_version", version),
+        ("scope_key", scope_key),
+    ):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since:
+        clauses.append("submitted_at >= ?")
+        params.append(since)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    columns = ", ".join(column for column in ROW_COLUMNS if column != "entry_json")
+
+    if best is None:
+        sql = (
+            f"SELECT {columns} FROM entries {where} "
+            "ORDER BY engine, version_sort DESC, sort_ts DESC"
+        )
+    else:
+        if best not in METRIC_COLUMNS:
+            raise ValueError(f"--best must be one of {', '.join(METRIC_COLUMNS)}")
+        direction = "ASC" if best in LOWER_IS_BETTER else "DESC"
+        sql = (
+            f"SELECT {columns} FROM ("
+            f"SELECT *, ROW_NUMBER() OVER (PARTITION BY engine, engine_version "
+            f"ORDER BY {best} IS NULL, {best} {direction}) AS position "
+            f"FROM entries {where}) WHERE position = 1 "
+            f"ORDER BY {best} IS NULL, {best} {direction}"
+        )
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Query the SQLite index written by aggregate_results.py --sqlite-out."
+    )
+    parser.add_argument("--db", type=Path, required=True, help="SQLite database.")
+    parser.add_argument("--model", help="Model name substring.")
+    parser.add_argument("--hardware", help="Chip model substring.")
+    parser.add_argument("--precision", help="Precision substring.")
+    parser.add_argument("--workload", help="Workload substring (e.g. Q1).")
+    parser.add_argument("--engine", help="Exact engine name.")
+    parser.add_argument("--version", help="Exact engine version.")
+    parser.add_argument("--scope-key", help="Exact compare scope key.")
+    parser.add_argument("--since", help="Only entries submitted at or after this time.")
+    parser.add_argument(
+        "--best",
+        choices=METRIC_COLUMNS,
+        help="Best entry per engine version for this metric.",
+    )
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.db.is_file():
+        raise SystemExit(f"❌ {args.db} does not exist")
+    conn = open_db(args.db)
+    try:
+        rows = query_entries(
+            conn,
+            model=args.model,
+            hardware=args.hardware,
+            precision=args.precision,
+            workload=args.workload,
+            engine=args.engine,
+            version=args.version,
+            scope_key=args.scope_key,
+            since=args.since,
+            best=args.best,
+            limit=args.limit,
+        )
+    except ValueError as exc:
+        raise SystemExit(f"❌ {exc}") from exc
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    for row in rows:
+        print(
+            f"{row['engine']:<10} {row['engine_version']:<12} "
+            f"{row['throughput_tps'] or 0:>10.1f} tps  "
+            f"ttft {row['ttft_ms'] or 0:>8.1f} ms  {row['scope_key']}"
+        )
+    print(f"{len(rows)} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+"""Precompute the homepage leaderboard display rows.
+
+This is a Python port of the version-build merge in ``assets/leaderboard.js``
+(``createAggregationKey``, ``compareEntryQuality``, ``aggregateVersionBuilds``,
+``sortForDisplay`` and ``buildTrendRows``). The helpers deliberately keep the
+JavaScript semantics, including its ``|| fallback`` coercions, so the page can
+render ``leaderboard_display.json`` instead of regrouping every entry on each
+filter change.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from functools import cmp_to_key
+from typing import Any
+
+DISPLAY_SNAPSHOT_SCHEMA_VERSION = "leaderboard-display/v1"
+DISPLAY_TABS = ("single-chip", "multi-chip", "multi-node")
+TREND_METRICS = ("ttft_ms", "tbt_ms", "throughput_tps", "error_rate")
+
+WORKLOAD_ALIASES = {
+    "short": "Q1",
+    "short_qa": "Q1",
+    "short_input": "Q1",
+    "long": "Q2",
+    "long_summarization": "Q2",
+    "long_input": "Q2",
+    "code": "Q3",
+    "code_generation": "Q3",
+    "multi_turn": "Q4",
+    "multi_turn_reasoning": "Q4",
+    "stress": "Q5",
+    "stress_short": "Q5",
+    "stress_test": "Q5",
+    "stress_long": "Q6",
+    "cot": "Q7",
+    "chain_of_thought": "Q7",
+    "mixed": "Q8",
+    "mixed_batch": "Q8",
+}
+
+Comparator = Callable[[dict[str, Any], dict[str, Any]], float]
+
+
+def classify_display_tab(entry: dict[str, Any]) -> str:
+    """Mirror the single-chip / multi-chip / multi-node split in leaderboard.js."""
+    node_count = int((entry.get("cluster") or {}).get("node_count") or 1)
+    if node_count > 1:
+        return "multi-node"
+    chip_count = int((entry.get("hardware") or {}).get("chip_count") or 0)
+    return "multi-chip" if chip_count > 1 else "single-chip"
+
+
+def _js_string(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return "" if value is None else str(value)
+
+
+def _js_number(value: Any, fallback: float) -> float:
+    """``Number(value) || fallback``."""
+    if value is None or isinstance(value, (dict, list)):
+        return fallback
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return fallback
+    return fallback if number == 0 or math.isnan(number) else number
+
+
+def _cmp(left: Any, right: Any) -> int:
+    return (left > right) - (left < right)
+
+
+def normalize_workload_id(value: Any) -> str | None:
+    raw = str(value or "").strip()
+    if not raw:
+        return None
+    if re.fullmatch(r"Q[1-8]", raw, re.IGNORECASE):
+        return raw.upper()
+    return WORKLOAD_ALIASES.get(re.sub(r"[^a-z0-9]+", "_", raw.lower()))
+
+
+def get_workload_id(entry: dict[str, Any]) -> str:
+    metadata = entry.get("metadata") or {}
+    direct = (
+        (entry.get("workload") or {}).get("name")
+        or entry.get("workload_name")
+        or metadata.get("workload")
+    )
+    normalized = normalize_workload_id(direct)
+    if normalized:
+        return normalized
+
+    notes = str(metadata.get("notes") or "")
+    match = re.search(r"\bQ([1-8])\b", notes, re.IGNORECASE)
+    if match:
+        return f"Q{match.group(1)}"
+    for marker, workload_id in (
+        ("short_input", "Q1"),
+        ("long_input", "Q2"),
+        ("stress_test", "Q5"),
+    ):
+        if marker in notes:
+            return workload_id
+    return "Other"
+
+
+def get_engine(entry: dict[str, Any]) -> str:
+    direct = entry.get("engine") or (entry.get("metadata") or {}).get("engine")
+    if isinstance(direct, str) and direct.strip():
+        return direct.strip().lower()
+    if entry.get("sagellm_version"):
+        return "sagellm"
+    return "unknown"
+
+
+def get_engine_version(entry: dict[str, Any]) -> str:
+    metadata = entry.get("metadata") or {}
+    return _js_string(
+        entry.get("engine_version")
+        or metadata.get("engine_version")
+        or entry.get("sagellm_version")
+        or ""
+    ).strip()
+
+
+def normalize_display_version(version: Any) -> str:
+    text = _js_string(version or "").strip()
+    if re.fullmatch(r"\d+\.\d+\.\d+\.\d+", text):
+        return ".".join(text.split(".")[:3]) + ".x"
+    return text
+
+
+def is_numeric_version(version: Any) -> bool:
+    return (
+        re.fullmatch(r"\d+(\.\d+){1,3}(\.x)?", _js_string(version or "").strip())
+        is not None
+    )
+
+
+def compare_versions(left: str, right: str) -> int:
+    def parts(version: str) -> list[int]:
+        values = []
+        for part in version.split("."):
+            match = re.match(r"\s*[+-]?\d+", part)
+            values.append(int(match.group()) if match else 0)
+        return values
+
+    left_parts, right_parts = parts(left), parts(right)
+    for index in range(max(len(left_parts), len(right_parts))):
+        left_value = left_parts[index] if index < len(left_parts) else 0
+        right_value = right_parts[index] if index < len(right_parts) else 0
+        if left_value != right_value:
+            return left_value - right_value
+    return 0
+
+
+def compare_display_versions(left: Any, right: Any) -> int:
+    if is_numeric_version(left) and is_numeric_version(right):
+        return compare_versions(
+            re.sub(r"\.x$", ".0", _js_string(left or "")),
+            re.sub(r"\.x$", ".0", _js_string(right or "")),
+        )
+    return _cmp(_js_string(left or ""), _js_string(right or ""))
+
+
+def get_display_version(entry: dict[str, Any]) -> str:
+    return entry.get("displayVersion") or normalize_display_version(
+        get_engine_version(entry)
+    )
+
+
+def release_timestamp_ms(entry: dict[str, Any]) -> float:
+    """``Date.parse(metadata.release_date || '') || 0`` for ISO dates."""
+    raw = str((entry.get("metadata") or {}).get("release_date") or "")
+    if not raw:
+        return 0
+    try:
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp() * 1000
+
+
+def compare_by_release_date_desc(left: dict[str, Any], right: dict[str, Any]) -> float:
+    return release_timestamp_ms(right) - release_timestamp_ms(left)
+
+
+def compare_entries_by_version_desc(
+    left: dict[str, Any], right: dict[str, Any]
+) -> float:
+    engine_compare = _cmp(get_engine(left), get_engine(right))
+    if engine_compare:
+        return engine_compare
+    version_compare = compare_display_versions(
+        get_display_version(right), get_display_version(left)
+    )
+    if version_compare:
+        return version_compare
+    return compare_by_release_date_desc(left, right)
+
+
+def _series_parts(entry: dict[str, Any]) -> list[str]:
+    hardware = entry.get("hardware") or {}
+    cluster = entry.get("cluster") or {}
+    model = entry.get("model") or {}
+    return [
+        get_engine(entry),
+        get_workload_id(entry),
+        _js_string(hardware.get("chip_model") or ""),
+        _js_string(hardware.get("chip_count") or 0),
+        _js_string(cluster.get("node_count") or 1),
+        _js_string(cluster.get("interconnect") or "single-node"),
+        _js_string(cluster.get("topology") or ""),
+        _js_string(model.get("name") or ""),
+        _js_string(model.get("precision") or ""),
+    ]
+
+
+def create_aggregation_key(entry: dict[str, Any]) -> str:
+    """``createAggregationKey``: one display row per engine build line."""
+    base_version = normalize_display_version(get_engine_version(entry))
+    return "|".join([*_series_parts(entry), base_version])
+
+
+def create_series_key(entry: dict[str, Any]) -> str:
+    """The aggregation key without the version, i.e. one trend line."""
+    return "|".join(_series_parts(entry))
+
+
+def compare_entry_quality(
+    candidate: dict[str, Any], incumbent: dict[str, Any]
+) -> float:
+    """Positive when ``candidate`` is the better build (``compareEntryQuality``)."""
+    c = candidate.get("metrics") or {}
+    i = incumbent.get("metrics") or {}
+
+    for metric, fallback, higher_is_better in (
+        ("throughput_tps", 0.0, True),
+        ("ttft_ms", math.inf, False),
+        ("error_rate", 0.0, False),
+        ("prefix_hit_rate", 0.0, True),
+        ("peak_mem_mb", math.inf, False),
+    ):
+        c_value = _js_number(c.get(metric), fallback)
+        i_value = _js_number(i.get(metric), fallback)
+        if c_value != i_value:
+            return c_value - i_value if higher_is_better else i_value - c_value
+    return compare_by_release_date_desc(candidate, incumbent)
+
+
+def aggregate_version_builds(
+    entries: Iterable[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Merge 4th-segment builds into one row carrying ``versionVariants``."""
+    groups: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        key = create_aggregation_key(entry)
+        existing = groups.get(key)
+        if existing is None:
+            groups[key] = {"best": entry, "variants": [entry]}
+            continue
+        existing["variants"].append(entry)
+        if compare_entry_quality(entry, existing["best"]) > 0:
+            existing["best"] = entry
+
+    def variant_order(left: dict[str, Any], right: dict[str, Any]) -> float:
+        quality = compare_entry_quality(right, left)
+        if quality:
+            return quality
+        return compare_display_versions(
+            get_engine_version(right), get_engine_version(left)
+        )
+
+    return [
+        {
+            **group["best"],
+            "displayVersion": normalize_display_version(
+                get_engine_version(group["best"])
+            ),
+            "versionVariants": sorted(group["variants"], key=cmp_to_key(variant_order)),
+        }
+        for group in groups.values()
+    ]
+
+
+def _compare_all_workloads(left: dict[str, Any], right: dict[str, Any]) -> float:
+    for result in (
+        _cmp(get_workload_id(left), get_workload_id(right)),
+        _cmp(get_engine(left), get_engine(right)),
+        compare_display_versions(get_display_version(right), get_display_version(left)),
+    ):
+        if result:
+            return result
+    return compare_by_release_date_desc(left, right)
+
+
+def _compare_single_workload(left: dict[str, Any], right: dict[str, Any]) -> float:
+    version_compare = compare_display_versions(
+        get_display_version(right), get_display_version(left)
+    )
+    if version_compare:
+        return version_compare
+    return compare_by_release_date_desc(left, right)
+
+
+def sort_for_display(
+    rows: Iterable[dict[str, Any]], selected_workload: str
+) -> list[dict[str, Any]]:
+    comparator: Comparator = (
+        _compare_all_workloads
+        if selected_workload == "all"
+        else _compare_single_workload
+    )
+    return sorted(rows, key=cmp_to_key(comparator))
+
+
+def calculate_trends(
+    current: dict[str, Any], previous: dict[str, Any]
+) -> dict[str, float]:
+    trends: dict[str, float] = {}
+    current_metrics = current.get("metrics") or {}
+    previous_metrics = previous.get("metrics") or {}
+    for metric in TREND_METRICS:
+        value = current_metrics.get(metric)
+        prior = previous_metrics.get(metric)
+        if value is not None and prior is not None and prior != 0:
+            trends[metric] = ((value - prior) / prior) * 100
+    return trends
+
+
+def build_trend_rows(
+    rows: list[dict[str, Any]], selected_workload: str
+) -> list[dict[str, Any]]:
+    if selected_workload == "all":
+        return [
+            {**row, "trends": {}, "baselineTrends": {}, "isBaseline": False}
+            for row in rows
+        ]
+
+    trend_rows = []
+    for index, row in enumerate(rows):
+        is_baseline = index == len(rows) - 1
+        trend_rows.append(
+            {
+                **row,
+                "trends": {} if is_baseline else calculate_trends(row, rows[index + 1]),
+                "baselineTrends": {}
+                if is_baseline
+                else calculate_trends(row, rows[-1]),
+                "isBaseline": is_baseline,
+            }
+        )
+    return trend_rows
+
+
+def build_display_tab(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Display rows for one tab, in the page's default order.
+
+    Rows reference entries by ``entry_id``. ``rank`` holds the
+    row position for the "all workloads" order and for the single-workload
+    (version) order; a stable sort of any filtered subset by these ranks equals
+    running ``sortForDisplay`` on that subset. Trends are computed per series
+    (engine + scope), newest version first, against the next older version and
+    against the oldest version as baseline.
+    """
+    ordered = sorted(entries, key=cmp_to_key(compare_entries_by_version_desc))
+    merged = aggregate_version_builds(ordered)
+    rank_all = {
+        id(row): index for index, row in enumerate(sort_for_display(merged, "all"))
+    }
+    by_version = sort_for_display(merged, "single")
+    rank_version = {id(row): index for index, row in enumerate(by_version)}
+
+    series: dict[str, list[dict[str, Any]]] = {}
+    for row in by_version:
+        series.setdefault(create_series_key(row), []).append(row)
+    trend_lookup = {
+        id(row): trended
+        for series_rows in series.values()
+        for row, trended in zip(series_rows, build_trend_rows(series_rows, "single"))
+    }
+
+    payload = []
+    for row in sort_for_display(merged, "all"):
+        trended = trend_lookup[id(row)]
+        payload.append(
+            {
+                "key": create_aggregation_key(row),
+                "series": create_series_key(row),
+                "entry_id": row["entry_id"],
+                "display_version": row["displayVersion"],
+                "variants": [item["entry_id"] for item in row["versionVariants"]],
+                "rank": {"all": rank_all[id(row)], "workload": rank_version[id(row)]},
+                "trends": trended["trends"],
+                "baseline_trends": trended["baselineTrends"],
+                "is_baseline": trended["isBaseline"],
+            }
+        )
+    return payload
+
+
+def build_display_snapshot(entries: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    by_tab: dict[str, list[dict[str, Any]]] = {tab: [] for tab in DISPLAY_TABS}
+    for entry in entries:
+        by_tab[classify_display_tab(entry)].append(entry)
+
+    tabs = {tab: build_display_tab(items) for tab, items in by_tab.items() if items}
+    return {
+        "schema_version": DISPLAY_SNAPSHOT_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "row_count": sum(len(rows) for rows in tabs.values()),
+        "tabs": tabs,
+    }
@@ -0,0 +1,556 @@
+#!/usr/bin/env python3
+"""Benchmark an OpenAI-compatible endpoint and export leaderboard artifacts.
+
+For each ``--concurrency`` level, ``--requests`` streaming
+``/v1/chat/completions`` requests run on that many asyncio workers. Timings
+come from the SSE stream:
+
+- ``ttft_ms``: request sent -> first content chunk;
+- ``tbt_ms``: mean gap between consecutive content chunks;
+- ``tpot_ms``: (last chunk - first chunk) / (output tokens - 1), per request;
+- ``throughput_tps``: output tokens of successful requests / wall time;
+- ``error_rate``: failed requests (HTTP error, timeout, empty stream) / total.
+
+TTFT, chunk gaps and TPOT are also recorded as ``latency_histograms`` with
+their ``*_p50_ms`` / ``*_p90_ms`` / ``*_p99_ms`` percentiles.
+
+Output tokens come from the final chunk's ``usage`` when the server sends it
+(``stream_options.include_usage``) and the content chunk count otherwise.
+Each level becomes one ``*_leaderboard.json`` artifact. A level where every
+request failed writes none and makes the script exit non-zero. Artifacts are
+validated against ``leaderboard_v1.schema.json`` and listed in
+``leaderboard_manifest.json`` (export manifest v2) in ``--output-dir``, so
+``aggregate_results.py --source-dir`` ingests them unchanged. Each file is
+written atomically, artifacts before the manifest.
+
+HTTP/1.1 is spoken directly over ``asyncio.open_connection``, one connection
+per request, with chunked and close-delimited bodies, so only the standard
+library is needed. Metrics that a client cannot observe (``peak_mem_mb``, KV
+cache counters) come from flags or stay at zero / null.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import re
+import shlex
+import ssl
+import sys
+import time
+import urllib.parse
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from aggregate_results import load_schema, validate_entry
+from compiled_schema import FastPathValidator
+from latency_histogram import build_histogram, percentile_fields
+from snapshot_writer import write_json_document
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_SCHEMA_PATH = ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json"
+MANIFEST_NAME = "leaderboard_manifest.json"
+MANIFEST_SCHEMA_VERSION = "leaderboard-export-manifest/v2"
+DATA_SOURCE = "local-load-generator"
+VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+(\.\d+)?$")
+
+
+@dataclass
+class RequestResult:
+    ok: bool
+    started: float
+    ended: float
+    chunk_times: list[float] = field(default_factory=list)
+    output_tokens: int = 0
+    error: str | None = None
+
+
+def _key_part(value: Any) -> str:
+    slug = re.sub(r"[^a-z0-9._-]+", "-", str(value).strip().lower()).strip("-")
+    return slug or "unknown"
+
+
+async def _iter_body(
+    reader: asyncio.StreamReader, headers: dict[str, str]
+) -> AsyncIterator[bytes]:
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()).strip():
+                    pass
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    elif "content-length" in headers:
+        remaining = int(headers["content-length"])
+        while remaining > 0:
+            data = await reader.read(min(remaining, 1 << 16))
+            if not data:
+                return
+            remaining -= len(data)
+            yield data
+    else:
+        while data := await reader.read(1 << 16):
+            yield data
+
+
+async def stream_chat(
+    url: str,
+    payload: dict[str, Any],
+    *,
+    api_key: str | None = None,
+    ssl_context: ssl.SSLContext | None = None,
+) -> RequestResult:
+    """Send one streaming chat completion and time its content chunks."""
+    parts = urllib.parse.urlsplit(url)
+    https = parts.scheme == "https"
+    port = parts.port or (443 if https else 80)
+    body = json.dumps(payload).encode("utf-8")
+    head = [
+        f"POST {parts.path or '/'} HTTP/1.1",
+        f"Host: {parts.netloc}",
+        "Content-Type: application/json",
+        "Accept: text/event-stream",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    if api_key:
+        head.append(f"Authorization: Bearer {api_key}")
+
+    started = time.perf_counter()
+    result = RequestResult(ok=False, started=started, ended=started)
+    reader, writer = await asyncio.open_connection(
+        parts.hostname,
+        port,
+        ssl=(ssl_context or ssl.create_default_context()) if https else None,
+    )
+    try:
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = (await reader.readline()).decode("latin-1").split()
+        status = int(status_line[1]) if len(status_line) > 1 else 0
+        headers: dict[str, str] = {}
+        while line := (await reader.readline()).strip():
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if status != 200:
+            text = b"".join([chunk async for chunk in _iter_body(reader, headers)])
+            result.error = f"HTTP {status}: {text[:200].decode('utf-8', 'replace')}"
+            return result
+
+        usage_tokens = None
+        done = False
+        buffer = b""
+        async for data in _iter_body(reader, headers):
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for raw in lines:
+                line = raw.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                event = line[5:].strip()
+                if event == b"[DONE]":
+                    done = True
+                    break
+                try:
+                    chunk = json.loads(event)
+                except ValueError:
+                    continue
+                choices = chunk.get("choices") or [{}]
+                if (choices[0].get("delta") or {}).get("content"):
+                    result.chunk_times.append(time.perf_counter())
+                usage = chunk.get("usage") or {}
+                if isinstance(usage.get("completion_tokens"), int):
+                    usage_tokens = usage["completion_tokens"]
+            if done:
+                break
+    finally:
+        result.ended = time.perf_counter()
+        writer.close()
+
+    result.output_tokens = (
+        usage_tokens if usage_tokens is not None else len(result.chunk_times)
+    )
+    result.ok = bool(result.chunk_times)
+    if not result.ok:
+        result.error = "stream ended without content"
+    return result
+
+
+async def run_level(
+    url: str,
+    *,
+    model: str,
+    prompt: str,
+    output_length: int,
+    concurrency: int,
+    requests: int,
+    timeout: float,
+    api_key: str | None = None,
+) -> tuple[list[RequestResult], float]:
+    """Run ``requests`` streams on ``concurrency`` workers; returns results + wall time."""
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": output_length,
+        "stream": True,
+        "stream_options": {"include_usage": True},
+    }
+    results: list[RequestResult] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(
+                    stream_chat(url, payload, api_key=api_key), timeout
+                )
+            except (
+                OSError,
+                ValueError,
+                asyncio.TimeoutError,
+                asyncio.IncompleteReadError,
+            ) as exc:
+                result = RequestResult(
+                    ok=False,
+                    started=started,
+                    ended=time.perf_counter(),
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+            results.append(result)
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    return results, time.perf_counter() - wall_started
+
+
+def summarize(results: list[RequestResult], wall_s: float) -> dict[str, Any]:
+    """Leaderboard metrics (milliseconds, tokens/s) plus latency histograms."""
+    succeeded = [result for result in results if result.ok]
+    ttfts = sorted((r.chunk_times[0] - r.started) * 1000 for r in succeeded)
+    gaps = sorted(
+        (b - a) * 1000
+        for r in succeeded
+        for a, b in zip(r.chunk_times, r.chunk_times[1:])
+    )
+    tpots = [
+        (r.chunk_times[-1] - r.chunk_times[0]) * 1000 / (r.output_tokens - 1)
+        for r in succeeded
+        if r.output_tokens > 1
+    ]
+    output_tokens = sum(r.output_tokens for r in succeeded)
+    summary: dict[str, Any] = {
+        "requests": len(results),
+        "succeeded": len(succeeded),
+        "output_tokens": output_tokens,
+        "wall_s": round(wall_s, 6),
+        "ttft_ms": round(sum(ttfts) / len(ttfts), 3) if ttfts else 0.0,
+        "tbt_ms": round(sum(gaps) / len(gaps), 3) if gaps else None,
+        "tpot_ms": round(sum(tpots) / len(tpots), 3) if tpots else None,
+        "throughput_tps": round(output_tokens / wall_s, 3) if wall_s > 0 else 0.0,
+        "error_rate": round(1 - len(succeeded) / len(results), 6) if results else 1.0,
+    }
+    histograms = {
+        metric: build_histogram(values)
+        for metric, values in (("ttft_ms", ttfts), ("tbt_ms", gaps), ("tpot_ms", tpots))
+        if values
+    }
+    summary["latency_histograms"] = histograms or None
+    errors = sorted({r.error for r in results if r.error})
+    if errors:
+        summary["errors"] = errors[:5]
+    return summary
+
+
+def build_entry(
+    summary: dict[str, Any],
+    args: argparse.Namespace,
+    *,
+    concurrency: int,
+    submitted_at: datetime,
+    command: str,
+) -> dict[str, Any]:
+    """A ``leaderboard_v1`` entry for one concurrency level."""
+    config_type = "single_gpu" if args.chip_count == 1 else "multi_gpu"
+    workload = f"{args.workload}_c{concurrency}"
+    key = "|".join(
+        _key_part(part)
+        for part in (
+            args.engine,
+            args.engine_version,
+            args.sagellm_version,
+            workload,
+            args.model,
+            args.precision,
+            args.chip_model,
+            args.chip_count,
+            1,
+            config_type,
+        )
+    )
+    return {
+        "entry_id": str(uuid.uuid4()),
+        "engine": args.engine,
+        "engine_version": args.engine_version,
+        "sagellm_version": args.sagellm_version,
+        "config_type": config_type,
+        "hardware": {
+            "vendor": args.vendor,
+            "chip_model": args.chip_model,
+            "chip_count": args.chip_count,
+            "chips_per_node": args.chip_count,
+            "intra_node_interconnect": "None",
+            "memory_per_chip_gb": None,
+            "total_memory_gb": None,
+        },
+        "model": {
+            "name": args.model,
+            "parameters": args.parameters,
+            "precision": args.precision,
+            "quantization": "None",
+        },
+        "workload": {
+            "name": workload,
+            "input_length": args.input_length,
+            "output_length": args.output_length,
+            "batch_size": 1,
+            "concurrent_requests": concurrency,
+            "dataset": "synthetic",
+        },
+        "metrics": {
+            "ttft_ms": summary["ttft_ms"],
+            "tbt_ms": summary["tbt_ms"],
+            "tpot_ms": summary["tpot_ms"],
+            "throughput_tps": summary["throughput_tps"],
+            "peak_mem_mb": args.peak_mem_mb,
+            "error_rate": summary["error_rate"],
+            **percentile_fields(summary["latency_histograms"] or {}),
+            "latency_histograms": summary["latency_histograms"],
+            "prefix_hit_rate": None,
+            "kv_used_tokens": None,
+            "kv_used_bytes": None,
+            "evict_count": None,
+            "evict_ms": None,
+            "spec_accept_rate": None,
+        },
+        "cluster": None,
+        "versions": {"protocol": "N/A", "backend": "N/A", "core": "N/A"},
+        "environment": {
+            "os": f"{platform.system()} {platform.release()}".strip(),
+            "python_version": platform.python_version(),
+            "pytorch_version": None,
+            "cuda_version": None,
+            "cann_version": None,
+            "driver_version": None,
+        },
+        "kv_cache_config": None,
+        "metadata": {
+            "submitted_at": submitted_at.isoformat(),
+            "submitter": args.submitter,
+            "data_source": DATA_SOURCE,
+            "engine": args.engine,
+            "engine_version": args.engine_version,
+            "reproducible_cmd": command,
+            "git_commit": None,
+            "release_date": None,
+            "changelog_url": None,
+            "notes": (
+                f"{summary['succeeded']}/{summary['requests']} requests at "
+                f"concurrency {concurrency} against {args.base_url}"
+            ),
+            "verified": False,
+            "idempotency_key": key,
+        },
+        "canonical_path": f"canonical/{key.replace('|', '__')}.json",
+    }
+
+
+def write_artifacts(output_dir: Path, entries: list[dict[str, Any]]) -> Path:
+    """Write artifacts and merge their records into ``leaderboard_manifest.json``."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    records: list[dict[str, Any]] = []
+    if manifest_path.exists():
+        records = json.loads(manifest_path.read_text(encoding="utf-8"))["entries"]
+    for entry in entries:
+        stem = f"{_key_part(entry['workload']['name'])}_{entry['entry_id'][:8]}"
+        artifact_name = f"{stem}_leaderboard.json"
+        write_json_document(output_dir / artifact_name, entry)
+        records.append(
+            {
+                "entry_id": entry["entry_id"],
+                "idempotency_key": entry["metadata"]["idempotency_key"],
+                "canonical_path": entry["canonical_path"],
+                "leaderboard_artifact": artifact_name,
+                "engine": entry["engine"],
+                "workload": entry["workload"]["name"],
+                "config_type": entry["config_type"],
+                "category": "single",
+            }
+        )
+    manifest = {
+        "schema_version": MANIFEST_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "entries": records,
+    }
+    # Artifacts land first, so the manifest never lists a missing file.
+    write_json_document(manifest_path, manifest)
+    return manifest_path
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--api-key", help="Sent as a Bearer token.")
+    parser.add_argument("--model", default="sshleifer/tiny-gpt2")
+    parser.add_argument(
+        "--concurrency",
+        default="1",
+        help="Comma-separated concurrency levels; one artifact per level (default: 1).",
+    )
+    parser.add_argument(
+        "--requests", type=int, default=32, help="Requests per level (default: 32)."
+    )
+    parser.add_argument(
+        "--input-length",
+        type=int,
+        default=128,
+        help="Prompt length in words, used as workload.input_length (default: 128).",
+    )
+    parser.add_argument(
+        "--output-length",
+        type=int,
+        default=128,
+        help="max_tokens per request (default: 128).",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Per-request timeout in seconds."
+    )
+    parser.add_argument(
+        "--workload",
+        default="local",
+        help="Workload name prefix; the level is appended (default: local).",
+    )
+    parser.add_argument("--engine", default="sagellm")
+    parser.add_argument("--engine-version", default="0.0.0")
+    parser.add_argument(
+        "--sagellm-version",
+        help="sagellm_version field (default: --engine-version).",
+    )
+    parser.add_argument(
+        "--vendor",
+        default="Unknown",
+        choices=["Intel", "AMD", "NVIDIA", "Huawei", "Unknown", "Other"],
+    )
+    parser.add_argument("--chip-model", default="CPU")
+    parser.add_argument("--chip-count", type=int, default=1)
+    parser.add_argument(
+        "--precision",
+        default="FP16",
+        choices=["FP32", "FP16", "BF16", "INT8", "INT4", "FP8"],
+    )
+    parser.add_argument("--parameters", default="unknown")
+    parser.add_argument(
+        "--peak-mem-mb",
+        type=int,
+        default=0,
+        help="Server peak memory if known; a client cannot measure it (default: 0).",
+    )
+    parser.add_argument("--submitter", default="load_generator.py")
+    parser.add_argument(
+        "--schema", type=Path, default=DEFAULT_SCHEMA_PATH, help="Artifact schema."
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("benchmark_outputs") / "local",
+        help="Artifact + manifest directory (default: benchmark_outputs/local).",
+    )
+    args = parser.parse_args(argv)
+    args.base_url = args.base_url.rstrip("/")
+    args.sagellm_version = args.sagellm_version or args.engine_version
+    if not VERSION_PATTERN.match(args.sagellm_version):
+        parser.error(
+            f"--sagellm-version must look like 1.2.3[.4], got {args.sagellm_version!r}"
+        )
+    try:
+        args.levels = [int(level) for level in args.concurrency.split(",")]
+    except ValueError:
+        parser.error(f"--concurrency must be integers, got {args.concurrency!r}")
+    if min(args.levels) < 1 or args.requests < 1:
+        parser.error("--concurrency levels and --requests must be >= 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    validator = FastPathValidator(load_schema(args.schema))
+    command = shlex.join(
+        ["python", "scripts/load_generator.py", *(argv or sys.argv[1:])]
+    )
+    prompt = " ".join(["hello"] * args.input_length)
+    url = f"{args.base_url}/v1/chat/completions"
+
+    entries = []
+    failed_levels = []
+    for concurrency in args.levels:
+        results, wall_s = asyncio.run(
+            run_level(
+                url,
+                model=args.model,
+                prompt=prompt,
+                output_length=args.output_length,
+                concurrency=concurrency,
+                requests=args.requests,
+                timeout=args.timeout,
+                api_key=args.api_key,
+            )
+        )
+        summary = summarize(results, wall_s)
+        print(
+            f"  c={concurrency}: {summary['succeeded']}/{summary['requests']} ok, "
+            f"ttft {summary['ttft_ms']:.1f} ms, tbt {summary['tbt_ms'] or 0:.2f} ms, "
+            f"{summary['throughput_tps']:.1f} tok/s, error rate {summary['error_rate']:.3f}"
+        )
+        for error in summary.get("errors", []):
+            print(f"    error: {error}", file=sys.stderr)
+        if not summary["succeeded"]:
+            # A level without a single completed stream has no latency to
+            # report; its 0 ms TTFT would otherwise rank first.
+            print(
+                f"❌ c={concurrency}: every request failed, no artifact written",
+                file=sys.stderr,
+            )
+            failed_levels.append(concurrency)
+            continue
+        entry = build_entry(
+            summary,
+            args,
+            concurrency=concurrency,
+            submitted_at=datetime.now(UTC),
+            command=command,
+        )
+        try:
+            validate_entry(entry, validator, source=Path(f"concurrency_{concurrency}"))
+        except ValueError as exc:
+            print(f"❌ {exc}", file=sys.stderr)
+            return 1
+        entries.append(entry)
+
+    if entries:
+        manifest_path = write_artifacts(args.output_dir, entries)
+        print(f"✅ {len(entries)} artifacts listed in {manifest_path}")
+    return 1 if failed_levels else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
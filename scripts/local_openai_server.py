@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Serve a minimal OpenAI-compatible API locally for offline demos and tests.
+
+``GET /health``, ``GET /v1/models`` and ``POST /v1/chat/completions`` answer
+like a SageLLM gateway. Completions stream as server-sent events when the
+request sets ``"stream": true``. The reply is a fixed text: the first chunk
+comes after ``ttft_s`` and each later one after ``tbt_s``, so recorded timings
+are predictable. JSON responses use HTTP/1.1 keep-alive. An event stream
+closes its connection when done. ``requests`` keeps only the last
+``REQUEST_LOG_SIZE`` requests and ``request_count`` counts all of them, so
+long load runs do not grow the server being measured.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+DEFAULT_MODEL = "sshleifer/tiny-gpt2"
+DEFAULT_REPLY = (
+    "Hello! I am sageLLM, running on the CPU backend. "
+    "Ask me anything about inference serving."
+)
+REQUEST_LOG_SIZE = 1024
+
+
+def split_tokens(text: str) -> list[str]:
+    """Word-sized chunks that concatenate back to ``text``."""
+    tokens: list[str] = []
+    for word in text.split(" "):
+        tokens.append(f" {word}" if tokens else word)
+    return tokens
+
+
+class LocalOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 queues connections under concurrent load.
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        *,
+        model: str = DEFAULT_MODEL,
+        reply: str = DEFAULT_REPLY,
+        ttft_s: float = 0.05,
+        tbt_s: float = 0.02,
+    ) -> None:
+        super().__init__(address, LocalOpenAIHandler)
+        self.model = model
+        self.tokens = split_tokens(reply)
+        self.ttft_s = ttft_s
+        self.tbt_s = tbt_s
+        self.requests: deque[tuple[str, str, int]] = deque(maxlen=REQUEST_LOG_SIZE)
+        self.request_count = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class LocalOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: LocalOpenAIServer
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _record(self, status: int) -> None:
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path, status))
+            self.server.request_count += 1
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self._record(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "model": self.server.model})
+        elif self.path == "/v1/models":
+            self._send_json(
+                200,
+                {
+                    "object": "list",
+                    "data": [
+                        {
+                            "id": self.server.model,
+                            "object": "model",
+                            "owned_by": "sagellm",
+                        }
+                    ],
+                },
+            )
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+        if self.path != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        tokens = self.server.tokens
+        max_tokens = request.get("max_tokens")
+        if isinstance(max_tokens, int) and max_tokens > 0:
+            tokens = tokens[:max_tokens]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        usage = {
+            "prompt_tokens": sum(
+                len(str(message.get("content", "")).split())
+                for message in request.get("messages") or []
+                if isinstance(message, dict)
+            ),
+            "completion_tokens": len(tokens),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if not request.get("stream"):
+            time.sleep(self.server.ttft_s + self.server.tbt_s * max(len(tokens) - 1, 0))
+            self._send_json(
+                200,
+                {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": created,
+                    "model": self.server.model,
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": "".join(tokens),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+            return
+
+        self._record(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def chunk(delta: dict[str, Any], finish_reason: str | None) -> None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": self.server.model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            if finish_reason is not None:
+                payload["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        try:
+            time.sleep(self.server.ttft_s)
+            for index, token in enumerate(tokens):
+                if index:
+                    time.sleep(self.server.tbt_s)
+                delta = {"content": token}
+                if index == 0:
+                    delta["role"] = "assistant"
+                chunk(delta, None)
+            chunk({}, "stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+@contextmanager
+def serve_openai(
+    host: str = "127.0.0.1", port: int = 0, **options: Any
+) -> Iterator[LocalOpenAIServer]:
+    """Run a ``LocalOpenAIServer`` on a background thread for the ``with`` block."""
+    server = LocalOpenAIServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument("--ttft", type=float, default=0.05, help="Seconds.")
+    parser.add_argument("--tbt", type=float, default=0.02, help="Seconds.")
+    args = parser.parse_args()
+
+    with serve_openai(
+        args.host,
+        args.port,
+        model=args.model,
+        reply=args.reply,
+        ttft_s=args.ttft,
+        tbt_s=args.tbt,
+    ) as server:
+        print(f"Serving {server.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Find ``leaderboard_manifest.json`` files under a benchmark output tree.
+
+``discover_manifests`` walks the tree with ``os.scandir`` instead of
+``Path.rglob`` and prunes it three ways:
+
+- ``exclude`` globs drop whole subtrees (matched against the directory name
+  and its path relative to the source dir, e.g. ``raw_logs`` or
+  ``*/profiles/*``);
+- ``max_depth`` stops descending below that many levels;
+- with a ``cache`` (kept in the ``--incremental`` state file), a directory
+  whose mtime is unchanged since the last scan is not listed again: its
+  subdirectories and whether it holds a manifest are taken from the cache.
+  Adding, removing or renaming an entry changes a directory's mtime, so only
+  directories that changed are re-listed (every directory is still stat'ed).
+
+Symlinked directories are not followed.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterable
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+MANIFEST_NAME = "leaderboard_manifest.json"
+DISCOVERY_CACHE_VERSION = 1
+# Directories modified this close to the scan are listed again next time, so a
+# change in the same (possibly 1 s, e.g. NFS) mtime tick is never missed.
+MTIME_SAFETY_NS = 2_000_000_000
+
+
+def is_excluded(name: str, relative: str, exclude: Iterable[str]) -> bool:
+    return any(
+        fnmatch(name, pattern) or fnmatch(relative, pattern) for pattern in exclude
+    )
+
+
+def discover_manifests(
+    source_dir: Path,
+    *,
+    exclude: Iterable[str] = (),
+    max_depth: int | None = None,
+    cache: dict[str, Any] | None = None,
+) -> tuple[list[Path], dict[str, int]]:
+    """Sorted manifest paths plus walk counts.
+
+    Counts are ``dirs_listed`` (``os.scandir`` calls), ``dirs_cached``
+    (listing reused from ``cache``), ``files_seen`` (non-directory entries in
+    the listed directories) and ``dirs_pruned`` (subtrees skipped by
+    ``exclude`` or ``max_depth``). ``cache`` is updated in place.
+    """
+    exclude = tuple(exclude)
+    root = str(source_dir.resolve())
+    previous: dict[str, Any] = {}
+    if (
+        cache is not None
+        and cache.get("version") == DISCOVERY_CACHE_VERSION
+        and cache.get("root") == root
+    ):
+        previous = cache.get("dirs") or {}
+    fresh: dict[str, Any] = {}
+    dirs_listed = dirs_cached = files_seen = dirs_pruned = 0
+    trusted_before = time.time_ns() - MTIME_SAFETY_NS
+
+    # Plain strings and local counters keep the per-directory cost close to
+    # ``os.scandir`` itself; ``Path`` objects are built for manifests only.
+    manifests: list[Path] = []
+    stack: list[tuple[str, str, int]] = [("", os.fspath(source_dir), 0)]
+    while stack:
+        relative, path, depth = stack.pop()
+        mtime_ns = None
+        if cache is not None:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        cached = previous.get(relative)
+        if cached is not None and cached["mtime_ns"] == mtime_ns:
+            subdirs, has_manifest = cached["subdirs"], cached["manifest"]
+            dirs_cached += 1
+        else:
+            subdirs, has_manifest = [], False
+            try:
+                with os.scandir(path) as scan:
+                    for entry in scan:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            files_seen += 1
+                            if entry.name == MANIFEST_NAME:
+                                has_manifest = True
+            except OSError:
+                continue
+            dirs_listed += 1
+        if mtime_ns is not None and mtime_ns < trusted_before:
+            fresh[relative] = {
+                "mtime_ns": mtime_ns,
+                "subdirs": subdirs,
+                "manifest": has_manifest,
+            }
+
+        if has_manifest:
+            manifests.append(Path(path, MANIFEST_NAME))
+        if max_depth is not None and depth >= max_depth:
+            dirs_pruned += len(subdirs)
+            continue
+        for name in subdirs:
+            child = f"{relative}/{name}" if relative else name
+            if exclude and is_excluded(name, child, exclude):
+                dirs_pruned += 1
+                continue
+            stack.append((child, os.path.join(path, name), depth + 1))
+
+    if cache is not None:
+        cache.clear()
+        cache.update({"version": DISCOVERY_CACHE_VERSION, "root": root, "dirs": fresh})
+    counts = {
+        "dirs_listed": dirs_listed,
+        "dirs_cached": dirs_cached,
+        "files_seen": files_seen,
+        "dirs_pruned": dirs_pruned,
+    }
+    return sorted(manifests), counts
@@ -0,0 +1,141 @@
+"""Opt-in instrumentation for ``aggregate_results.py``.
+
+``PipelineProfiler`` collects per-stage wall time, optional ``tracemalloc``
+allocation figures, named counters and Chrome trace spans
+(``chrome://tracing`` / Perfetto "JSON trace event" format). Pipeline code takes
+``profiler: PipelineProfiler | None`` and only touches it behind an
+``is not None`` check, so a run without ``--profile`` / ``--trace-out`` does no
+extra work.
+
+Allocation figures cover the parent process only; artifacts parsed in
+``--jobs`` workers show up as trace spans with the worker's pid.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager
+
+
+class PipelineProfiler:
+    def __init__(self, *, trace: bool = False, allocations: bool = False) -> None:
+        self.trace = trace
+        self.allocations = allocations
+        self.counters: Counter[str] = Counter()
+        self.stages: list[dict[str, Any]] = []
+        self.events: list[dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def span(
+        self,
+        name: str,
+        start_ns: int,
+        end_ns: int,
+        *,
+        category: str,
+        pid: int | None = None,
+        args: dict[str, Any] | None = None,
+    ) -> None:
+        """Record a complete ("X") trace event; ``*_ns`` are ``perf_counter_ns``."""
+        if not self.trace:
+            return
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": pid if pid is not None else self._pid,
+            "tid": 0,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        tracing = self.allocations and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if self.allocations:
+            tracemalloc.reset_peak()
+            allocated_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter_ns()
+            record: dict[str, Any] = {
+                "name": name,
+                "seconds": (ended - started) / 1e9,
+            }
+            if self.allocations:
+                current, peak = tracemalloc.get_traced_memory()
+                record["alloc_peak_bytes"] = max(peak - allocated_before, 0)
+                record["alloc_net_bytes"] = current - allocated_before
+            if tracing:
+                tracemalloc.stop()
+            self.stages.append(record)
+            self.span(name, started, ended, category="stage")
+            if self.trace and self.counters:
+                self.events.append(
+                    {
+                        "name": "counters",
+                        "ph": "C",
+                        "ts": (ended - self._origin_ns) / 1000,
+                        "pid": self._pid,
+                        "tid": 0,
+                        "args": dict(self.counters),
+                    }
+                )
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "stages": self.stages,
+            "total_seconds": sum(stage["seconds"] for stage in self.stages),
+            "counters": dict(self.counters),
+        }
+
+    def write_trace(self, path: Path) -> None:
+        payload = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": self.report(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+    def summary_lines(self) -> list[str]:
+        report = self.report()
+        total = report["total_seconds"] or 1.0
+        lines = ["⏱  Stage profile"]
+        for stage in self.stages:
+            line = (
+                f"  {stage['name']:<9} {stage['seconds'] * 1000:>10.1f} ms "
+                f"{stage['seconds'] / total:>6.1%}"
+            )
+            if "alloc_peak_bytes" in stage:
+                line += (
+                    f"  alloc peak {stage['alloc_peak_bytes'] / 2**20:>8.1f} MiB"
+                    f"  net {stage['alloc_net_bytes'] / 2**20:>+8.1f} MiB"
+                )
+            lines.append(line)
+        for name, value in sorted(report["counters"].items()):
+            lines.append(f"  {name}: {value:,}")
+        return lines
+
+
+def profile_stage(profiler: PipelineProfiler | None, name: str) -> ContextManager[None]:
+    """``profiler.stage(name)``, or a no-op context when profiling is off."""
+    return profiler.stage(name) if profiler is not None else nullcontext()
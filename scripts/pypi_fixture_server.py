@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Serve a PyPI-style JSON API from a local fixture for offline version syncs.
+
+The fixture maps package names to a version string, or to
+``{"version": ..., "delay": seconds}`` to simulate a slow package::
+
+    {"isagellm": "0.5.4.70", "isagellm-core": {"version": "0.5.4.9", "delay": 2}}
+
+``GET /pypi/<package>/json`` answers ``{"info": {"version": ...}}`` over
+HTTP/1.1 keep-alive with an ``ETag`` and ``Last-Modified``, and
+``304 Not Modified`` when ``If-None-Match`` matches. Unknown packages are 404.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+
+def load_fixture(path: Path) -> dict[str, Any]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict):
+        raise ValueError(f"{path}: expected a {{package: version}} JSON object")
+    return payload
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixture: dict[str, Any], address: tuple[str, int]) -> None:
+        super().__init__(address, FixtureHandler)
+        self.fixture = fixture
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self.requests: list[tuple[str, int]] = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url_template(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/pypi/{{package}}/json"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FixtureServer
+
+    def setup(self) -> None:
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes = b"", **headers: str) -> None:
+        with self.server.lock:
+            self.server.requests.append((self.path, status))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        spec = None
+        if len(parts) == 3 and parts[0] == "pypi" and parts[2] == "json":
+            spec = self.server.fixture.get(parts[1])
+        if spec is None:
+            self._send(404, b'{"message": "Not Found"}')
+            return
+        if isinstance(spec, dict):
+            time.sleep(float(spec.get("delay", 0)))
+            version = str(spec["version"])
+        else:
+            version = str(spec)
+
+        etag = '"' + hashlib.sha1(version.encode()).hexdigest() + '"'
+        validators = {"ETag": etag, "Last_Modified": self.server.last_modified}
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, **validators)
+            return
+        body = json.dumps({"info": {"name": parts[1], "version": version}}).encode()
+        self._send(200, body, Content_Type="application/json", **validators)
+
+
+@contextmanager
+def serve_fixture(
+    fixture: dict[str, Any], host: str = "127.0.0.1", port: int = 0
+) -> Iterator[FixtureServer]:
+    """Run a ``FixtureServer`` on a background thread for the ``with`` block."""
+    server = FixtureServer(fixture, (host, port))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixture", type=Path, help="{package: version} JSON file.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with serve_fixture(load_fixture(args.fixture), args.host, args.port) as server:
+        print(f"Serving {server.url_template} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
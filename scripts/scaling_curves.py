@@ -0,0 +1,254 @@
+"""Throughput-vs-load scaling curves per compare scope (``leaderboard-scaling/v1``).
+
+``build_compare_scope_key`` ignores ``workload.concurrent_requests`` and
+``workload.batch_size``, so runs of one configuration at different load levels
+look like unrelated points. Here they are joined into one curve per scope,
+engine and chip count. A point's ``load`` is ``concurrent_requests *
+batch_size``. The ``_c<N>`` suffix that ``load_generator.py`` adds to workload
+names is dropped, so its levels land on the same curve.
+
+Each point reports throughput, per-chip throughput and latency. It also has a
+``marginal_efficiency``: the relative throughput gain from the previous point
+divided by the relative load gain (1.0 is linear scaling). The curve's
+``knee`` is the last point before the marginal efficiency first drops below
+``KNEE_MARGINAL_EFFICIENCY``. It is ``null`` while the curve still scales.
+``chip_scaling_efficiency`` compares peak per-chip throughput with the same
+engine's curve on the fewest chips.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from compare_matrix import metric_value
+from entry_view import EntryView, as_entry_view
+
+SCALING_SNAPSHOT_SCHEMA_VERSION = "leaderboard-scaling/v1"
+# Below this marginal efficiency, doubling the load adds less than half as
+# much throughput as linear scaling would.
+KNEE_MARGINAL_EFFICIENCY = 0.5
+POINT_METRICS = ("throughput_tps", "ttft_ms", "tbt_ms", "ttft_p99_ms", "error_rate")
+LOAD_SUFFIX = re.compile(r"_c\d+$")
+
+
+def _load_value(workload: dict[str, Any], field: str) -> int:
+    value = workload.get(field)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        return 1
+    return value
+
+
+def _engine_version(entry: dict[str, Any]) -> str:
+    return str(
+        entry.get("engine_version")
+        or (entry.get("metadata") or {}).get("engine_version")
+        or "unknown"
+    )
+
+
+def _ratio(numerator: float | None, denominator: float | None) -> float | None:
+    if numerator is None or not denominator:
+        return None
+    return round(numerator / denominator, 4)
+
+
+def entry_family_key(item: dict[str, Any] | EntryView) -> str:
+    """``family_key`` of the curves ``item`` can land on.
+
+    A family is model, hardware, precision, workload and engine; the
+    ``chip_scaling_efficiency`` of a curve depends on its whole family.
+    """
+    view = as_entry_view(item)
+    model, hardware, precision, workload_name = view.scope_values[:4]
+    return "|".join(
+        (model, hardware, precision, LOAD_SUFFIX.sub("", workload_name), view.engine)
+    )
+
+
+def curve_family_key(curve: dict[str, Any]) -> str:
+    """``entry_family_key`` of the entries behind a ``build_curve`` payload."""
+    scope = curve["scope"]
+    return "|".join(
+        (
+            scope["model"],
+            scope["hardware"],
+            scope["precision"],
+            scope["workload"],
+            curve["engine"],
+        )
+    )
+
+
+def group_curves(
+    entries: Iterable[dict[str, Any] | EntryView],
+) -> dict[tuple[str, ...], dict[str, Any]]:
+    """Curves keyed by compare scope (minus the load suffix) and engine.
+
+    Per curve only entries of the newest entry's ``engine_version`` are kept,
+    and per (concurrency, batch size) the newest of those.
+    """
+    curves: dict[tuple[str, ...], dict[str, Any]] = {}
+    for view in map(as_entry_view, entries):
+        model, hardware, precision, workload_name, config, chips, nodes = (
+            view.scope_values
+        )
+        workload_name = LOAD_SUFFIX.sub("", workload_name)
+        key = (
+            model,
+            hardware,
+            precision,
+            workload_name,
+            config,
+            str(chips),
+            str(nodes),
+            view.engine,
+        )
+        curve = curves.get(key)
+        if curve is None:
+            curve = curves[key] = {
+                "scope_key": "|".join(key[:7]),
+                "family_key": "|".join((*key[:4], view.engine)),
+                "category": view.category,
+                "scope": {
+                    "model": model,
+                    "hardware": hardware,
+                    "precision": precision,
+                    "workload": workload_name,
+                    "config_type": config,
+                    "chip_count": chips,
+                    "node_count": nodes,
+                },
+                "engine": view.engine,
+                "views": [],
+            }
+        curve["views"].append(view)
+
+    for curve in curves.values():
+        newest = max(curve["views"], key=lambda view: view.sort_key)
+        version = _engine_version(newest.entry)
+        points: dict[tuple[int, int], EntryView] = {}
+        for view in curve.pop("views"):
+            if _engine_version(view.entry) != version:
+                continue
+            workload = view.entry.get("workload") or {}
+            if not isinstance(workload, dict):
+                workload = {}
+            load = (
+                _load_value(workload, "concurrent_requests"),
+                _load_value(workload, "batch_size"),
+            )
+            current = points.get(load)
+            if current is None or view.sort_key > current.sort_key:
+                points[load] = view
+        curve["engine_version"] = version
+        curve["points_by_load"] = points
+    return curves
+
+
+def build_curve(curve: dict[str, Any]) -> dict[str, Any]:
+    """Ordered points, knee and peak for one ``group_curves`` curve."""
+    chips = curve["scope"]["chip_count"]
+    points: list[dict[str, Any]] = []
+    previous: dict[str, Any] | None = None
+    knee: dict[str, Any] | None = None
+    for (concurrency, batch_size), view in sorted(
+        curve["points_by_load"].items(),
+        key=lambda item: (item[0][0] * item[0][1], item[0]),
+    ):
+        metrics = view.entry.get("metrics") or {}
+        point: dict[str, Any] = {
+            "concurrent_requests": concurrency,
+            "batch_size": batch_size,
+            "load": concurrency * batch_size,
+            "entry_id": str(view.entry.get("entry_id") or ""),
+            **{name: metric_value(metrics, name) for name in POINT_METRICS},
+        }
+        throughput = point["throughput_tps"]
+        point["throughput_per_chip"] = _ratio(throughput, chips)
+        point["marginal_efficiency"] = None
+        if previous is not None and previous["throughput_tps"]:
+            load_gain = point["load"] / previous["load"] - 1
+            if throughput is not None and load_gain > 0:
+                point["marginal_efficiency"] = round(
+                    (throughput / previous["throughput_tps"] - 1) / load_gain, 4
+                )
+                if (
+                    knee is None
+                    and point["marginal_efficiency"] < KNEE_MARGINAL_EFFICIENCY
+                ):
+                    knee = previous
+        points.append(point)
+        previous = point
+
+    peak = max(
+        (point for point in points if point["throughput_tps"] is not None),
+        key=lambda point: point["throughput_tps"],
+        default=None,
+    )
+    return {
+        "scope_key": curve["scope_key"],
+        "category": curve["category"],
+        "scope": curve["scope"],
+        "engine": curve["engine"],
+        "engine_version": curve["engine_version"],
+        "points": points,
+        "knee": (
+            None
+            if knee is None
+            else {
+                field: knee[field]
+                for field in (
+                    "concurrent_requests",
+                    "batch_size",
+                    "load",
+                    "throughput_tps",
+                    "ttft_ms",
+                )
+            }
+        ),
+        "peak_throughput_tps": peak["throughput_tps"] if peak else None,
+        "peak_throughput_per_chip": peak["throughput_per_chip"] if peak else None,
+        "peak_load": peak["load"] if peak else None,
+    }
+
+
+def build_scaling_snapshot(
+    entries: Iterable[dict[str, Any] | EntryView],
+) -> dict[str, Any]:
+    """Every curve with at least two load levels, plus per-chip efficiency.
+
+    ``chip_scaling_efficiency`` divides a curve's ``peak_throughput_per_chip``
+    by that of the same engine, model, hardware, precision and workload on
+    the fewest chips (``1.0`` for that curve itself).
+    """
+    families: dict[str, list[dict[str, Any]]] = {}
+    curves: list[dict[str, Any]] = []
+    for curve in group_curves(entries).values():
+        if len(curve["points_by_load"]) < 2:
+            continue
+        payload = build_curve(curve)
+        families.setdefault(curve["family_key"], []).append(payload)
+        curves.append(payload)
+
+    for members in families.values():
+        reference = min(
+            members,
+            key=lambda payload: payload["scope"]["chip_count"] or float("inf"),
+        )
+        for payload in members:
+            payload["chip_scaling_efficiency"] = _ratio(
+                payload["peak_throughput_per_chip"],
+                reference["peak_throughput_per_chip"],
+            )
+
+    curves.sort(key=lambda item: (item["scope_key"], item["engine"]))
+    return {
+        "schema_version": SCALING_SNAPSHOT_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "knee_marginal_efficiency": KNEE_MARGINAL_EFFICIENCY,
+        "curve_count": len(curves),
+        "curves": curves,
+    }
@@ -0,0 +1,181 @@
+"""Precompressed, content-hashed copies of website snapshot files.
+
+Static hosting can serve ``<name>.gz`` / ``<name>.br`` siblings directly when a
+client sends ``Accept-Encoding``, and a filename that embeds the content hash
+(``leaderboard_single.<sha256[:16]>.json``) never changes meaning, so it can be
+cached as immutable. ``snapshot_index.json`` maps each logical snapshot name to
+its hash, hashed filename and encoded sizes; ``last_updated.json`` repeats the
+hashes so the browser can skip refetching snapshots that did not change.
+
+Brotli is optional: without the ``brotli`` package only gzip siblings are
+written and the index lists only the ``gzip`` encoding.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import re
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+from snapshot_writer import atomic_output, write_json_document
+
+SNAPSHOT_INDEX_SCHEMA_VERSION = "leaderboard-snapshot-index/v1"
+SNAPSHOT_INDEX_NAME = "snapshot_index.json"
+HASH_LENGTH = 16
+ENCODING_SUFFIXES = {"gzip": ".gz", "br": ".br"}
+# Quality 10/11 switch to a much slower block search: on a 14 MB snapshot 11 is
+# ~100x slower than 9 for an 8% smaller file, which dominated write_outputs.
+BROTLI_QUALITY = 9
+
+
+def compress_variants(data: bytes) -> dict[str, bytes]:
+    """Return the encodings written next to every snapshot, keyed by encoding."""
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return variants
+
+
+def _write_bytes(path: Path, data: bytes) -> None:
+    with atomic_output(path, binary=True) as handle:
+        handle.write(data)
+
+
+def write_precompressed(
+    path: Path, variants: dict[str, bytes] | None = None
+) -> dict[str, dict[str, int]]:
+    """Write ``path``'s ``.gz`` / ``.br`` siblings and return their sizes."""
+    if variants is None:
+        variants = compress_variants(path.read_bytes())
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        sibling = path.with_name(path.name + suffix)
+        if encoding in variants:
+            _write_bytes(sibling, variants[encoding])
+        else:
+            # Never leave an encoding behind that no longer matches the file.
+            sibling.unlink(missing_ok=True)
+    return {encoding: {"bytes": len(data)} for encoding, data in variants.items()}
+
+
+def hashed_name(name: str, digest: str) -> str:
+    """``leaderboard_single.json`` -> ``leaderboard_single.<digest[:16]>.json``."""
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        return f"{name}.{digest[:HASH_LENGTH]}"
+    return f"{stem}.{digest[:HASH_LENGTH]}.{suffix}"
+
+
+def _hashed_pattern(name: str) -> re.Pattern[str]:
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        stem, suffix = name, ""
+    tail = rf"\.{re.escape(suffix)}" if suffix else ""
+    return re.compile(
+        rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{tail}(?:\.gz|\.br)?"
+    )
+
+
+def load_snapshot_index(output_dir: Path) -> dict[str, Any]:
+    path = output_dir / SNAPSHOT_INDEX_NAME
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if payload.get("schema_version") != SNAPSHOT_INDEX_SCHEMA_VERSION:
+        return {}
+    return payload
+
+
+def publish_snapshots(output_dir: Path, names: list[str]) -> dict[str, Any]:
+    """Compress and content-address ``names`` and write ``snapshot_index.json``.
+
+    Hashed copies from the previous index are kept for one more generation so a
+    client that read the old ``last_updated.json`` can still fetch its files;
+    older hashed copies are removed.
+    """
+    previous = load_snapshot_index(output_dir)
+    files: dict[str, Any] = {}
+    for name in names:
+        path = output_dir / name
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        variants = compress_variants(data)
+        encodings = write_precompressed(path, variants)
+
+        hashed = output_dir / hashed_name(name, digest)
+        if not hashed.exists() or hashed.read_bytes() != data:
+            _write_bytes(hashed, data)
+        write_precompressed(hashed, variants)
+
+        files[name] = {
+            "sha256": digest,
+            "bytes": len(data),
+            "hashed": hashed.name,
+            "encodings": encodings,
+        }
+
+    index = {
+        "schema_version": SNAPSHOT_INDEX_SCHEMA_VERSION,
+        "generated_at": datetime.now(UTC).isoformat(),
+        "files": files,
+    }
+    write_json_document(output_dir / SNAPSHOT_INDEX_NAME, index)
+
+    keep = {
+        item["hashed"]
+        for payload in (previous, index)
+        for item in (payload.get("files") or {}).values()
+    }
+    patterns = [
+        _hashed_pattern(name) for name in {*names, *(previous.get("files") or {})}
+    ]
+    for candidate in output_dir.iterdir():
+        base = re.sub(r"\.(gz|br)$", "", candidate.name)
+        if base in keep or not candidate.is_file():
+            continue
+        if any(pattern.fullmatch(candidate.name) for pattern in patterns):
+            candidate.unlink()
+    return index
+
+
+def remove_precompressed(path: Path) -> None:
+    """Remove ``path``'s ``.gz`` / ``.br`` siblings, if any."""
+    for suffix in ENCODING_SUFFIXES.values():
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def unpublish_snapshots(output_dir: Path, names: list[str]) -> None:
+    """Undo ``publish_snapshots`` for a run without precompression.
+
+    Siblings and hashed copies left by an earlier precompressed run would no
+    longer match the snapshots, so they are removed with the index.
+    """
+    previous = load_snapshot_index(output_dir)
+    patterns = [
+        _hashed_pattern(name) for name in {*names, *(previous.get("files") or {})}
+    ]
+    for name in names:
+        remove_precompressed(output_dir / name)
+    for candidate in output_dir.iterdir():
+        if candidate.is_file() and any(
+            pattern.fullmatch(candidate.name) for pattern in patterns
+        ):
+            candidate.unlink()
+    (output_dir / SNAPSHOT_INDEX_NAME).unlink(missing_ok=True)
+
+
+def snapshot_hashes(index: dict[str, Any]) -> dict[str, dict[str, str]]:
+    """The per-snapshot hash summary embedded in ``last_updated.json``."""
+    return {
+        name: {"sha256": item["sha256"], "hashed": item["hashed"]}
+        for name, item in index.get("files", {}).items()
+    }
@@ -0,0 +1,92 @@
+"""Streaming, atomic JSON writers for website snapshot files.
+
+Snapshots are written to a temporary file in the destination directory and
+renamed over the target with ``os.replace``, so a reader of the static site
+sees either the previous snapshot or the complete new one, never a partial
+file. Entry arrays are encoded one entry at a time instead of materializing
+the whole document as a single string.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import IO, Any
+
+SNAPSHOT_FILE_MODE = 0o644
+WRITE_BUFFER_BYTES = 1 << 20
+
+
+@contextmanager
+def atomic_output(path: Path, *, binary: bool = False) -> Iterator[IO[Any]]:
+    """Yield a handle whose content replaces ``path`` only if the block succeeds."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        if binary:
+            handle = os.fdopen(fd, "wb", buffering=WRITE_BUFFER_BYTES)
+        else:
+            handle = os.fdopen(
+                fd, "w", encoding="utf-8", newline="\n", buffering=WRITE_BUFFER_BYTES
+            )
+        with handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.chmod(tmp_name, SNAPSHOT_FILE_MODE)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+def iter_json_array(entries: Iterable[Any], *, indent: int = 2) -> Iterator[str]:
+    """Encode ``entries`` exactly like ``json.dumps(list(entries), indent=indent)``."""
+    pad = " " * indent
+    first = True
+    for entry in entries:
+        yield f"[\n{pad}" if first else f",\n{pad}"
+        yield json.dumps(entry, indent=indent, ensure_ascii=False).replace(
+            "\n", f"\n{pad}"
+        )
+        first = False
+    yield "[]" if first else "\n]"
+
+
+def write_json_array(path: Path, entries: Iterable[Any]) -> int:
+    """Stream an entry array to ``path`` atomically and return the entry count."""
+    count = 0
+
+    def counted() -> Iterator[Any]:
+        nonlocal count
+        for entry in entries:
+            count += 1
+            yield entry
+
+    with atomic_output(path) as handle:
+        for chunk in iter_json_array(counted()):
+            handle.write(chunk)
+        handle.write("\n")
+    return count
+
+
+def write_json_document(
+    path: Path,
+    payload: Any,
+    *,
+    indent: int | None = 2,
+    separators: tuple[str, str] | None = None,
+) -> None:
+    """Stream any JSON document to ``path`` atomically via ``iterencode``."""
+    encoder = json.JSONEncoder(indent=indent, separators=separators, ensure_ascii=False)
+    with atomic_output(path) as handle:
+        for chunk in encoder.iterencode(payload):
+            handle.write(chunk)
+        handle.write("\n")
@@ -1,40 +1,245 @@
 #!/usr/bin/env python3
+"""Sync package versions in ``data/version_meta.json`` from PyPI and render README.
+
+Packages are fetched concurrently on a bounded thread pool. Each worker keeps
+one keep-alive connection to the index, so a slow package only holds up its
+own worker. Responses are cached with their ``ETag`` / ``Last-Modified``
+validators, and the next run sends conditional requests: an unchanged package
+costs a ``304 Not Modified`` without a JSON body. The cache records the index
+it was filled from (the URL template, or ``offline:<fixture path>``) and is
+ignored for any other index, so validators never leak between indexes.
+``--offline FIXTURE`` serves a ``{package: version}`` JSON file from a local
+server (``pypi_fixture_server.py``), so the sync runs without network access;
+it skips the cache unless ``--cache-file`` is given. The server's port changes
+per run but the fixture path does not, so repeated offline runs hit the cache.
+"""
+
 from __future__ import annotations
 
+import argparse
+import http.client
 import json
 import ssl
-import urllib.error
-import urllib.request
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
-VERSION_META_PATH = Path(__file__).resolve().parents[1] / "data" / "version_meta.json"
-README_PATH = Path(__file__).resolve().parents[1] / "README.md"
+ROOT_DIR = Path(__file__).resolve().parents[1]
+VERSION_META_PATH = ROOT_DIR / "data" / "version_meta.json"
+README_PATH = ROOT_DIR / "README.md"
+CACHE_PATH = ROOT_DIR / ".cache" / "pypi_versions.json"
 PYPI_URL = "https://pypi.org/pypi/{package}/json"
+USER_AGENT = "vllm-hust-website-version-sync/1.0"
 README_BLOCK_START = "<!-- BEGIN:VERSION_META -->"
 README_BLOCK_END = "<!-- END:VERSION_META -->"
+CACHE_VERSION = 2
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 20.0
+MAX_REDIRECTS = 3
+
+
+class PyPIClient:
+    """Thread-safe JSON API client with one keep-alive connection per thread.
+
+    ``cache`` maps package names to ``{"version", "etag", "last_modified"}``;
+    its validators are sent as ``If-None-Match`` / ``If-Modified-Since`` and
+    entries are refreshed in place. ``stats`` counts ``fetched`` (200),
+    ``not_modified`` (304) and ``connections`` opened.
+    """
+
+    def __init__(
+        self,
+        url_template: str = PYPI_URL,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        self.url_template = url_template
+        self.timeout = timeout
+        self.cache = cache if cache is not None else {}
+        self.stats = {"fetched": 0, "not_modified": 0, "connections": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[http.client.HTTPConnection] = []
+        self._ssl_context = ssl.create_default_context()
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        connection = pool.get((scheme, netloc))
+        if connection is None:
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(
+                    netloc, timeout=self.timeout, context=self._ssl_context
+                )
+            else:
+                connection = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            pool[(scheme, netloc)] = connection
+            with self._lock:
+                self._connections.append(connection)
+                self.stats["connections"] += 1
+        return connection
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        connection = self._local.pool.pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def _get(
+        self, url: str, headers: dict[str, str]
+    ) -> tuple[int, dict[str, str], bytes]:
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(url)
+            target = parts.path + (f"?{parts.query}" if parts.query else "")
+            # A reused keep-alive connection may have been closed by the server
+            # while idle; retry once on a fresh one.
+            for attempt in range(2):
+                connection = self._connection(parts.scheme, parts.netloc)
+                try:
+                    connection.request("GET", target, headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (
+                    http.client.RemoteDisconnected,
+                    ConnectionResetError,
+                    BrokenPipeError,
+                ):
+                    self._drop_connection(parts.scheme, parts.netloc)
+                    if attempt:
+                        raise
+                except (OSError, http.client.HTTPException):
+                    self._drop_connection(parts.scheme, parts.netloc)
+                    raise
+            response_headers = {
+                key.lower(): value for key, value in response.getheaders()
+            }
+            if (
+                response.status in (301, 302, 303, 307, 308)
+                and "location" in response_headers
+            ):
+                url = urllib.parse.urljoin(url, response_headers["location"])
+                continue
+            return response.status, response_headers, body
+        raise RuntimeError(f"Too many redirects for {url}")
+
+    def latest_version(self, package_name: str) -> str:
+        headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+        cached = self.cache.get(package_name)
+        if cached and cached.get("version"):
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        url = self.url_template.format(package=package_name)
+        try:
+            status, response_headers, body = self._get(url, headers)
+        except (OSError, http.client.HTTPException) as error:
+            raise RuntimeError(
+                f"Failed to fetch {package_name} from PyPI: {error}"
+            ) from error
+
+        if status == 304 and cached and cached.get("version"):
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return cached["version"]
+        if status != 200:
+            raise RuntimeError(
+                f"Failed to fetch {package_name} from PyPI: HTTP {status}"
+            )
+
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except ValueError as error:
+            raise RuntimeError(f"Invalid JSON payload for {package_name}") from error
+        version = payload.get("info", {}).get("version")
+        if not isinstance(version, str) or not version.strip():
+            raise RuntimeError(f"Invalid version payload for {package_name}")
+        version = version.strip()
+        with self._lock:
+            self.stats["fetched"] += 1
+            self.cache[package_name] = {
+                "version": version,
+                "etag": response_headers.get("etag"),
+                "last_modified": response_headers.get("last-modified"),
+            }
+        return version
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+
+def fetch_latest_versions(
+    client: PyPIClient, package_names: list[str], *, workers: int = DEFAULT_WORKERS
+) -> dict[str, str]:
+    """``{package: latest version}``, fetched on at most ``workers`` threads.
+
+    Every package is attempted; failures are reported together afterwards.
+    """
+    names = list(dict.fromkeys(package_names))
+    if not names:
+        return {}
+    results: dict[str, str] = {}
+    errors: list[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as pool:
+        futures = {name: pool.submit(client.latest_version, name) for name in names}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except RuntimeError as error:
+                errors.append(str(error))
+    if errors:
+        raise RuntimeError("; ".join(errors))
+    return results
 
 
 def _fetch_latest_version(package_name: str) -> str:
-    url = PYPI_URL.format(package=package_name)
-    context = ssl.create_default_context()
-    request = urllib.request.Request(
-        url, headers={"User-Agent": "vllm-hust-website-version-sync/1.0"}
-    )
-
+    client = PyPIClient()
     try:
-        with urllib.request.urlopen(request, timeout=20, context=context) as response:
-            payload = json.loads(response.read().decode("utf-8"))
-    except urllib.error.URLError as error:
-        raise RuntimeError(
-            f"Failed to fetch {package_name} from PyPI: {error}"
-        ) from error
+        return client.latest_version(package_name)
+    finally:
+        client.close()
 
-    version = payload.get("info", {}).get("version")
-    if not isinstance(version, str) or not version.strip():
-        raise RuntimeError(f"Invalid version payload for {package_name}")
-    return version.strip()
+
+def load_cache(path: Path, index: str) -> dict[str, dict[str, Any]]:
+    """Cached packages, or ``{}`` if the file was filled from another index."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != CACHE_VERSION:
+        return {}
+    if payload.get("index") != index:
+        return {}
+    packages = payload.get("packages")
+    return packages if isinstance(packages, dict) else {}
+
+
+def write_cache(path: Path, cache: dict[str, dict[str, Any]], index: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "index": index,
+                "packages": cache,
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    tmp_path.replace(path)
 
 
 def _load_meta() -> dict[str, Any]:
@@ -120,25 +325,51 @@ def _sync_readme(meta: dict[str, Any]) -> bool:
     return False
 
 
-def sync_version_meta() -> bool:
+def sync_version_meta(
+    *,
+    url_template: str = PYPI_URL,
+    cache_path: Path | None = CACHE_PATH,
+    cache_index: str | None = None,
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = DEFAULT_TIMEOUT,
+    stats: dict[str, int] | None = None,
+) -> bool:
+    """Sync versions and the README block; ``True`` if either changed.
+
+    ``cache_index`` names the index the cache belongs to (default:
+    ``url_template``).
+    """
     meta = _load_meta()
     packages = meta.get("packages")
 
     if not isinstance(packages, list):
         raise RuntimeError("version_meta.json is missing a valid 'packages' array")
 
-    changed = False
-    for package in packages:
-        if not isinstance(package, dict):
-            continue
-
-        pypi_name = package.get("pypi_name")
-        current_version = package.get("version")
-        if not isinstance(pypi_name, str) or not isinstance(current_version, str):
-            continue
+    tracked = [
+        package
+        for package in packages
+        if isinstance(package, dict)
+        and isinstance(package.get("pypi_name"), str)
+        and isinstance(package.get("version"), str)
+    ]
+    cache_index = cache_index or url_template
+    cache = load_cache(cache_path, cache_index) if cache_path is not None else {}
+    client = PyPIClient(url_template, timeout=timeout, cache=cache)
+    try:
+        latest = fetch_latest_versions(
+            client, [package["pypi_name"] for package in tracked], workers=workers
+        )
+    finally:
+        client.close()
+        if cache_path is not None:
+            write_cache(cache_path, client.cache, cache_index)
+        if stats is not None:
+            stats.update(client.stats)
 
-        latest_version = _fetch_latest_version(pypi_name)
-        if latest_version != current_version:
+    changed = False
+    for package in tracked:
+        latest_version = latest[package["pypi_name"]]
+        if latest_version != package["version"]:
             package["version"] = latest_version
             changed = True
 
@@ -151,12 +382,83 @@ def sync_version_meta() -> bool:
     return changed or readme_changed
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent PyPI requests (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Per-request timeout in seconds (default: {DEFAULT_TIMEOUT:g}).",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        help=(
+            "ETag / Last-Modified cache (default: .cache/pypi_versions.json; "
+            "none with --offline)."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch full responses and do not write the cache.",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--index-url",
+        default=PYPI_URL,
+        help="JSON API URL template with a {package} placeholder.",
+    )
+    source.add_argument(
+        "--offline",
+        type=Path,
+        metavar="FIXTURE",
+        help="Serve versions from a {package: version} JSON file on a local server.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
-    changed = sync_version_meta()
+    args = parse_args()
+    cache_path = args.cache_file
+    if cache_path is None and args.offline is None:
+        cache_path = CACHE_PATH
+    if args.no_cache:
+        cache_path = None
+    stats: dict[str, int] = {}
+    options = {
+        "cache_path": cache_path,
+        "workers": args.workers,
+        "timeout": args.timeout,
+        "stats": stats,
+    }
+    if args.offline is not None:
+        from pypi_fixture_server import load_fixture, serve_fixture
+
+        with serve_fixture(load_fixture(args.offline)) as server:
+            changed = sync_version_meta(
+                url_template=server.url_template,
+                cache_index=f"offline:{args.offline.resolve()}",
+                **options,
+            )
+    else:
+        changed = sync_version_meta(url_template=args.index_url, **options)
+
     if changed:
         print("version_meta.json updated")
     else:
         print("version_meta.json already up to date")
+    print(
+        f"  pypi: {stats.get('fetched', 0)} fetched, "
+        f"{stats.get('not_modified', 0)} not modified, "
+        f"{stats.get('connections', 0)} connections"
+    )
 
 
 if __name__ == "__main__":
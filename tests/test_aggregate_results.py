@@ -5,6 +5,8 @@ import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 
 def _valid_entry() -> dict:
     return {
@@ -208,3 +210,296 @@ def test_aggregate_results_fails_on_invalid_schema(tmp_path: Path) -> None:
 
     assert result.returncode != 0
     assert "schema validation failed" in (result.stderr + result.stdout)
+
+
+def _write_standard_export(source_dir: Path, entries: list[dict]) -> None:
+    source_dir.mkdir(parents=True, exist_ok=True)
+    records = []
+    for index, entry in enumerate(entries):
+        artifact_name = f"entry_{index}_leaderboard.json"
+        (source_dir / artifact_name).write_text(
+            json.dumps(entry, indent=2) + "\n", encoding="utf-8"
+        )
+        records.append(
+            {
+                "entry_id": entry["entry_id"],
+                "idempotency_key": entry["metadata"]["idempotency_key"],
+                "canonical_path": entry["canonical_path"],
+                "leaderboard_artifact": artifact_name,
+                "canonical_artifact": f"entry_{index}.canonical.json",
+                "engine": entry["engine"],
+                "workload": entry["workload"]["name"],
+                "config_type": entry["config_type"],
+                "category": "single",
+            }
+        )
+    (source_dir / "leaderboard_manifest.json").write_text(
+        json.dumps(
+            {
+                "schema_version": "leaderboard-export-manifest/v2",
+                "generated_at": "2026-03-14T12:00:00Z",
+                "entries": records,
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+def _run_aggregate(*args: str) -> subprocess.CompletedProcess[str]:
+    script = Path(__file__).resolve().parents[1] / "scripts" / "aggregate_results.py"
+    return subprocess.run(
+        [sys.executable, str(script), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_aggregate_results_incremental_reuses_unchanged_artifacts(
+    tmp_path: Path,
+) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    vllm_entry = _valid_entry()
+    vllm_entry["entry_id"] = "b1b2c3d4-e5f6-7890-abcd-ef1234567890"
+    vllm_entry["engine"] = "vllm"
+    vllm_entry["metadata"]["engine"] = "vllm"
+    vllm_entry["metadata"]["idempotency_key"] = vllm_entry["metadata"][
+        "idempotency_key"
+    ].replace("sagellm|", "vllm|", 1)
+    _write_standard_export(source_dir, [_valid_entry(), vllm_entry])
+    state_file = tmp_path / "state.json"
+    output_dir = tmp_path / "website_data"
+    args = (
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--incremental",
+        "--state-file",
+        str(state_file),
+    )
+
+    first = _run_aggregate(*args)
+    assert first.returncode == 0, first.stderr or first.stdout
+    state = json.loads(state_file.read_text(encoding="utf-8"))
+    assert state["last_run"] == {"artifact_count": 2, "reused": 0, "reloaded": 2}
+    # Only fingerprints and group keys are kept; entries are read back from
+    # the artifacts.
+    assert all(
+        set(fingerprint)
+        == {"mtime_ns", "size", "sha256", "key", "scope", "family", "tab"}
+        for fingerprint in state["artifacts"].values()
+    )
+    written = {
+        path.name: path.stat().st_mtime_ns for path in output_dir.rglob("*.json")
+    }
+
+    second = _run_aggregate(*args)
+    assert second.returncode == 0, second.stderr or second.stdout
+    assert "unchanged since the previous run" in second.stdout
+    state = json.loads(state_file.read_text(encoding="utf-8"))
+    assert state["last_run"] == {"artifact_count": 2, "reused": 2, "reloaded": 0}
+    assert {
+        path.name: path.stat().st_mtime_ns for path in output_dir.rglob("*.json")
+    } == written
+
+    vllm_entry["metrics"]["throughput_tps"] = 42.0
+    (source_dir / "entry_1_leaderboard.json").write_text(
+        json.dumps(vllm_entry) + "\n", encoding="utf-8"
+    )
+    third = _run_aggregate(*args)
+    assert third.returncode == 0, third.stderr or third.stdout
+    state = json.loads(state_file.read_text(encoding="utf-8"))
+    assert state["last_run"] == {"artifact_count": 2, "reused": 1, "reloaded": 1}
+    single_payload = json.loads(
+        (output_dir / "leaderboard_single.json").read_text(encoding="utf-8")
+    )
+    throughput = {
+        item["engine"]: item["metrics"]["throughput_tps"] for item in single_payload
+    }
+    assert throughput == {"sagellm": 100.0, "vllm": 42.0}
+
+
+def _engine_entry(engine: str, index: int) -> dict:
+    entry = _valid_entry()
+    entry["entry_id"] = f"{index:08x}-e5f6-7890-abcd-ef1234567890"
+    entry["engine"] = engine
+    entry["metadata"]["engine"] = engine
+    entry["metadata"]["idempotency_key"] = entry["metadata"]["idempotency_key"].replace(
+        "sagellm|", f"{engine}|", 1
+    )
+    return entry
+
+
+def test_aggregate_results_parallel_jobs_match_serial_output(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    entries = [
+        _engine_entry(engine, index)
+        for index, engine in enumerate(["sagellm", "vllm", "sglang", "lmdeploy"])
+    ]
+    _write_standard_export(source_dir, entries)
+
+    outputs = {}
+    for jobs in ("1", "3"):
+        output_dir = tmp_path / f"out_jobs_{jobs}"
+        result = _run_aggregate(
+            "--source-dir",
+            str(source_dir),
+            "--output-dir",
+            str(output_dir),
+            "--jobs",
+            jobs,
+        )
+        assert result.returncode == 0, result.stderr or result.stdout
+        outputs[jobs] = (output_dir / "leaderboard_single.json").read_bytes()
+
+    assert outputs["1"] == outputs["3"]
+
+
+def test_aggregate_results_parallel_jobs_report_first_invalid_artifact(
+    tmp_path: Path,
+) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    entries = [
+        _engine_entry(engine, index)
+        for index, engine in enumerate(["sagellm", "vllm", "sglang", "lmdeploy"])
+    ]
+    del entries[1]["metrics"]["ttft_ms"]
+    del entries[3]["metrics"]["throughput_tps"]
+    _write_standard_export(source_dir, entries)
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(tmp_path / "out"),
+        "--jobs",
+        "2",
+    )
+
+    assert result.returncode != 0
+    output = result.stderr + result.stdout
+    assert "entry_1_leaderboard.json: schema validation failed" in output
+    assert "entry_3_leaderboard.json" not in output
+
+
+def test_aggregate_results_emits_shard_layout(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    entries = [_engine_entry("sagellm", 0), _engine_entry("vllm", 1)]
+    other_model = _engine_entry("sagellm", 2)
+    other_model["model"]["name"] = "Qwen/Qwen2.5-7B-Instruct"
+    other_model["metadata"]["idempotency_key"] += "|7b"
+    multi_chip = _engine_entry("vllm", 3)
+    multi_chip["hardware"]["chip_count"] = 4
+    multi_chip["config_type"] = "multi_gpu"
+    multi_chip["metadata"]["idempotency_key"] += "|4x"
+    _write_standard_export(source_dir, [*entries, other_model, multi_chip])
+    output_dir = tmp_path / "website_data"
+    stale = output_dir / "shards" / "single-chip" / "stale.json"
+    stale.parent.mkdir(parents=True)
+    stale.write_text("[]\n", encoding="utf-8")
+
+    result = _run_aggregate(
+        "--source-dir", str(source_dir), "--output-dir", str(output_dir)
+    )
+
+    assert result.returncode == 0, result.stderr or result.stdout
+    index = json.loads(
+        (output_dir / "shards" / "index.json").read_text(encoding="utf-8")
+    )
+    assert index["schema_version"] == "leaderboard-shard-index/v1"
+    assert index["entry_count"] == 4
+    assert {tab: item["shard_count"] for tab, item in index["tabs"].items()} == {
+        "single-chip": 2,
+        "multi-chip": 1,
+    }
+    default = next(
+        shard
+        for shard in index["shards"]
+        if shard["path"] == index["tabs"]["single-chip"]["default_shard"]
+    )
+    assert default["engines"] == ["sagellm", "vllm"]
+    assert default["model"] == "Qwen/Qwen2.5-0.5B-Instruct"
+
+    for shard in index["shards"]:
+        payload = json.loads(
+            (output_dir / "shards" / shard["path"]).read_text(encoding="utf-8")
+        )
+        assert len(payload) == shard["entry_count"]
+        assert {item["model"]["name"] for item in payload} == {shard["model"]}
+    assert not stale.exists()
+
+    # Compare groups and display rows are split along the same shards.
+    for name, kind, rows_of in (
+        ("leaderboard_compare.json", "compare", lambda payload: payload["groups"]),
+        (
+            "leaderboard_display.json",
+            "display",
+            lambda payload: [row for rows in payload["tabs"].values() for row in rows],
+        ),
+    ):
+        snapshot = json.loads((output_dir / name).read_text(encoding="utf-8"))
+        split = [
+            item
+            for shard in index["shards"]
+            for item in json.loads(
+                (output_dir / "shards" / shard[f"{kind}_path"]).read_text("utf-8")
+            )
+        ]
+        assert sorted(split, key=json.dumps) == sorted(
+            rows_of(snapshot), key=json.dumps
+        )
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_aggregate_results_profile_and_trace(tmp_path: Path, jobs: str) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    output_dir = tmp_path / "out"
+    trace_path = tmp_path / "trace.json"
+    duplicate = _engine_entry("sagellm", 9)
+    duplicate["metadata"]["submitted_at"] = "2026-03-15T00:00:00Z"
+    entries = [_engine_entry("sagellm", 0), _engine_entry("vllm", 1), duplicate]
+    _write_standard_export(source_dir, entries)
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--jobs",
+        jobs,
+        "--profile",
+        "--trace-out",
+        str(trace_path),
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "Stage profile" in result.stdout
+    assert "duplicates_dropped: 1" in result.stdout
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    counters = trace["otherData"]["counters"]
+    assert counters["entries_validated"] == 3
+    assert counters["duplicates_dropped"] == 1
+    assert counters["compare_groups"] == 1
+    assert counters["bytes_read"] == sum(
+        path.stat().st_size for path in source_dir.iterdir()
+    )
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert [event["name"] for event in spans if event["cat"] == "stage"] == [
+        "discover",
+        "load",
+        "dedup",
+        "compare",
+        "display",
+        "write",
+    ]
+    assert sum(event["cat"] == "manifest" for event in spans) == 1
+    assert sum(event["cat"] == "artifact" for event in spans) == 3
+    assert [stage["name"] for stage in trace["otherData"]["stages"]][:2] == [
+        "discover",
+        "load",
+    ]
+    assert "alloc_peak_bytes" in trace["otherData"]["stages"][1]
+    assert counters["dirs_listed"] == 1
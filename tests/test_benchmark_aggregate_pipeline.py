@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from benchmark_aggregate_pipeline import (  # noqa: E402
+    STAGES,
+    benchmark_tree,
+    compare_to_baseline,
+)
+from generate_rich_data import iter_entries, write_export_tree  # noqa: E402
+
+SCRIPT = ROOT_DIR / "scripts" / "benchmark_aggregate_pipeline.py"
+
+
+def _results(seconds: float, rss: int) -> dict:
+    return {
+        "sizes": {
+            "100": {
+                "entries": 100,
+                "stages": {
+                    "write": {"seconds": seconds, "peak_rss_bytes": rss},
+                    "dedup": {"seconds": 0.001, "peak_rss_bytes": rss},
+                },
+            }
+        }
+    }
+
+
+def test_benchmark_tree_times_every_stage(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    write_export_tree(iter_entries(12, seed=0), source_dir, entries_per_manifest=5)
+
+    result = benchmark_tree(source_dir, tmp_path / "out", precompress=False)
+
+    assert result["entries"] == 12
+    assert tuple(result["stages"]) == STAGES
+    for timing in result["stages"].values():
+        assert timing["seconds"] >= 0
+        assert timing["peak_rss_bytes"] > 0
+    assert json.loads((tmp_path / "out" / "leaderboard_single.json").read_text())
+
+
+def test_compare_to_baseline_flags_slow_and_memory_hungry_stages() -> None:
+    baseline = _results(1.0, 100 * 2**20)
+
+    assert (
+        compare_to_baseline(
+            _results(1.2, 110 * 2**20), baseline, threshold=0.25, rss_threshold=0.25
+        )
+        == []
+    )
+
+    regressions = compare_to_baseline(
+        _results(1.5, 200 * 2**20), baseline, threshold=0.25, rss_threshold=0.25
+    )
+    assert {(item["stage"], item["metric"]) for item in regressions} == {
+        ("write", "seconds"),
+        ("write", "peak_rss_bytes"),
+        ("dedup", "peak_rss_bytes"),
+    }
+    assert (
+        compare_to_baseline(
+            _results(1.5, 1),
+            {"sizes": {"5": baseline["sizes"]["100"]}},
+            threshold=0.25,
+            rss_threshold=0.25,
+        )
+        == []
+    )
+
+
+def test_cli_fails_on_regression_against_stored_baseline(tmp_path: Path) -> None:
+    output = tmp_path / "results.json"
+    baseline = tmp_path / "baseline.json"
+    common = [
+        sys.executable,
+        str(SCRIPT),
+        "--sizes",
+        "8",
+        "--rounds",
+        "1",
+        "--output",
+        str(output),
+        "--baseline",
+        str(baseline),
+    ]
+
+    stored = subprocess.run(
+        [*common, "--update-baseline"], capture_output=True, text=True, check=False
+    )
+    assert stored.returncode == 0, stored.stderr
+    payload = json.loads(baseline.read_text())
+    assert payload["sizes"]["8"]["entries"] == 8
+
+    for timing in payload["sizes"]["8"]["stages"].values():
+        timing["seconds"] = 1e-9
+    baseline.write_text(json.dumps(payload))
+    result = subprocess.run(
+        [*common, "--min-seconds", "0"], capture_output=True, text=True, check=False
+    )
+
+    assert result.returncode == 1, result.stderr
+    assert "stage regression" in result.stdout
+    assert json.loads(output.read_text())["sizes"]["8"]["entries"] == 8
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from columnar_snapshot import (  # noqa: E402
+    decode_columnar,
+    encode_columnar,
+    load_columnar_snapshot,
+)
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _round_trip(entries: list[dict]) -> list[dict]:
+    text = json.dumps(encode_columnar(entries), separators=(",", ":"))
+    return decode_columnar(json.loads(text))
+
+
+@pytest.mark.parametrize("name", ["leaderboard_single.json", "leaderboard_multi.json"])
+def test_columnar_round_trip_checked_in_snapshots(name: str) -> None:
+    raw = (ROOT_DIR / "data" / name).read_text(encoding="utf-8")
+    entries = json.loads(raw)
+
+    decoded = _round_trip(entries)
+
+    assert decoded == entries
+    assert json.dumps(decoded, indent=2, ensure_ascii=False) + "\n" == raw
+
+
+def test_columnar_round_trip_preserves_shape_and_types() -> None:
+    entries = [
+        {"a": 1, "b": {"x": 1.5, "y": "s"}, "c": None, "tags": ["p", "q"], "e": {}},
+        {"b": {"y": "s", "x": 2.0}, "a": 2, "tags": [], "flag": True},
+        {"a": 3, "b": None, "c": 1.0, "mixed": 1},
+        {"a": None, "mixed": True, "e": {"nested": {"deep": 0}}},
+        {},
+    ]
+
+    decoded = _round_trip(entries)
+
+    assert decoded == entries
+    for original, rebuilt in zip(entries, decoded):
+        assert json.dumps(rebuilt) == json.dumps(original)
+    assert type(decoded[2]["c"]) is float
+    assert decoded[3]["mixed"] is True
+    assert decoded[2]["mixed"] == 1 and type(decoded[2]["mixed"]) is int
+
+
+def test_columnar_typed_metric_arrays() -> None:
+    entries = [_engine_entry(engine, index) for index, engine in enumerate("abc")]
+    payload = encode_columnar(entries)
+    columns = {".".join(column["path"]): column for column in payload["columns"]}
+
+    assert columns["metrics.ttft_ms"]["kind"] == "float"
+    assert columns["metrics.ttft_ms"]["values"] == [10.0, 10.0, 10.0]
+    assert columns["hardware.chip_count"]["kind"] == "int"
+    assert columns["engine"]["kind"] == "dict"
+    assert columns["engine"]["dictionary"] == ["a", "b", "c"]
+    assert columns["versions.core"]["codes"] == [0, 0, 0]
+    assert len(payload["shapes"]) == 1
+
+
+def test_decode_columnar_rejects_unknown_schema_version() -> None:
+    with pytest.raises(ValueError, match="unsupported columnar snapshot"):
+        decode_columnar({"schema_version": "leaderboard-columnar/v0"})
+
+
+def test_aggregate_results_columnar_output(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    output_dir = tmp_path / "out"
+    _write_standard_export(
+        source_dir,
+        [
+            _engine_entry(engine, index)
+            for index, engine in enumerate(["sagellm", "vllm"])
+        ],
+    )
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--columnar",
+    )
+
+    assert result.returncode == 0, result.stderr
+    for name in ("single", "multi"):
+        rows = json.loads(
+            (output_dir / f"leaderboard_{name}.json").read_text(encoding="utf-8")
+        )
+        columnar = output_dir / f"leaderboard_{name}.columnar.json"
+        assert load_columnar_snapshot(columnar) == rows
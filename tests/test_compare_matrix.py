@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from aggregate_results import build_compare_snapshot, compute_relative_delta  # noqa: E402
+from compare_matrix import (  # noqa: E402
+    COMPARE_MATRIX_SCHEMA_VERSION,
+    build_compare_matrix_snapshot,
+    delta_matrix,
+    rank_column,
+)
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _engine_entries(metrics_by_engine: dict[str, dict]) -> list[dict]:
+    entries = []
+    for index, (engine, metrics) in enumerate(metrics_by_engine.items()):
+        entry = _engine_entry(engine, index)
+        entry["metrics"].update(metrics)
+        entries.append(entry)
+    return entries
+
+
+def test_rank_column_and_delta_matrix() -> None:
+    values = [10.0, 30.0, None, 30.0, 0.0]
+
+    assert rank_column(values, higher_is_better=True) == [3, 1, None, 1, 4]
+    assert rank_column(values, higher_is_better=False) == [2, 3, None, 3, 1]
+    assert delta_matrix(values) == [
+        [compute_relative_delta(left, right) for right in values] for left in values
+    ]
+
+
+def test_compare_matrix_ranks_every_engine() -> None:
+    entries = _engine_entries(
+        {
+            "vllm": {"throughput_tps": 80.0, "ttft_ms": 20.0, "error_rate": 0.0},
+            "sagellm": {"throughput_tps": 100.0, "ttft_ms": 25.0, "error_rate": 0.0},
+            "sglang": {"throughput_tps": 90.0, "ttft_ms": 15.0, "error_rate": 0.01},
+        }
+    )
+    entries[2]["metrics"].pop("tbt_ms", None)
+
+    snapshot = build_compare_matrix_snapshot(entries)
+
+    assert snapshot["schema_version"] == COMPARE_MATRIX_SCHEMA_VERSION
+    assert snapshot["group_count"] == 1
+    group = snapshot["groups"][0]
+    assert group["engines"] == ["sagellm", "sglang", "vllm"]
+    assert [item["engine"] for item in group["summaries"]] == group["engines"]
+    throughput = group["metrics"]["throughput_tps"]
+    assert throughput["values"] == [100.0, 90.0, 80.0]
+    assert throughput["ranking"] == ["sagellm", "sglang", "vllm"]
+    assert throughput["delta_pct"][0][2] == 25.0
+    assert throughput["delta_pct"][2][0] == -20.0
+    assert group["metrics"]["ttft_ms"]["ranking"] == ["sglang", "vllm", "sagellm"]
+    assert group["metrics"]["error_rate"]["ranks"] == [1, 3, 1]
+    assert group["metrics"]["tbt_ms"]["values"][1] is None
+    assert group["metrics"]["tbt_ms"]["ranks"][1] is None
+    assert "sglang" not in group["metrics"]["tbt_ms"]["ranking"]
+
+    # The v1 snapshot still carries exactly one preferred pair per scope.
+    v1 = build_compare_snapshot(entries)
+    assert v1["schema_version"] == "leaderboard-compare-snapshot/v1"
+    pair = v1["groups"][0]["preferred_pair"]
+    assert (pair["left"]["engine"], pair["right"]["engine"]) == ("sagellm", "vllm")
+
+
+def test_aggregate_results_writes_compare_v2_alongside_v1(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    output_dir = tmp_path / "website_data"
+    _write_standard_export(
+        source_dir,
+        [
+            _engine_entry(engine, index)
+            for index, engine in enumerate(["sagellm", "vllm", "sglang", "lmdeploy"])
+        ],
+    )
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--precompress",
+    )
+
+    assert result.returncode == 0, result.stderr or result.stdout
+    v1 = json.loads((output_dir / "leaderboard_compare.json").read_text("utf-8"))
+    v2 = json.loads((output_dir / "leaderboard_compare_v2.json").read_text("utf-8"))
+    assert v1["schema_version"] == "leaderboard-compare-snapshot/v1"
+    assert v2["schema_version"] == COMPARE_MATRIX_SCHEMA_VERSION
+    assert v2["groups"][0]["engines"] == ["lmdeploy", "sagellm", "sglang", "vllm"]
+    assert all(
+        len(row) == 4
+        for metric in v2["groups"][0]["metrics"].values()
+        for row in metric["delta_pct"]
+    )
+    index = json.loads((output_dir / "snapshot_index.json").read_text("utf-8"))
+    assert "leaderboard_compare_v2.json" in json.dumps(index)
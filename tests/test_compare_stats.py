@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from compare_stats import (  # noqa: E402
+    COMPARE_STATS_SCHEMA_VERSION,
+    build_compare_stats_snapshot,
+    interval_winner,
+    segment_stats,
+)
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _runs(engine: str, throughputs: list[float], *, version: str = "0.5.0") -> list:
+    entries = []
+    for run, tps in enumerate(throughputs):
+        entry = _engine_entry(engine, run)
+        entry["entry_id"] = str(
+            uuid.uuid5(uuid.NAMESPACE_URL, f"{engine}|{version}|{run}")
+        )
+        entry["engine_version"] = version
+        entry["metadata"]["idempotency_key"] += f"|{version}|run{run}"
+        entry["metadata"]["submitted_at"] = f"2026-03-{10 + run:02d}T12:00:00Z"
+        entry["metrics"]["throughput_tps"] = tps
+        entries.append(entry)
+    return entries
+
+
+def test_segment_stats_match_per_segment_numpy() -> None:
+    rng = np.random.default_rng(7)
+    segments = [rng.normal(100, 5, size) for size in (1, 2, 7, 40)]
+
+    result = segment_stats(
+        np.concatenate(segments),
+        np.array([len(values) for values in segments]),
+        resamples=500,
+        confidence=0.9,
+        rng=np.random.default_rng(0),
+    )
+
+    for index, values in enumerate(segments):
+        assert result["mean"][index] == pytest.approx(values.mean())
+        assert result["median"][index] == pytest.approx(np.median(values))
+        if len(values) > 1:
+            assert result["stddev"][index] == pytest.approx(values.std(ddof=1))
+        else:
+            assert np.isnan(result["stddev"][index])
+        assert result["ci_low"][index] <= values.mean() <= result["ci_high"][index]
+    assert result["ci_low"][0] == result["ci_high"][0] == segments[0][0]
+
+
+def test_interval_winner_needs_separated_intervals() -> None:
+    def stats(engine: str, low: float, high: float, runs: int = 5) -> dict:
+        return {
+            "engine": engine,
+            "runs": runs,
+            "mean": (low + high) / 2,
+            "ci_low": low,
+            "ci_high": high,
+        }
+
+    separated = [stats("a", 10, 12), stats("b", 13, 15)]
+    overlapping = [stats("a", 10, 13.5), stats("b", 13, 15)]
+
+    assert interval_winner(separated, higher_is_better=True) == "b"
+    assert interval_winner(separated, higher_is_better=False) == "a"
+    assert interval_winner(overlapping, higher_is_better=True) == "parity"
+    assert interval_winner([stats("a", 10, 12)], higher_is_better=True) == "unknown"
+    assert (
+        interval_winner(
+            [stats("a", 1, 2, runs=1), stats("b", 5, 6)], higher_is_better=True
+        )
+        == "unknown"
+    )
+
+
+def test_compare_stats_reports_parity_for_noise_and_winner_for_gap() -> None:
+    entries = [
+        *_runs("sagellm", [100.0, 100.2, 99.9, 100.1, 99.8]),
+        *_runs("vllm", [100.1, 99.9, 100.0, 100.2, 99.8]),
+        *_runs("sglang", [80.0, 80.5, 79.5, 80.2, 79.8]),
+        # An older release is not pooled with the newest one.
+        *_runs("sglang", [10.0, 11.0], version="0.4.0"),
+    ]
+    entries += entries[:2]
+
+    snapshot = build_compare_stats_snapshot(entries, resamples=400)
+    again = build_compare_stats_snapshot(entries, resamples=400)
+
+    assert snapshot["schema_version"] == COMPARE_STATS_SCHEMA_VERSION
+    assert snapshot["groups"] == again["groups"]
+    group = snapshot["groups"][0]
+    throughput = {
+        item["engine"]: item for item in group["metrics"]["throughput_tps"]["stats"]
+    }
+    assert throughput["sagellm"]["runs"] == 5
+    assert throughput["sglang"]["runs"] == 5
+    assert throughput["sglang"]["engine_version"] == "0.5.0"
+    assert throughput["sglang"]["mean"] == pytest.approx(80.0)
+    assert group["metrics"]["throughput_tps"]["winner"] == "parity"
+
+    gap = build_compare_stats_snapshot(
+        [entry for entry in entries if entry["engine"] != "vllm"], resamples=400
+    )
+    assert gap["groups"][0]["metrics"]["throughput_tps"]["winner"] == "sagellm"
+
+
+def test_aggregate_results_writes_compare_stats(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    output_dir = tmp_path / "website_data"
+    _write_standard_export(
+        source_dir,
+        [*_runs("sagellm", [100.0, 101.0, 99.0]), *_runs("vllm", [50.0, 51.0, 49.0])],
+    )
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--stats",
+        "--bootstrap-resamples",
+        "200",
+    )
+
+    assert result.returncode == 0, result.stderr or result.stdout
+    stats = json.loads((output_dir / "leaderboard_compare_stats.json").read_text())
+    assert stats["bootstrap_resamples"] == 200
+    assert stats["groups"][0]["metrics"]["throughput_tps"]["winner"] == "sagellm"
+    single = json.loads((output_dir / "leaderboard_single.json").read_text())
+    assert len(single) == 6
+
+    for option, value in (("--bootstrap-resamples", "0"), ("--confidence", "1")):
+        rejected = _run_aggregate(
+            "--source-dir", str(source_dir), "--stats", option, value
+        )
+        assert rejected.returncode == 2
+        assert f"{option} must be" in rejected.stderr
+        assert "Traceback" not in rejected.stderr
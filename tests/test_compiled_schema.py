@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from jsonschema import Draft7Validator
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from compiled_schema import (  # noqa: E402
+    FastPathValidator,
+    UnsupportedSchemaError,
+    compile_schema,
+)
+from test_aggregate_results import _valid_entry  # noqa: E402
+
+
+def _schema() -> dict:
+    path = ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _mutations() -> list:
+    def drop(*path: str):
+        def apply(entry: dict) -> None:
+            target = entry
+            for key in path[:-1]:
+                target = target[key]
+            del target[path[-1]]
+
+        return apply
+
+    def put(value, *path: str):
+        def apply(entry: dict) -> None:
+            target = entry
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]] = value
+
+        return apply
+
+    return [
+        drop("metrics", "throughput_tps"),
+        drop("metadata"),
+        drop("hardware", "interconnect"),
+        put("not-a-uuid", "entry_id"),
+        put("Kunlun", "hardware", "vendor"),
+        put(True, "hardware", "chip_count"),
+        put(2.0, "hardware", "chip_count"),
+        put(0, "hardware", "chip_count"),
+        put(1.5, "metrics", "error_rate"),
+        put("12", "metrics", "ttft_ms"),
+        put(None, "metrics", "tbt_ms"),
+        put(12.5, "metrics", "peak_mem_mb"),
+        put("latest", "versions", "core"),
+        put("N/A", "versions", "core"),
+        put({"node_count": 2}, "cluster"),
+        put(
+            {"node_count": 2, "comm_backend": "HCCL", "topology_type": "ring"},
+            "cluster",
+        ),
+        put("yes", "kv_cache_config", "enabled"),
+        put(None, "kv_cache_config"),
+        put([], "workload"),
+        put("extra", "unexpected_field"),
+    ]
+
+
+def test_compiled_check_matches_jsonschema_verdicts() -> None:
+    schema = _schema()
+    generic = Draft7Validator(schema)
+    check = compile_schema(schema)
+
+    candidates = [_valid_entry()]
+    for mutate in _mutations():
+        entry = copy.deepcopy(_valid_entry())
+        mutate(entry)
+        candidates.append(entry)
+    candidates.append(candidates[:3])
+    candidates.append("not-an-entry")
+
+    for candidate in candidates:
+        assert check(candidate) == generic.is_valid(candidate), candidate
+
+
+def test_checked_in_snapshots_take_the_fast_path() -> None:
+    check = compile_schema(_schema())
+    for name in ("leaderboard_single.json", "leaderboard_multi.json"):
+        payload = json.loads((ROOT_DIR / "data" / name).read_text(encoding="utf-8"))
+        assert check(payload)
+        assert all(check(entry) for entry in payload)
+
+
+def test_fast_path_validator_falls_back_to_full_error_report() -> None:
+    schema = _schema()
+    validator = FastPathValidator(schema)
+    invalid = _valid_entry()
+    del invalid["metrics"]["throughput_tps"]
+
+    assert list(validator.iter_errors(_valid_entry())) == []
+    errors = [error.message for error in validator.iter_errors(invalid)]
+    assert errors
+    assert errors == [
+        error.message for error in Draft7Validator(schema).iter_errors(invalid)
+    ]
+
+
+def test_unsupported_keywords_disable_the_fast_path() -> None:
+    schema = {"type": "object", "dependencies": {"x-a": ["x-b"]}}
+    with pytest.raises(UnsupportedSchemaError):
+        compile_schema(schema)
+
+    validator = FastPathValidator(schema)
+    assert validator.check is None
+    assert list(validator.iter_errors({"x-a": 1}))
+
+
+def test_object_keyword_verdicts_match_jsonschema() -> None:
+    schema = {
+        "type": "object",
+        "properties": {"id": {"type": "string"}},
+        "patternProperties": {"^x-": {"type": "integer"}},
+        "additionalProperties": False,
+        "propertyNames": {"maxLength": 4},
+        "minProperties": 1,
+        "maxProperties": 3,
+    }
+    generic = Draft7Validator(schema)
+    check = compile_schema(schema)
+    for candidate in (
+        {},
+        {"id": "a"},
+        {"id": 1},
+        {"x-a": 1},
+        {"x-a": "1"},
+        {"x-abc": 1},
+        {"y": 1},
+        {"id": "a", "x-a": 1, "x-b": 2},
+        {"id": "a", "x-a": 1, "x-b": 2, "x-c": 3},
+    ):
+        assert check(candidate) == generic.is_valid(candidate), candidate
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from functools import cmp_to_key
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from detect_regressions import (  # noqa: E402
+    REGRESSION_METRICS,
+    detect_regressions,
+    version_key,
+)
+from leaderboard_display import compare_versions  # noqa: E402
+from test_aggregate_results import _valid_entry  # noqa: E402
+
+THRESHOLDS = {metric: default for metric, _, default, _ in REGRESSION_METRICS}
+
+
+def _release(version: str, submitted_at: str, **metrics: float) -> dict:
+    entry = _valid_entry()
+    entry["engine_version"] = version
+    entry["metadata"]["engine_version"] = version
+    entry["metadata"]["submitted_at"] = submitted_at
+    entry["metrics"].update(metrics)
+    return entry
+
+
+def test_version_key_matches_compare_versions() -> None:
+    versions = ["0.10.0", "0.9.1", "0.9", "0.9.0.0", "1.0.0.1", "0.5.4.14", "0.5.4.2"]
+
+    by_key = sorted(versions, key=version_key)
+    by_cmp = sorted(versions, key=cmp_to_key(compare_versions))
+
+    assert by_key == by_cmp
+    assert version_key("0.9") == version_key("0.9.0.0")
+
+
+def test_detect_regressions_orders_by_version_and_applies_thresholds() -> None:
+    entries = [
+        # Submitted out of order: versions, not timestamps, set the sequence.
+        _release("0.10.0", "2026-03-01T00:00:00Z", throughput_tps=90.0, ttft_ms=10.5),
+        _release("0.9.0", "2026-03-05T00:00:00Z", throughput_tps=100.0, ttft_ms=10.0),
+        _release(
+            "0.11.0", "2026-02-01T00:00:00Z", throughput_tps=91.0, peak_mem_mb=2048
+        ),
+    ]
+    other_engine = _release("0.1.0", "2026-03-01T00:00:00Z", throughput_tps=1.0)
+    other_engine["engine"] = "vllm"
+    entries.append(other_engine)
+
+    report = detect_regressions(entries, THRESHOLDS)
+
+    assert report["series_count"] == 2
+    assert report["comparison_count"] == 2
+    flagged = {(item["version"], item["metric"]) for item in report["regressions"]}
+    assert flagged == {("0.10.0", "throughput_tps"), ("0.11.0", "peak_mem_mb")}
+    drop = report["regressions"][0]
+    assert (drop["previous_version"], drop["delta_pct"]) == ("0.9.0", -10.0)
+
+    latest = detect_regressions(entries, THRESHOLDS, latest_only=True)
+    assert [item["version"] for item in latest["regressions"]] == ["0.11.0"]
+    relaxed = detect_regressions(
+        entries, {**THRESHOLDS, "throughput_tps": 15.0}, engines={"sagellm"}
+    )
+    assert [item["metric"] for item in relaxed["regressions"]] == ["peak_mem_mb"]
+
+
+def test_detect_regressions_ignores_boolean_and_placeholder_metrics() -> None:
+    entries = [
+        _release("0.9.0", "2026-03-01T00:00:00Z", throughput_tps=True),
+        _release("0.10.0", "2026-03-02T00:00:00Z", throughput_tps=0.5),
+        _release("0.11.0", "2026-03-03T00:00:00Z", throughput_tps=False),
+        # A zero-throughput placeholder run is missing data, not a -100% drop.
+        _release("0.12.0", "2026-03-04T00:00:00Z", throughput_tps=0.5),
+        _release("0.13.0", "2026-03-05T00:00:00Z", throughput_tps=0, ttft_ms=0.0),
+    ]
+
+    assert detect_regressions(entries, THRESHOLDS)["regressions"] == []
+
+
+def test_detect_regressions_cli_exit_status(tmp_path: Path) -> None:
+    snapshot = tmp_path / "leaderboard_single.json"
+    snapshot.write_text(
+        json.dumps(
+            [
+                _release("0.9.0", "2026-03-01T00:00:00Z", throughput_tps=100.0),
+                _release("0.10.0", "2026-03-02T00:00:00Z", throughput_tps=80.0),
+            ]
+        ),
+        encoding="utf-8",
+    )
+    script = ROOT_DIR / "scripts" / "detect_regressions.py"
+
+    def run(*args: str) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [sys.executable, str(script), "--input", str(snapshot), *args],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    failing = run("--output", str(tmp_path / "report.json"))
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    passing = run("--throughput-threshold", "25", "--peak-mem-threshold", "10")
+
+    assert failing.returncode == 1, failing.stderr
+    assert report["regressions"][0]["delta_pct"] == -20.0
+    assert passing.returncode == 0, passing.stderr
+    assert json.loads(passing.stdout)["regression_count"] == 0
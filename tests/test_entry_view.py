@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from aggregate_results import (  # noqa: E402
+    build_compare_snapshot,
+    prefer_newer_entry,
+    split_entries,
+)
+from benchmark_entry_views import (  # noqa: E402
+    measure,
+    reference_prefer_newer_entry,
+    reference_scope_key,
+    reference_split_entries,
+    synthetic_entries,
+)
+from entry_view import (  # noqa: E402
+    EntryView,
+    build_compare_engine_summary,
+    build_compare_scope_key,
+    entry_sort_key,
+)
+from test_aggregate_results import _engine_entry, _valid_entry  # noqa: E402
+
+
+def test_entry_view_fields_match_entry_helpers() -> None:
+    entry = _valid_entry()
+    entry["workload"] = {"input_length": 128, "output_length": 128}
+    entry["metadata"]["notes"] = "formal compare q5 run"
+    entry["cluster"] = {"node_count": 2}
+    view = EntryView(entry)
+
+    assert view.scope_key == reference_scope_key(entry)
+    assert view.scope_key == build_compare_scope_key(entry)
+    assert view.scope["workload"] == "Q5"
+    assert view.node_count == 2
+    assert view.category == "multi"
+    assert view.compare_summary() == build_compare_engine_summary(entry)
+    assert view.compare_summary() is view.compare_summary()
+
+
+def test_split_entries_matches_reference_split() -> None:
+    entries = synthetic_entries(400, seed=3)
+
+    assert split_entries(entries) == reference_split_entries(entries)
+
+
+def test_build_compare_snapshot_accepts_entries_or_views() -> None:
+    entries = [_engine_entry(engine, index) for index, engine in enumerate("ab")]
+
+    from_dicts = build_compare_snapshot(entries)
+    from_views = build_compare_snapshot([EntryView(entry) for entry in entries])
+
+    assert from_dicts["groups"] == from_views["groups"]
+    assert from_dicts["group_count"] == 1
+
+
+def test_benchmark_reference_path_agrees() -> None:
+    entries = synthetic_entries(1500, seed=1)
+    result = measure(entries + entries[:500], rounds=1)
+
+    assert result["entries"] == 2000
+    assert result["deduped"] == 1500
+    assert result["compare_groups"] > 0
+
+
+def _timed_entry(submitted_at: object, tps: object = 10.0, **metadata: object) -> dict:
+    entry = _valid_entry()
+    entry["metadata"]["submitted_at"] = submitted_at
+    entry["metadata"].update(metadata)
+    entry["metrics"]["throughput_tps"] = tps
+    return entry
+
+
+def test_entry_sort_key_matches_reference_prefer_newer_entry() -> None:
+    candidates = [
+        _timed_entry("2026-03-14T12:00:00Z"),
+        _timed_entry("2026-03-14T20:00:00+08:00"),
+        _timed_entry("2026-03-14T12:00:00Z", 12.5),
+        _timed_entry("not-a-date", release_date="2026-03-01"),
+        _timed_entry("", 3.0),
+        _timed_entry(None, None, release_date=None),
+        _timed_entry("2025-12-31T23:59:59Z", 99.0),
+    ]
+
+    for current in candidates:
+        for candidate in candidates:
+            expected = reference_prefer_newer_entry(current, candidate)
+            assert prefer_newer_entry(current, candidate) is expected
+            assert (entry_sort_key(candidate) > entry_sort_key(current)) is (
+                expected is candidate and candidate is not current
+            )
+
+    assert entry_sort_key(candidates[1])[0] == entry_sort_key(candidates[0])[0]
+    assert entry_sort_key(candidates[5]) == (0, 0.0)
+    assert max(candidates, key=entry_sort_key) is candidates[2]
+
+
+def test_split_orders_by_parsed_timestamp() -> None:
+    later = _timed_entry("2026-03-14T12:00:00Z")
+    earlier = _timed_entry("2026-03-14T19:00:00+08:00")
+    for index, entry in enumerate((later, earlier)):
+        entry["metadata"]["idempotency_key"] += f"|{index}"
+
+    single, _ = split_entries([later, earlier])
+
+    assert single == [earlier, later]
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import socket
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from generate_cast import (  # noqa: E402
+    CAST_FIXTURE_VERSION,
+    CAST_TIMING_VERSION,
+    create_cast_file,
+    record_fixture,
+    render_cast,
+    stream_timings,
+)
+from local_openai_server import serve_openai  # noqa: E402
+
+
+def _events(cast_path: Path) -> tuple[dict, list[list]]:
+    lines = cast_path.read_text(encoding="utf-8").splitlines()
+    return json.loads(lines[0]), [json.loads(line) for line in lines[1:]]
+
+
+def test_record_then_replay_without_network(tmp_path: Path) -> None:
+    fixture = tmp_path / "cast_fixture.jsonl"
+    with serve_openai(model="demo-model", ttft_s=0.2, tbt_s=0.05) as server:
+        create_cast_file(
+            str(tmp_path / "live.cast"),
+            base_url=server.base_url,
+            model="demo-model",
+            port=8888,
+            max_tokens=4,
+            record=fixture,
+            stream_chat=True,
+        )
+    assert sorted(path for _, path, _ in server.requests) == [
+        "/health",
+        "/v1/chat/completions",
+        "/v1/models",
+    ]
+
+    # The server is gone: replay only reads the fixture.
+    render_cast(fixture, tmp_path / "replay.cast", port=8888)
+    assert (tmp_path / "replay.cast").read_bytes() == (
+        tmp_path / "live.cast"
+    ).read_bytes()
+
+    header, events = _events(tmp_path / "replay.cast")
+    assert header["version"] == 2
+    times = [event[0] for event in events]
+    assert times == sorted(times)
+    output = "".join(event[2] for event in events)
+    assert '"status": "ok"' in output
+    assert '"id": "demo-model"' in output
+    assert "Hello! I am sageLLM," in output
+
+    tokens = [event for event in events if event[2] in ("Hello!", " I", " am")]
+    # Streamed tokens keep the recorded TTFT / TBT spacing.
+    assert tokens[1][0] - tokens[0][0] >= 0.04
+    chunks = [
+        json.loads(line) for line in fixture.read_text(encoding="utf-8").splitlines()
+    ]
+    assert chunks[0]["fixture"] == CAST_FIXTURE_VERSION
+    assert min(record["t"] for record in chunks if "t" in record) >= 0.2
+
+
+def test_unreachable_service_is_recorded_as_errors(tmp_path: Path) -> None:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    fixture = tmp_path / "offline.jsonl"
+
+    record_fixture(
+        fixture,
+        base_url=f"http://127.0.0.1:{port}",
+        model="m",
+        timeout=2,
+        stream_chat=True,
+    )
+    render_cast(fixture, tmp_path / "offline.cast", port=8888)
+
+    _, events = _events(tmp_path / "offline.cast")
+    assert "".join(event[2] for event in events).count("ERROR:") == 3
+
+
+def test_default_cast_has_no_chat_stream(tmp_path: Path) -> None:
+    timings_path = tmp_path / "demo.timing.json"
+    with serve_openai() as server:
+        timings = create_cast_file(
+            str(tmp_path / "demo.cast"),
+            base_url=server.base_url,
+            model="m",
+            port=8888,
+            timings_path=timings_path,
+        )
+
+    assert sorted(path for _, path, _ in server.requests) == ["/health", "/v1/models"]
+    assert timings is None
+    assert not timings_path.exists()
+    _, events = _events(tmp_path / "demo.cast")
+    output = "".join(event[2] for event in events)
+    assert "curl http://localhost:8888/v1/models" in output
+    assert "chat/completions" not in output
+
+
+def test_render_streams_long_completions(tmp_path: Path) -> None:
+    fixture = tmp_path / "long.jsonl"
+    lines = [
+        {
+            "fixture": CAST_FIXTURE_VERSION,
+            "model": "m",
+            "prompt": "p",
+            "max_tokens": 20000,
+            "recorded_at": 0,
+        },
+        {"endpoint": "health", "body": "{}"},
+        {"endpoint": "models", "body": "{}"},
+        {"endpoint": "chat", "status": 200},
+    ]
+    lines += [
+        {
+            "endpoint": "chat",
+            "t": index * 0.001,
+            "data": json.dumps({"choices": [{"delta": {"content": f" tok{index}"}}]}),
+        }
+        for index in range(20000)
+    ]
+    fixture.write_text(
+        "".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8"
+    )
+
+    tracemalloc.start()
+    render_cast(fixture, tmp_path / "long.cast", port=8888)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert sum(1 for _ in (tmp_path / "long.cast").open()) > 20000
+    # Only the chunk offsets for the timing percentiles are kept (~32 B per
+    # chunk); buffering the 20k events themselves took about 3.4 MiB.
+    assert peak < 2 << 20
+
+
+def test_stream_timings_sidecar_matches_server_pacing(tmp_path: Path) -> None:
+    timings_path = tmp_path / "demo.timing.json"
+    with serve_openai(ttft_s=0.15, tbt_s=0.04) as server:
+        timings = create_cast_file(
+            str(tmp_path / "demo.cast"),
+            base_url=server.base_url,
+            model="m",
+            port=8888,
+            max_tokens=6,
+            timings_path=timings_path,
+            stream_chat=True,
+        )
+
+    sidecar = json.loads(timings_path.read_text(encoding="utf-8"))
+    assert sidecar["schema_version"] == CAST_TIMING_VERSION
+    assert sidecar["cast"] == "demo.cast"
+    assert sidecar["chunks"] == timings["chunks"] == 6
+    assert 150 <= sidecar["ttft_ms"] < 1000
+    assert 35 <= sidecar["tbt_p50_ms"] < 500
+    assert sidecar["tbt_p90_ms"] <= sidecar["tbt_max_ms"]
+
+    _, events = _events(tmp_path / "demo.cast")
+    summary = [event[2] for event in events if "TTFT" in event[2]]
+    assert summary == [
+        f"⏱️  TTFT {sidecar['ttft_ms']:.1f} ms · TBT {sidecar['tbt_ms']:.1f} ms"
+        " · 6 chunks\r\n"
+    ]
+
+    assert stream_timings([0.5, 0.6, 0.8, 0.9]) == {
+        "chunks": 4,
+        "ttft_ms": 500.0,
+        "total_ms": 900.0,
+        "tbt_ms": 133.333,
+        "tbt_p50_ms": 100.0,
+        "tbt_p90_ms": 200.0,
+        "tbt_max_ms": 200.0,
+        "decode_tps": 7.5,
+    }
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from aggregate_results import load_schema  # noqa: E402
+from generate_rich_data import ENGINES, iter_entries, iter_sweep  # noqa: E402
+from jsonschema import Draft7Validator  # noqa: E402
+from test_aggregate_results import _run_aggregate  # noqa: E402
+
+SCRIPT = ROOT_DIR / "scripts" / "generate_rich_data.py"
+
+
+def _generate(output_dir: Path, *args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(SCRIPT), "--output-dir", str(output_dir), *args],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def _tree(root: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_iter_entries_are_schema_valid_and_unique() -> None:
+    validator = Draft7Validator(
+        load_schema(ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json")
+    )
+    sweep = sum(1 for _ in iter_sweep(["single_chip", "multi_node"], ["sagellm"]))
+    entries = list(
+        iter_entries(
+            sweep + 5,
+            seed=1,
+            categories=["single_chip", "multi_node"],
+            engines=["sagellm"],
+        )
+    )
+
+    for entry in entries:
+        errors = sorted(validator.iter_errors(entry), key=lambda error: error.path)
+        assert not errors, errors[0].message
+    keys = [entry["metadata"]["idempotency_key"] for entry in entries]
+    assert len(set(keys)) == len(keys)
+    assert keys[sweep].endswith("|run1")
+    assert {entry["engine"] for entry in entries} == {"sagellm"}
+
+
+def test_generated_tree_is_reproducible_and_aggregates(tmp_path: Path) -> None:
+    args = ("--entries", "120", "--entries-per-manifest", "50", "--seed", "7")
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+
+    assert _generate(first, *args).returncode == 0
+    assert _generate(second, *args).returncode == 0
+    assert _tree(first) == _tree(second)
+    assert len(list(first.glob("batch_*/leaderboard_manifest.json"))) == 3
+
+    other = tmp_path / "other"
+    assert _generate(other, "--entries", "120", "--seed", "8").returncode == 0
+    assert _tree(other) != _tree(first)
+
+    output_dir = tmp_path / "out"
+    result = _run_aggregate("--source-dir", str(first), "--output-dir", str(output_dir))
+
+    assert result.returncode == 0, result.stderr
+    single = json.loads((output_dir / "leaderboard_single.json").read_text())
+    multi = json.loads((output_dir / "leaderboard_multi.json").read_text())
+    assert len(single) + len(multi) == 120
+    assert {entry["engine"] for entry in single} == set(ENGINES)
+
+
+def test_generate_refuses_to_mix_with_previous_run(tmp_path: Path) -> None:
+    assert _generate(tmp_path, "--entries", "3").returncode == 0
+
+    result = _generate(tmp_path, "--entries", "2")
+    assert result.returncode != 0
+    assert "--force" in result.stderr
+
+    assert _generate(tmp_path, "--entries", "2", "--force").returncode == 0
+    manifest = json.loads(
+        (tmp_path / "batch_000000" / "leaderboard_manifest.json").read_text()
+    )
+    assert len(manifest["entries"]) == 2
+
+
+def test_concurrency_sweep_and_repeat_runs_feed_scaling_and_histograms(
+    tmp_path: Path,
+) -> None:
+    validator = Draft7Validator(
+        load_schema(ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json")
+    )
+    options = {
+        "categories": ["single_chip"],
+        "engines": ["sagellm"],
+        "concurrency": [1, 4, 16],
+        "repeat_runs": 2,
+        "latency_histograms": True,
+    }
+    entries = list(iter_entries(12, seed=2, **options))
+
+    for entry in entries:
+        errors = sorted(validator.iter_errors(entry), key=lambda error: error.path)
+        assert not errors, errors[0].message
+    levels = [entry["workload"]["concurrent_requests"] for entry in entries[:6]]
+    assert levels == [1, 1, 4, 4, 16, 16]
+    keys = [entry["metadata"]["idempotency_key"] for entry in entries[:6]]
+    assert keys[0] == keys[1] and keys[2] == keys[3] and keys[2].endswith("|c4")
+    assert len(set(keys)) == 3
+    metrics = entries[0]["metrics"]
+    assert metrics["latency_histograms"]["ttft_ms"]["count"] == 64
+    assert metrics["ttft_p50_ms"] <= metrics["ttft_p99_ms"]
+
+    source_dir = tmp_path / "export"
+    result = _generate(
+        source_dir,
+        "--entries",
+        "96",
+        "--categories",
+        "single_chip",
+        "--engines",
+        "sagellm",
+        "--concurrency",
+        "1,4,16",
+        "--repeat-runs",
+        "2",
+        "--latency-histograms",
+    )
+    assert result.returncode == 0, result.stderr
+    output_dir = tmp_path / "out"
+    result = _run_aggregate(
+        "--source-dir", str(source_dir), "--output-dir", str(output_dir)
+    )
+    assert result.returncode == 0, result.stderr
+    scaling = json.loads((output_dir / "leaderboard_scaling.json").read_text())
+    # 16 (scope, version) combinations; each scope's curve keeps its newest
+    # of the 4 versions.
+    assert scaling["curve_count"] == 4
+    assert {len(curve["points"]) for curve in scaling["curves"]} == {3}
+    single = json.loads((output_dir / "leaderboard_single.json").read_text())
+    assert len(single) == 48
+    assert {entry["metrics"]["latency_histogram_runs"] for entry in single} == {2}
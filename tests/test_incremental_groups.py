@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+import re
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from generate_rich_data import iter_entries, write_export_tree  # noqa: E402
+from test_aggregate_results import _run_aggregate  # noqa: E402
+
+GROUPED_SNAPSHOTS = (
+    "leaderboard_compare.json",
+    "leaderboard_compare_v2.json",
+    "leaderboard_scaling.json",
+    "leaderboard_display.json",
+)
+
+
+def _snapshots(output_dir: Path) -> dict[str, dict]:
+    snapshots = {}
+    for name in GROUPED_SNAPSHOTS:
+        payload = json.loads((output_dir / name).read_text(encoding="utf-8"))
+        payload.pop("generated_at")
+        snapshots[name] = payload
+    return snapshots
+
+
+def test_incremental_run_rebuilds_only_changed_groups(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    entries = list(
+        iter_entries(160, seed=9, categories=["single_chip"], concurrency=[1, 8])
+    )
+    write_export_tree(entries[:128], source_dir, entries_per_manifest=32)
+    args = (
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(tmp_path / "incremental"),
+        "--incremental",
+        "--state-file",
+        str(tmp_path / "state.json"),
+    )
+    first = _run_aggregate(*args)
+    assert first.returncode == 0, first.stderr or first.stdout
+
+    # One artifact corrected in place, one batch added.
+    artifact = source_dir / "batch_000000" / "000000000_leaderboard.json"
+    entry = json.loads(artifact.read_text(encoding="utf-8"))
+    entry["metrics"]["throughput_tps"] *= 3
+    artifact.write_text(json.dumps(entry, indent=2) + "\n", encoding="utf-8")
+    write_export_tree(entries[128:], source_dir / "more", entries_per_manifest=32)
+
+    second = _run_aggregate(*args)
+    assert second.returncode == 0, second.stderr or second.stdout
+    scopes, families, tabs = map(
+        int,
+        re.search(
+            r"rebuilt groups: (\d+) scopes, (\d+) scaling families, (\d+) tabs",
+            second.stdout,
+        ).groups(),
+    )
+    state = json.loads((tmp_path / "state.json").read_text(encoding="utf-8"))
+    fingerprints = state["artifacts"].values()
+    assert 0 < scopes < len({item["scope"] for item in fingerprints})
+    assert 0 < families < len({item["family"] for item in fingerprints})
+    assert tabs == 1
+
+    full = _run_aggregate(
+        "--source-dir", str(source_dir), "--output-dir", str(tmp_path / "full")
+    )
+    assert full.returncode == 0, full.stderr or full.stdout
+    assert _snapshots(tmp_path / "incremental") == _snapshots(tmp_path / "full")
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import math
+import random
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from aggregate_results import split_entries  # noqa: E402
+from latency_histogram import (  # noqa: E402
+    build_histogram,
+    histogram_percentile,
+    merge_histograms,
+    percentile_fields,
+)
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _exact(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def test_percentiles_stay_within_bucket_precision() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1) for _ in range(5000)]
+    histogram = build_histogram(values)
+
+    assert histogram["count"] == 5000
+    assert sum(histogram["buckets"].values()) == 5000
+    # 5000 samples spread over ~2^17 us fit in a few hundred buckets.
+    assert len(histogram["buckets"]) < 400
+    for q in (50, 90, 99, 100):
+        exact = _exact(values, q)
+        assert exact - 0.001 <= histogram_percentile(histogram, q)
+        assert histogram_percentile(histogram, q) <= exact * (1 + 2**-5) + 0.001
+    assert histogram_percentile(histogram, 100) == round(max(values), 3)
+    assert histogram_percentile(build_histogram([]), 99) is None
+
+
+def test_merge_equals_histogram_of_all_samples() -> None:
+    rng = random.Random(11)
+    first = [rng.uniform(1, 500) for _ in range(300)]
+    second = [rng.uniform(100, 900) for _ in range(200)]
+
+    assert merge_histograms([build_histogram(first), build_histogram(second)]) == (
+        build_histogram(first + second)
+    )
+    # A coarser run pulls the merged grid down to its precision.
+    mixed = merge_histograms([build_histogram(first), build_histogram(second, 3)])
+    assert mixed == build_histogram(first + second, 3)
+    assert merge_histograms([None, {}]) is None
+
+    fields = percentile_fields({"ttft_ms": build_histogram(first)})
+    assert sorted(fields) == ["ttft_p50_ms", "ttft_p90_ms", "ttft_p99_ms"]
+
+
+def _run(engine: str, index: int, ttfts: list[float], submitted_at: str) -> dict:
+    entry = _engine_entry(engine, index)
+    entry["metadata"]["submitted_at"] = submitted_at
+    histograms = {"ttft_ms": build_histogram(ttfts), "tbt_ms": build_histogram([2.0])}
+    entry["metrics"].update(percentile_fields(histograms))
+    entry["metrics"]["latency_histograms"] = histograms
+    return entry
+
+
+def test_aggregate_merges_repeat_runs_and_compares_p99(tmp_path: Path) -> None:
+    sagellm_runs = [[8.191] * 97 + [32.767] * 3, [8.191] * 99 + [90.0]]
+    entries = [
+        _run("sagellm", 0, sagellm_runs[0], "2026-03-14T12:00:00Z"),
+        _run("sagellm", 1, sagellm_runs[1], "2026-03-15T12:00:00Z"),
+        _run("vllm", 2, [12.0] * 100, "2026-03-14T12:00:00Z"),
+    ]
+    source_dir = tmp_path / "benchmark_outputs"
+    _write_standard_export(source_dir, entries)
+    artifact = source_dir / "entry_1_leaderboard.json"
+    before = artifact.read_bytes()
+
+    outputs = []
+    for mode in ((), ("--stream",)):
+        output_dir = tmp_path / f"out{len(mode)}"
+        result = _run_aggregate(
+            "--source-dir", str(source_dir), "--output-dir", str(output_dir), *mode
+        )
+        assert result.returncode == 0, result.stderr or result.stdout
+        outputs.append((output_dir / "leaderboard_single.json").read_bytes())
+    assert outputs[0] == outputs[1]
+    assert artifact.read_bytes() == before
+
+    single = {entry["engine"]: entry for entry in json.loads(outputs[0])}
+    merged = single["sagellm"]["metrics"]
+    assert single["sagellm"]["entry_id"] == entries[1]["entry_id"]
+    assert merged["latency_histogram_runs"] == 2
+    assert merged["latency_histograms"]["ttft_ms"] == build_histogram(
+        sagellm_runs[0] + sagellm_runs[1]
+    )
+    # The kept run alone has an 8 ms p99; pooled, the older run's tail shows.
+    # Both samples sit at the top of their buckets, so the bounds are exact.
+    assert merged["ttft_p99_ms"] == 32.767
+    assert merged["ttft_p50_ms"] == 8.191
+    assert "latency_histogram_runs" not in single["vllm"]["metrics"]
+
+    compare = json.loads((tmp_path / "out0" / "leaderboard_compare.json").read_text())
+    pair = compare["preferred_pairs"][0]["preferred_pair"]
+    assert pair["left"]["metrics"]["ttft_p99_ms"] == 32.767
+    assert pair["right"]["metrics"]["ttft_p99_ms"] == 12.0
+    assert pair["deltas"]["ttft_p99_pct_left_vs_right"] == 173.0583
+    assert pair["winners"]["ttft_p99"] == "right"
+    assert pair["winners"]["tbt_p99"] == "parity"
+
+    matrix = json.loads((tmp_path / "out0" / "leaderboard_compare_v2.json").read_text())
+    ttft_p99 = matrix["groups"][0]["metrics"]["ttft_p99_ms"]
+    assert matrix["groups"][0]["engines"] == ["sagellm", "vllm"]
+    assert ttft_p99["values"] == [32.767, 12.0]
+    assert ttft_p99["ranking"] == ["vllm", "sagellm"]
+
+
+def test_dedup_folds_each_run_once_as_it_streams() -> None:
+    first = _run("sagellm", 0, [5.0, 6.0], "2026-03-14T12:00:00Z")
+    again = _run("sagellm", 0, [5.0, 6.0], "2026-03-14T12:00:00Z")
+    anonymous = _run("sagellm", 1, [7.0], "2026-03-13T12:00:00Z")
+    del anonymous["entry_id"]
+    newest = _run("sagellm", 2, [9.0], "2026-03-15T12:00:00Z")
+
+    # The same entry_id listed twice is one run; a run without entry_id
+    # still counts.
+    (kept,), _ = split_entries(iter([first, again, anonymous, newest]))
+    metrics = kept["metrics"]
+    assert kept["entry_id"] == newest["entry_id"]
+    assert metrics["latency_histogram_runs"] == 3
+    assert metrics["latency_histograms"]["ttft_ms"] == build_histogram(
+        [5.0, 6.0, 7.0, 9.0]
+    )
+    assert "latency_histogram_runs" not in newest["metrics"]
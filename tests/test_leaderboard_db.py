@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from generate_rich_data import iter_entries, write_export_tree  # noqa: E402
+from leaderboard_db import open_db, query_entries, upsert_entries  # noqa: E402
+from test_aggregate_results import _run_aggregate, _valid_entry  # noqa: E402
+
+
+def _aggregate(source_dir: Path, tmp_path: Path, *args: str) -> str:
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(tmp_path / "out"),
+        "--sqlite-out",
+        str(tmp_path / "leaderboard.sqlite"),
+        "--no-shards",
+        *args,
+    )
+    assert result.returncode == 0, result.stderr or result.stdout
+    return re.search(r"leaderboard\.sqlite: (.*)", result.stdout).group(1)
+
+
+def test_upsert_keeps_newest_run_per_idempotency_key(tmp_path: Path) -> None:
+    older, newer = _valid_entry(), _valid_entry()
+    newer["metadata"]["submitted_at"] = "2026-03-15T12:00:00Z"
+    newer["metrics"]["throughput_tps"] = 120.0
+    conn = open_db(tmp_path / "leaderboard.sqlite")
+
+    upsert_entries(conn, [newer, older])
+    rows = query_entries(conn)
+
+    assert len(rows) == 1
+    assert rows[0]["throughput_tps"] == 120.0
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 1
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(entries)")}
+    assert {"entries_scope_key", "entries_engine", "entries_submitted_at"} <= indexes
+    conn.close()
+
+
+def test_sqlite_out_indexes_aggregated_entries(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    write_export_tree(
+        iter_entries(96, seed=3, categories=["single_chip"]),
+        source_dir,
+        entries_per_manifest=32,
+    )
+
+    assert _aggregate(source_dir, tmp_path).startswith("96 upserted (full), 96 rows")
+
+    conn = sqlite3.connect(tmp_path / "leaderboard.sqlite")
+    conn.row_factory = sqlite3.Row
+    best = query_entries(conn, engine="sagellm", best="throughput_tps")
+    all_sagellm = query_entries(conn, engine="sagellm", limit=1000)
+    assert {row["engine_version"] for row in best} == {
+        row["engine_version"] for row in all_sagellm
+    }
+    for row in best:
+        assert row["throughput_tps"] == max(
+            item["throughput_tps"]
+            for item in all_sagellm
+            if item["engine_version"] == row["engine_version"]
+        )
+    conn.close()
+
+    cli = subprocess.run(
+        [
+            sys.executable,
+            str(ROOT_DIR / "scripts" / "leaderboard_db.py"),
+            "--db",
+            str(tmp_path / "leaderboard.sqlite"),
+            "--engine",
+            "sagellm",
+            "--best",
+            "throughput_tps",
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert cli.returncode == 0, cli.stderr
+    assert cli.stdout.strip().endswith(f"{len(best)} rows")
+
+
+def test_incremental_sqlite_upserts_only_new_artifacts(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    entries = list(iter_entries(60, seed=5, categories=["single_chip"]))
+    write_export_tree(entries[:40], source_dir, entries_per_manifest=20)
+
+    assert _aggregate(source_dir, tmp_path, "--incremental").startswith(
+        "40 upserted (full)"
+    )
+    assert _aggregate(source_dir, tmp_path, "--incremental").startswith(
+        "0 upserted (incremental), 40 rows"
+    )
+
+    write_export_tree(entries[40:], source_dir / "more", entries_per_manifest=20)
+    assert _aggregate(source_dir, tmp_path, "--incremental").startswith(
+        "20 upserted (incremental), 60 rows"
+    )
+
+    # A database that missed a run is rebuilt from every entry.
+    (tmp_path / "leaderboard.sqlite").unlink()
+    assert _aggregate(source_dir, tmp_path, "--incremental").startswith(
+        "60 upserted (full), 60 rows"
+    )
+
+
+def test_artifact_corrected_in_place_refreshes_its_row(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    entries = list(iter_entries(20, seed=7, categories=["single_chip"]))
+    write_export_tree(entries, source_dir, entries_per_manifest=20)
+    assert _aggregate(source_dir, tmp_path, "--incremental").startswith(
+        "20 upserted (full)"
+    )
+
+    # Same idempotency key, submitted_at and throughput: only ttft changes.
+    artifact = source_dir / "batch_000000" / "000000000_leaderboard.json"
+    entry = json.loads(artifact.read_text(encoding="utf-8"))
+    entry["metrics"]["ttft_ms"] = 12345.0
+    artifact.write_text(json.dumps(entry, indent=2) + "\n", encoding="utf-8")
+    assert _aggregate(source_dir, tmp_path, "--incremental").startswith(
+        "1 upserted (incremental), 20 rows"
+    )
+
+    conn = sqlite3.connect(tmp_path / "leaderboard.sqlite")
+    conn.row_factory = sqlite3.Row
+    (row,) = conn.execute(
+        "SELECT ttft_ms, entry_json FROM entries WHERE idempotency_key = ?",
+        (entry["metadata"]["idempotency_key"],),
+    ).fetchall()
+    conn.close()
+    assert row["ttft_ms"] == 12345.0
+    assert json.loads(row["entry_json"])["metrics"]["ttft_ms"] == 12345.0
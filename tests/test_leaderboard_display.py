@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import copy
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from leaderboard_display import (  # noqa: E402
+    aggregate_version_builds,
+    build_display_snapshot,
+)
+from test_aggregate_results import _valid_entry  # noqa: E402
+
+JS_FUNCTIONS = (
+    "getWorkloadId",
+    "normalizeWorkloadId",
+    "compareByReleaseDateDesc",
+    "normalizeDisplayVersion",
+    "getEngine",
+    "getEngineVersion",
+    "getDisplayVersion",
+    "isNumericVersion",
+    "compareDisplayVersions",
+    "compareEntriesByVersionDesc",
+    "createAggregationKey",
+    "compareEntryQuality",
+    "aggregateVersionBuilds",
+    "sortForDisplay",
+    "buildTrendRows",
+    "calculateTrends",
+    "compareVersions",
+    "setDisplaySnapshot",
+    "getDisplayLookup",
+    "getPrecomputedDisplayRows",
+)
+
+NODE_HARNESS = """
+const state = { currentTab: 'single-chip', displaySnapshot: null, displayLookups: {} };
+%(functions)s
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const summarize = (rows) => rows.map((row) => ({
+    entry_id: row.entry_id,
+    display_version: row.displayVersion,
+    variants: row.versionVariants.map((variant) => variant.entry_id),
+    trends: row.trends,
+    is_baseline: row.isBaseline,
+}));
+setDisplaySnapshot(input.snapshot);
+const views = input.views.map(({ ids, workload }) => {
+    const visible = input.entries.filter((entry) => ids.includes(entry.entry_id));
+    visible.sort(compareEntriesByVersionDesc);
+    const live = sortForDisplay(aggregateVersionBuilds(visible), workload);
+    const precomputed = getPrecomputedDisplayRows(visible, workload);
+    return {
+        live: summarize(buildTrendRows(live, workload)),
+        precomputed: precomputed && summarize(
+            precomputed.withTrends || buildTrendRows(precomputed.sortedEntries, workload)
+        ),
+    };
+});
+process.stdout.write(JSON.stringify(views));
+"""
+
+
+def _extract_js_functions() -> str:
+    source = (ROOT_DIR / "assets" / "leaderboard.js").read_text(encoding="utf-8")
+    blocks = []
+    for name in JS_FUNCTIONS:
+        match = re.search(
+            rf"^    function {name}\(.*?^    \}}$", source, re.MULTILINE | re.DOTALL
+        )
+        assert match, f"{name} not found in leaderboard.js"
+        blocks.append(match.group(0))
+    return "\n".join(blocks)
+
+
+def _build_entry(
+    index: int, engine: str, version: str, workload: str, **metrics: float
+) -> dict:
+    entry = copy.deepcopy(_valid_entry())
+    entry["entry_id"] = f"{index:08x}-e5f6-7890-abcd-ef1234567890"
+    entry["engine"] = engine
+    entry["engine_version"] = version
+    entry["workload"]["name"] = workload
+    entry["metadata"]["engine"] = engine
+    entry["metadata"]["engine_version"] = version
+    entry["metadata"]["release_date"] = f"2026-01-{index % 28 + 1:02d}"
+    entry["metrics"].update(metrics)
+    return entry
+
+
+def _entries() -> list[dict]:
+    return [
+        # Four 0.6.0.x builds: throughput tie between 1 and 2 is broken by TTFT.
+        _build_entry(1, "sagellm", "0.6.0.1", "Q1", throughput_tps=120.0, ttft_ms=9.0),
+        _build_entry(2, "sagellm", "0.6.0.2", "Q1", throughput_tps=120.0, ttft_ms=8.0),
+        _build_entry(3, "sagellm", "0.6.0.3", "Q1", throughput_tps=90.0),
+        _build_entry(4, "sagellm", "0.6.0.4", "Q1", throughput_tps=0.0, ttft_ms=0.0),
+        _build_entry(5, "sagellm", "0.5.4.9", "Q1", throughput_tps=100.0),
+        _build_entry(6, "sagellm", "0.5.3.1", "Q1", throughput_tps=80.0),
+        _build_entry(7, "vllm", "0.17.0", "Q1", throughput_tps=110.0),
+        _build_entry(8, "vllm", "0.16.2", "Q1", throughput_tps=95.0),
+        _build_entry(9, "sagellm", "0.6.0.5", "Q2", throughput_tps=50.0),
+        _build_entry(
+            10, "sagellm", "0.6.0.6", "Q2", throughput_tps=50.0, error_rate=0.1
+        ),
+        _build_entry(11, "vllm", "nightly", "Q2", throughput_tps=40.0),
+    ]
+
+
+def test_display_snapshot_best_variant_selection() -> None:
+    entries = _entries()
+    ordered = sorted(entries, key=lambda entry: entry["entry_id"])
+    merged = aggregate_version_builds(ordered)
+    best = {
+        row["displayVersion"]: row
+        for row in merged
+        if row["engine"] == "sagellm" and row["workload"]["name"] == "Q1"
+    }
+
+    assert best["0.6.0.x"]["entry_id"].startswith("00000002")
+    assert [item["entry_id"][:8] for item in best["0.6.0.x"]["versionVariants"]] == [
+        "00000002",
+        "00000001",
+        "00000003",
+        "00000004",
+    ]
+
+    snapshot = build_display_snapshot(entries)
+    rows = snapshot["tabs"]["single-chip"]
+    assert snapshot["row_count"] == len(rows) == 7
+    assert sorted(row["rank"]["all"] for row in rows) == list(range(len(rows)))
+
+    q1_sagellm = sorted(
+        (row for row in rows if row["series"].startswith("sagellm|Q1|")),
+        key=lambda row: row["rank"]["workload"],
+    )
+    assert [row["display_version"] for row in q1_sagellm] == [
+        "0.6.0.x",
+        "0.5.4.x",
+        "0.5.3.x",
+    ]
+    assert q1_sagellm[0]["trends"]["throughput_tps"] == pytest.approx(20.0)
+    assert q1_sagellm[0]["baseline_trends"]["throughput_tps"] == pytest.approx(50.0)
+    assert q1_sagellm[-1]["is_baseline"] is True
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_display_snapshot_matches_leaderboard_js() -> None:
+    entries = _entries()
+    snapshot = json.loads(json.dumps(build_display_snapshot(entries)))
+    all_ids = [entry["entry_id"] for entry in entries]
+    q1_ids = [
+        entry["entry_id"] for entry in entries if entry["workload"]["name"] == "Q1"
+    ]
+    sagellm_q1 = [
+        entry["entry_id"]
+        for entry in entries
+        if entry["workload"]["name"] == "Q1" and entry["engine"] == "sagellm"
+    ]
+    views = [
+        {"ids": all_ids, "workload": "all"},
+        {"ids": q1_ids, "workload": "Q1"},
+        {"ids": sagellm_q1, "workload": "Q1"},
+        # A partially visible build group must fall back to live aggregation.
+        {"ids": sagellm_q1[1:], "workload": "Q1"},
+    ]
+
+    script = NODE_HARNESS % {"functions": _extract_js_functions()}
+    result = subprocess.run(
+        ["node", "-e", script],
+        input=json.dumps({"entries": entries, "snapshot": snapshot, "views": views}),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    outcomes = json.loads(result.stdout)
+
+    for outcome in outcomes[:3]:
+        assert outcome["precomputed"] is not None
+        assert outcome["precomputed"] == outcome["live"]
+    assert outcomes[3]["precomputed"] is None
+
+    python_rows = {row["entry_id"]: row for row in snapshot["tabs"]["single-chip"]}
+    for row in outcomes[0]["live"]:
+        assert row["entry_id"] in python_rows
+        assert python_rows[row["entry_id"]]["variants"] == row["variants"]
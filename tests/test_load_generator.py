@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+import local_openai_server  # noqa: E402
+from load_generator import MANIFEST_NAME, _iter_body, main  # noqa: E402
+from local_openai_server import serve_openai  # noqa: E402
+from test_aggregate_results import _run_aggregate  # noqa: E402
+
+
+def _artifacts(output_dir: Path) -> list[dict]:
+    manifest = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    # Every file a record names must exist; no canonical artifact is written.
+    assert all("canonical_artifact" not in record for record in manifest["entries"])
+    return [
+        json.loads(
+            (output_dir / record["leaderboard_artifact"]).read_text(encoding="utf-8")
+        )
+        for record in manifest["entries"]
+    ]
+
+
+def test_load_generator_exports_artifacts_that_aggregate(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # The server's request log is bounded; the count still covers every request.
+    monkeypatch.setattr(local_openai_server, "REQUEST_LOG_SIZE", 4)
+    output_dir = tmp_path / "benchmark_outputs" / "local"
+    with serve_openai(ttft_s=0.05, tbt_s=0.01) as server:
+        exit_code = main(
+            [
+                "--base-url",
+                server.base_url,
+                "--concurrency",
+                "1,4",
+                "--requests",
+                "8",
+                "--output-length",
+                "5",
+                "--engine-version",
+                "0.6.1",
+                "--output-dir",
+                str(output_dir),
+            ]
+        )
+    assert exit_code == 0
+    assert server.request_count == 16
+    assert len(server.requests) == 4
+
+    serial, parallel = _artifacts(output_dir)
+    for entry in (serial, parallel):
+        metrics = entry["metrics"]
+        assert metrics["error_rate"] == 0.0
+        assert 50 <= metrics["ttft_ms"] < 1000
+        assert 8 <= metrics["tbt_ms"] < 500
+        assert metrics["tpot_ms"] >= 8
+        assert metrics["latency_histograms"]["ttft_ms"]["count"] == 8
+        assert metrics["ttft_p50_ms"] <= metrics["ttft_p99_ms"]
+    assert serial["workload"]["concurrent_requests"] == 1
+    assert parallel["workload"]["name"] == "local_c4"
+    # Four streams overlap their waits, so aggregate throughput rises.
+    assert (
+        parallel["metrics"]["throughput_tps"] > 2 * serial["metrics"]["throughput_tps"]
+    )
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(tmp_path / "benchmark_outputs"),
+        "--output-dir",
+        str(tmp_path / "out"),
+    )
+    assert result.returncode == 0, result.stderr or result.stdout
+    single = json.loads((tmp_path / "out" / "leaderboard_single.json").read_text())
+    assert sorted(entry["workload"]["name"] for entry in single) == [
+        "local_c1",
+        "local_c4",
+    ]
+
+
+def test_levels_where_every_request_fails_write_no_artifact(tmp_path: Path) -> None:
+    with serve_openai() as server:
+        exit_code = main(
+            [
+                "--base-url",
+                f"{server.base_url}/missing",
+                "--requests",
+                "3",
+                "--output-dir",
+                str(tmp_path),
+            ]
+        )
+    assert exit_code == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_chunked_bodies_are_decoded() -> None:
+    async def read() -> list[bytes]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'6\r\ndata: \r\na;ext=1\r\n{"a": 1}\n\n\r\n0\r\n\r\n')
+        reader.feed_eof()
+        headers = {"transfer-encoding": "chunked"}
+        return [chunk async for chunk in _iter_body(reader, headers)]
+
+    assert b"".join(asyncio.run(read())) == b'data: {"a": 1}\n\n'
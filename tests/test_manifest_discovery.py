@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from manifest_discovery import MANIFEST_NAME, discover_manifests  # noqa: E402
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _tree(root: Path) -> None:
+    for relative in (
+        "batch_a",
+        "batch_b/nested",
+        "batch_b/raw_logs/deep",
+        "batch_c/x/y/z",
+    ):
+        (root / relative).mkdir(parents=True)
+        (root / relative / MANIFEST_NAME).write_text("{}", encoding="utf-8")
+    for index in range(5):
+        (root / "batch_b" / "raw_logs" / f"worker_{index}.log").write_text("")
+
+
+def _age(root: Path) -> None:
+    """Push every directory mtime past the cache's same-tick safety window."""
+    old = 1_700_000_000
+    for path in [root, *root.rglob("*")]:
+        if path.is_dir():
+            os.utime(path, (old, old))
+
+
+def test_discover_matches_rglob_and_prunes(tmp_path: Path) -> None:
+    _tree(tmp_path)
+
+    manifests, counts = discover_manifests(tmp_path)
+    assert manifests == sorted(tmp_path.rglob(MANIFEST_NAME))
+    assert counts["dirs_listed"] == 10
+    assert counts["files_seen"] == 9
+
+    excluded, counts = discover_manifests(tmp_path, exclude=["raw_logs", "batch_c/*"])
+    assert [path.parent.relative_to(tmp_path).as_posix() for path in excluded] == [
+        "batch_a",
+        "batch_b/nested",
+    ]
+    assert counts["dirs_pruned"] == 2
+    assert counts["files_seen"] == 2
+
+    shallow, _ = discover_manifests(tmp_path, max_depth=2)
+    assert len(shallow) == 2
+
+
+def test_discover_reuses_unchanged_directories(tmp_path: Path) -> None:
+    _tree(tmp_path)
+    _age(tmp_path)
+    cache: dict = {}
+
+    first, counts = discover_manifests(tmp_path, cache=cache)
+    assert counts["dirs_cached"] == 0
+    again, counts = discover_manifests(tmp_path, cache=cache)
+    assert again == first
+    assert counts == {
+        "dirs_listed": 0,
+        "dirs_cached": 10,
+        "files_seen": 0,
+        "dirs_pruned": 0,
+    }
+
+    # Only the directory that gained an entry is listed again.
+    (tmp_path / "batch_c" / "x" / "new").mkdir()
+    (tmp_path / "batch_c" / "x" / "new" / MANIFEST_NAME).write_text("{}")
+    (tmp_path / "batch_a" / MANIFEST_NAME).unlink()
+    changed, counts = discover_manifests(tmp_path, cache=cache)
+    assert changed == sorted(tmp_path.rglob(MANIFEST_NAME))
+    assert counts["dirs_listed"] == 3
+    assert counts["dirs_cached"] == 8
+
+
+def test_aggregate_results_reports_discovery(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    _write_standard_export(
+        source_dir / "run", [_engine_entry(engine, i) for i, engine in enumerate("ab")]
+    )
+    _write_standard_export(source_dir / "raw_logs", [_engine_entry("c", 2)])
+    _age(source_dir)
+
+    outputs = []
+    for _ in range(2):
+        result = _run_aggregate(
+            "--source-dir",
+            str(source_dir),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--exclude",
+            "raw_logs",
+            "--incremental",
+            "--state-file",
+            str(tmp_path / "state.json"),
+        )
+        assert result.returncode == 0, result.stderr or result.stdout
+        outputs.append(result.stdout)
+
+    assert "discovery: 1 manifests; listed 2 dirs" in outputs[0]
+    assert "listed 0 dirs / 0 files, 2 dirs from cache, 1 pruned" in outputs[1]
+    single = json.loads((tmp_path / "out" / "leaderboard_single.json").read_text())
+    assert sorted(entry["engine"] for entry in single) == ["a", "b"]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from scaling_curves import (  # noqa: E402
+    SCALING_SNAPSHOT_SCHEMA_VERSION,
+    build_scaling_snapshot,
+)
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _level(
+    engine: str,
+    index: int,
+    concurrency: int,
+    throughput: float,
+    *,
+    chips: int = 1,
+    workload: str = "Q1",
+    version: str = "0.6.0.0",
+) -> dict:
+    entry = _engine_entry(engine, index)
+    entry["workload"]["name"] = workload
+    entry["workload"]["concurrent_requests"] = concurrency
+    entry["metrics"]["throughput_tps"] = throughput
+    entry["metrics"]["ttft_ms"] = 10.0 * concurrency
+    entry["engine_version"] = entry["metadata"]["engine_version"] = version
+    if chips > 1:
+        entry["hardware"]["chip_count"] = chips
+        entry["config_type"] = "multi_gpu"
+    entry["metadata"]["idempotency_key"] += f"|c{concurrency}|x{chips}|{version}"
+    return entry
+
+
+def _entries() -> list[dict]:
+    older = _level("sagellm", 9, 16, 9999.0, version="0.5.0")
+    older["metadata"]["submitted_at"] = "2026-01-01T00:00:00Z"
+    return [
+        _level("sagellm", 0, 1, 100.0),
+        _level("sagellm", 1, 2, 195.0),
+        _level("sagellm", 2, 4, 380.0),
+        _level("sagellm", 3, 8, 420.0),
+        older,
+        _level("sagellm", 4, 1, 300.0, chips=4),
+        _level("sagellm", 5, 4, 1100.0, chips=4),
+        # load_generator.py names each level ``<workload>_c<N>``.
+        _level("vllm", 6, 1, 90.0, workload="Q1_c1"),
+        _level("vllm", 7, 2, 180.0, workload="Q1_c2"),
+        _level("lmdeploy", 8, 1, 80.0),
+    ]
+
+
+def test_scaling_curves_find_knee_and_per_chip_efficiency() -> None:
+    snapshot = build_scaling_snapshot(_entries())
+
+    assert snapshot["schema_version"] == SCALING_SNAPSHOT_SCHEMA_VERSION
+    # lmdeploy has a single load level, so it has no curve.
+    curves = {
+        (curve["engine"], curve["scope"]["chip_count"]): curve
+        for curve in snapshot["curves"]
+    }
+    assert sorted(curves) == [("sagellm", 1), ("sagellm", 4), ("vllm", 1)]
+
+    single = curves[("sagellm", 1)]
+    assert single["engine_version"] == "0.6.0.0"
+    assert [point["load"] for point in single["points"]] == [1, 2, 4, 8]
+    assert [point["marginal_efficiency"] for point in single["points"]] == [
+        None,
+        0.95,
+        0.9487,
+        0.1053,
+    ]
+    assert single["knee"] == {
+        "concurrent_requests": 4,
+        "batch_size": 1,
+        "load": 4,
+        "throughput_tps": 380.0,
+        "ttft_ms": 40.0,
+    }
+    assert single["peak_throughput_tps"] == 420.0
+    assert single["chip_scaling_efficiency"] == 1.0
+
+    quad = curves[("sagellm", 4)]
+    assert quad["points"][-1]["throughput_per_chip"] == 275.0
+    assert quad["chip_scaling_efficiency"] == round(275.0 / 420.0, 4)
+
+    vllm = curves[("vllm", 1)]
+    assert vllm["scope"]["workload"] == "Q1"
+    assert vllm["scope_key"] == single["scope_key"]
+    assert vllm["knee"] is None
+
+
+def test_aggregate_writes_scaling_snapshot(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    _write_standard_export(source_dir, _entries())
+    output_dir = tmp_path / "website_data"
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--precompress",
+    )
+
+    assert result.returncode == 0, result.stderr or result.stdout
+    assert "leaderboard_scaling.json: 3 scaling curves, 1 saturated" in result.stdout
+    snapshot = json.loads((output_dir / "leaderboard_scaling.json").read_text())
+    assert snapshot["curve_count"] == 3
+    marker = json.loads((output_dir / "last_updated.json").read_text())
+    assert "leaderboard_scaling.json" in marker["snapshots"]
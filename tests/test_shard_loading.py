@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from generate_rich_data import iter_entries, write_export_tree  # noqa: E402
+from test_aggregate_results import _run_aggregate  # noqa: E402
+
+JS_FUNCTIONS = ("loadShardedData", "loadShards", "getDataByTab", "setDisplaySnapshot")
+
+# Loads shards/ through a recording HFDataLoader and reports what the first
+# paint fetched and what ended up in the page state.
+NODE_HARNESS = """
+const fs = require('fs');
+const shardDir = process.argv[1];
+const fetched = [];
+const read = (path) => JSON.parse(fs.readFileSync(`${shardDir}/${path}`, 'utf8'));
+const state = {
+    currentTab: 'single-chip',
+    singleChipData: [],
+    multiChipData: [],
+    multiNodeData: [],
+    compareSnapshot: null,
+    displaySnapshot: null,
+    displayLookups: {},
+    shardIndex: null,
+    loadedShards: new Set(),
+    totalLoadedEntries: 0,
+};
+const window = {
+    HFDataLoader: {
+        loadShardIndex: async () => { fetched.push('index.json'); return read('index.json'); },
+        loadShard: async (path) => { fetched.push(path); return read(path); },
+        loadCompareSnapshot: async () => { fetched.push('leaderboard_compare.json'); return null; },
+        loadDisplaySnapshot: async () => { fetched.push('leaderboard_display.json'); return null; },
+    },
+};
+const compareEntriesByVersionDesc = () => 0;
+console.log = () => {};
+%(functions)s
+loadShardedData().then(() => process.stdout.write(JSON.stringify({
+    fetched,
+    entries: state.singleChipData.map((entry) => entry.entry_id),
+    groups: state.compareSnapshot.groups.map((group) => group.scope_key),
+    rows: state.displaySnapshot.tabs['single-chip'].map((row) => row.entry_id),
+})));
+"""
+
+
+def _extract_js_functions() -> str:
+    source = (ROOT_DIR / "assets" / "leaderboard.js").read_text(encoding="utf-8")
+    blocks = []
+    for name in JS_FUNCTIONS:
+        match = re.search(
+            rf"^    (?:async )?function {name}\(.*?^    \}}$",
+            source,
+            re.MULTILINE | re.DOTALL,
+        )
+        assert match, f"{name} not found in leaderboard.js"
+        blocks.append(match.group(0))
+    return "\n".join(blocks)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_first_paint_fetches_only_the_index_and_default_shard(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    write_export_tree(
+        iter_entries(
+            240, seed=4, categories=["single_chip"], engines=["sagellm", "vllm"]
+        ),
+        source_dir,
+        entries_per_manifest=64,
+    )
+    output_dir = tmp_path / "out"
+    result = _run_aggregate(
+        "--source-dir", str(source_dir), "--output-dir", str(output_dir)
+    )
+    assert result.returncode == 0, result.stderr or result.stdout
+    shard_dir = output_dir / "shards"
+    index = json.loads((shard_dir / "index.json").read_text(encoding="utf-8"))
+    assert index["tabs"]["single-chip"]["shard_count"] > 1
+    default = next(
+        shard
+        for shard in index["shards"]
+        if shard["path"] == index["tabs"]["single-chip"]["default_shard"]
+    )
+
+    run = subprocess.run(
+        [
+            "node",
+            "-e",
+            NODE_HARNESS % {"functions": _extract_js_functions()},
+            str(shard_dir),
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert run.returncode == 0, run.stderr
+    loaded = json.loads(run.stdout)
+    assert loaded["fetched"] == [
+        "index.json",
+        default["path"],
+        default["compare_path"],
+        default["display_path"],
+    ]
+    shard_entries = json.loads((shard_dir / default["path"]).read_text("utf-8"))
+    assert loaded["entries"] == [entry["entry_id"] for entry in shard_entries]
+    compare = json.loads((output_dir / "leaderboard_compare.json").read_text("utf-8"))
+    assert loaded["groups"] == [
+        group["scope_key"]
+        for group in compare["groups"]
+        if group["scope"]["model"] == default["model"]
+        and group["scope"]["hardware"] == default["hardware"]
+    ]
+    display = json.loads((output_dir / "leaderboard_display.json").read_text("utf-8"))
+    ids = set(loaded["entries"])
+    assert loaded["rows"] == [
+        row["entry_id"]
+        for row in display["tabs"]["single-chip"]
+        if row["entry_id"] in ids
+    ]
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+import snapshot_publish  # noqa: E402
+from snapshot_publish import (  # noqa: E402
+    SNAPSHOT_INDEX_NAME,
+    hashed_name,
+    publish_snapshots,
+)
+from test_aggregate_results import (  # noqa: E402
+    _engine_entry,
+    _run_aggregate,
+    _write_standard_export,
+)
+
+
+def _publish(output_dir: Path, payload: object) -> dict:
+    (output_dir / "leaderboard_single.json").write_text(
+        json.dumps(payload), encoding="utf-8"
+    )
+    return publish_snapshots(output_dir, ["leaderboard_single.json"])
+
+
+def test_publish_snapshots_writes_siblings_and_hashed_copy(tmp_path: Path) -> None:
+    index = _publish(tmp_path, [{"entry_id": "a"}])
+    data = (tmp_path / "leaderboard_single.json").read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    item = index["files"]["leaderboard_single.json"]
+
+    assert item["sha256"] == digest
+    assert item["hashed"] == f"leaderboard_single.{digest[:16]}.json"
+    assert (tmp_path / item["hashed"]).read_bytes() == data
+    for name in ("leaderboard_single.json", item["hashed"]):
+        assert gzip.decompress((tmp_path / f"{name}.gz").read_bytes()) == data
+    assert item["encodings"]["gzip"]["bytes"] == len(
+        (tmp_path / "leaderboard_single.json.gz").read_bytes()
+    )
+    assert json.loads((tmp_path / SNAPSHOT_INDEX_NAME).read_text()) == index
+
+    if snapshot_publish.brotli is not None:
+        br = (tmp_path / "leaderboard_single.json.br").read_bytes()
+        assert snapshot_publish.brotli.decompress(br) == data
+
+
+def test_publish_snapshots_keeps_one_previous_generation(tmp_path: Path) -> None:
+    first = _publish(tmp_path, [1])["files"]["leaderboard_single.json"]["hashed"]
+    second = _publish(tmp_path, [2])["files"]["leaderboard_single.json"]["hashed"]
+
+    assert (tmp_path / first).exists()
+    assert (tmp_path / f"{first}.gz").exists()
+
+    third = _publish(tmp_path, [3])["files"]["leaderboard_single.json"]["hashed"]
+
+    assert not (tmp_path / first).exists()
+    assert not (tmp_path / f"{first}.gz").exists()
+    assert (tmp_path / second).exists()
+    assert (tmp_path / third).exists()
+
+
+def test_publish_snapshots_without_brotli(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "leaderboard_single.json.br").write_bytes(b"stale")
+    monkeypatch.setattr(snapshot_publish, "brotli", None)
+
+    index = _publish(tmp_path, [])
+
+    assert set(index["files"]["leaderboard_single.json"]["encodings"]) == {"gzip"}
+    assert not (tmp_path / "leaderboard_single.json.br").exists()
+
+
+def test_hashed_name_keeps_compound_suffix() -> None:
+    digest = "0123456789abcdef" * 4
+    assert (
+        hashed_name("leaderboard_single.columnar.json", digest)
+        == "leaderboard_single.columnar.0123456789abcdef.json"
+    )
+
+
+def test_aggregate_results_points_last_updated_at_hashes(tmp_path: Path) -> None:
+    source_dir = tmp_path / "benchmark_outputs"
+    output_dir = tmp_path / "out"
+    _write_standard_export(
+        source_dir,
+        [_engine_entry(engine, index) for index, engine in enumerate(["a", "b"])],
+    )
+
+    result = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(output_dir),
+        "--precompress",
+    )
+
+    assert result.returncode == 0, result.stderr
+    marker = json.loads((output_dir / "last_updated.json").read_text())
+    index = json.loads((output_dir / SNAPSHOT_INDEX_NAME).read_text())
+    assert set(marker["snapshots"]) == {
+        "leaderboard_single.json",
+        "leaderboard_multi.json",
+        "leaderboard_compare.json",
+        "leaderboard_compare_v2.json",
+        "leaderboard_scaling.json",
+        "leaderboard_display.json",
+    }
+    for name, info in marker["snapshots"].items():
+        data = (output_dir / name).read_bytes()
+        assert info["sha256"] == hashlib.sha256(data).hexdigest()
+        assert info["hashed"] == index["files"][name]["hashed"]
+        assert (output_dir / info["hashed"]).read_bytes() == data
+
+    shard_index = json.loads((output_dir / "shards" / "index.json").read_text())
+    for shard in shard_index["shards"]:
+        shard_path = output_dir / "shards" / shard["path"]
+        assert (
+            gzip.decompress(shard_path.with_name(shard_path.name + ".gz").read_bytes())
+            == shard_path.read_bytes()
+        )
+
+    # The default run writes plain snapshots only and clears what the
+    # precompressed run left behind, so nothing stale can be served.
+    result = _run_aggregate(
+        "--source-dir", str(source_dir), "--output-dir", str(output_dir)
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert not (output_dir / SNAPSHOT_INDEX_NAME).exists()
+    assert not list(output_dir.rglob("*.gz"))
+    assert not list(output_dir.rglob("*.br"))
+    assert sorted(path.name for path in output_dir.glob("leaderboard_single*")) == [
+        "leaderboard_single.json"
+    ]
+    assert "snapshots" not in json.loads((output_dir / "last_updated.json").read_text())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+from snapshot_writer import write_json_array, write_json_document  # noqa: E402
+
+
+def test_streamed_array_matches_json_dumps_byte_for_byte(tmp_path: Path) -> None:
+    source = json.loads(
+        (ROOT_DIR / "data" / "leaderboard_single.json").read_text(encoding="utf-8")
+    )
+    for entries in (source, source[:1], []):
+        target = tmp_path / "leaderboard_single.json"
+        count = write_json_array(target, iter(entries))
+        assert count == len(entries)
+        assert target.read_text(encoding="utf-8") == (
+            json.dumps(entries, indent=2, ensure_ascii=False) + "\n"
+        )
+
+
+def test_streamed_document_matches_json_dumps(tmp_path: Path) -> None:
+    payload = json.loads(
+        (ROOT_DIR / "data" / "leaderboard_compare.json").read_text(encoding="utf-8")
+    )
+    payload["note"] = "模型对比"
+    target = tmp_path / "leaderboard_compare.json"
+    write_json_document(target, payload)
+    assert target.read_text(encoding="utf-8") == (
+        json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+    )
+
+
+def test_failed_write_keeps_previous_snapshot(tmp_path: Path) -> None:
+    target = tmp_path / "leaderboard_single.json"
+    write_json_array(target, [{"entry_id": "old"}])
+    previous = target.read_bytes()
+
+    def entries():
+        yield {"entry_id": "new"}
+        raise RuntimeError("producer failed mid-stream")
+
+    with pytest.raises(RuntimeError):
+        write_json_array(target, entries())
+
+    assert target.read_bytes() == previous
+    assert [path.name for path in tmp_path.iterdir()] == ["leaderboard_single.json"]
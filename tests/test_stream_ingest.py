@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import copy
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+import aggregate_results  # noqa: E402
+from generate_rich_data import iter_entries, write_export_tree  # noqa: E402
+from test_aggregate_results import _run_aggregate  # noqa: E402
+
+# Peak RSS growth of parsing + dedup, measured in a fresh interpreter.
+PEAK_RSS_PROBE = """
+import gc, sys
+from pathlib import Path
+sys.path.insert(0, sys.argv[1])
+from aggregate_results import iter_manifest_entries, load_schema, split_entries
+from benchmark_aggregate_pipeline import _reset_peak_rss, peak_rss_bytes
+from compiled_schema import FastPathValidator
+
+validator = FastPathValidator(load_schema(Path(sys.argv[2])))
+gc.collect()
+_reset_peak_rss()
+base = peak_rss_bytes()
+loaded = iter_manifest_entries(Path(sys.argv[3]), validator)
+if sys.argv[4] == "list":
+    loaded = list(loaded)
+single, multi = split_entries(loaded)
+print(peak_rss_bytes() - base, sorted(entry["entry_id"] for entry in single + multi))
+"""
+
+
+def _duplicated_tree(root: Path, unique: int, runs: int) -> None:
+    templates = list(iter_entries(unique, seed=11))
+
+    def artifacts():
+        for run in range(runs):
+            for template in templates:
+                entry = copy.deepcopy(template)
+                entry["metadata"]["submitted_at"] = (
+                    f"2026-02-01T{run // 60:02d}:{run % 60:02d}:00Z"
+                )
+                yield entry
+
+    write_export_tree(artifacts(), root, entries_per_manifest=500)
+
+
+def _peak_rss_growth(source_dir: Path, mode: str) -> tuple[int, str]:
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            PEAK_RSS_PROBE,
+            str(ROOT_DIR / "scripts"),
+            str(ROOT_DIR / "data" / "schemas" / "leaderboard_v1.schema.json"),
+            str(source_dir),
+            mode,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    growth, entry_ids = result.stdout.split(" ", 1)
+    return int(growth), entry_ids
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/clear_refs").exists(), reason="needs Linux peak RSS reset"
+)
+def test_streaming_ingest_memory_follows_unique_entries(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    _duplicated_tree(source_dir, unique=20, runs=100)
+
+    list_growth, list_ids = _peak_rss_growth(source_dir, "list")
+    stream_growth, stream_ids = _peak_rss_growth(source_dir, "stream")
+
+    assert stream_ids == list_ids
+    # 2000 parsed artifacts held at once vs 20 winners plus one artifact.
+    assert list_growth > 10 * 2**20
+    assert stream_growth < list_growth / 3
+
+
+def test_aggregate_results_stream_matches_default_output(tmp_path: Path) -> None:
+    source_dir = tmp_path / "export"
+    _duplicated_tree(source_dir, unique=12, runs=3)
+
+    outputs = {}
+    for mode in ("default", "stream"):
+        output_dir = tmp_path / mode
+        result = _run_aggregate(
+            "--source-dir",
+            str(source_dir),
+            "--output-dir",
+            str(output_dir),
+            *(["--stream"] if mode == "stream" else []),
+        )
+        assert result.returncode == 0, result.stderr or result.stdout
+        outputs[mode] = [
+            (output_dir / name).read_bytes()
+            for name in ("leaderboard_single.json", "leaderboard_multi.json")
+        ]
+
+    assert outputs["stream"] == outputs["default"]
+    rejected = _run_aggregate(
+        "--source-dir",
+        str(source_dir),
+        "--output-dir",
+        str(tmp_path / "x"),
+        "--stream",
+        "--stats",
+    )
+    assert rejected.returncode != 0
+    assert "--stats" in rejected.stderr
+
+
+def test_parallel_loading_submits_a_bounded_window() -> None:
+    submitted: list[int] = []
+
+    def tasks():
+        for index in range(10_000):
+            submitted.append(index)
+            yield index
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = aggregate_results._bounded_map(executor, str, tasks(), jobs=2)
+        assert next(results) == "0"
+        window = 2 * aggregate_results.ARTIFACT_WINDOW
+        # One chunk is refilled after the first one is handed out.
+        assert len(submitted) <= (window + 1) * aggregate_results.ARTIFACT_CHUNK_SIZE
+        assert list(results) == [str(index) for index in range(1, 10_000)]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT_DIR / "scripts"))
+
+import sync_version_meta  # noqa: E402
+from pypi_fixture_server import serve_fixture  # noqa: E402
+
+
+@pytest.fixture
+def meta_copy(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    meta_path = tmp_path / "version_meta.json"
+    readme_path = tmp_path / "README.md"
+    shutil.copy(ROOT_DIR / "data" / "version_meta.json", meta_path)
+    shutil.copy(ROOT_DIR / "README.md", readme_path)
+    monkeypatch.setattr(sync_version_meta, "VERSION_META_PATH", meta_path)
+    monkeypatch.setattr(sync_version_meta, "README_PATH", readme_path)
+    return meta_path
+
+
+def _fixture(meta_path: Path, **overrides: object) -> dict[str, object]:
+    packages = json.loads(meta_path.read_text(encoding="utf-8"))["packages"]
+    fixture: dict[str, object] = {
+        package["pypi_name"]: package["version"] for package in packages
+    }
+    fixture.update(overrides)
+    return fixture
+
+
+def _versions(meta_path: Path) -> dict[str, str]:
+    packages = json.loads(meta_path.read_text(encoding="utf-8"))["packages"]
+    return {package["pypi_name"]: package["version"] for package in packages}
+
+
+def test_fetches_slow_packages_concurrently_over_keep_alive(meta_copy: Path) -> None:
+    fixture = {
+        name: {"version": version, "delay": 0.3}
+        for name, version in _fixture(meta_copy).items()
+    }
+    assert len(fixture) >= 8
+
+    stats: dict[str, int] = {}
+    with serve_fixture(fixture) as server:
+        started = time.perf_counter()
+        sync_version_meta.sync_version_meta(
+            url_template=server.url_template, cache_path=None, workers=8, stats=stats
+        )
+        elapsed = time.perf_counter() - started
+
+    # One package at a time would take len(fixture) * 0.3 s.
+    assert elapsed < len(fixture) * 0.3 / 2
+    assert stats["fetched"] == len(fixture)
+    assert server.connections == stats["connections"] <= 8
+
+    with serve_fixture(_fixture(meta_copy)) as server:
+        sync_version_meta.sync_version_meta(
+            url_template=server.url_template, cache_path=None, workers=1, stats=stats
+        )
+    assert len(server.requests) == len(fixture)
+    assert server.connections == 1
+
+
+def test_conditional_requests_reuse_cached_versions(
+    meta_copy: Path, tmp_path: Path
+) -> None:
+    cache_path = tmp_path / "cache" / "pypi_versions.json"
+    fixture = _fixture(meta_copy)
+    stats: dict[str, int] = {}
+
+    with serve_fixture(fixture) as server:
+        options = {"url_template": server.url_template, "cache_path": cache_path}
+        sync_version_meta.sync_version_meta(stats=stats, **options)
+        assert stats["fetched"] == len(fixture)
+
+        sync_version_meta.sync_version_meta(stats=stats, **options)
+        assert (stats["fetched"], stats["not_modified"]) == (0, len(fixture))
+
+        fixture["isagellm"] = "9.9.9"
+        assert sync_version_meta.sync_version_meta(stats=stats, **options)
+        assert stats["fetched"] == 1
+        assert stats["not_modified"] == len(fixture) - 1
+
+    assert _versions(meta_copy)["isagellm"] == "9.9.9"
+    cached = json.loads(cache_path.read_text(encoding="utf-8"))["packages"]
+    assert cached["isagellm"]["version"] == "9.9.9"
+    assert cached["isagellm"]["etag"]
+
+    # Another index (here: another port) must not receive these validators.
+    with serve_fixture(fixture) as server:
+        sync_version_meta.sync_version_meta(
+            url_template=server.url_template, cache_path=cache_path, stats=stats
+        )
+        assert (stats["fetched"], stats["not_modified"]) == (len(fixture), 0)
+
+
+def test_offline_cli_and_missing_package(
+    meta_copy: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    fixture_path = tmp_path / "pypi_fixture.json"
+    fixture_path.write_text(
+        json.dumps(_fixture(meta_copy, **{"isagellm-protocol": "0.6.0"})),
+        encoding="utf-8",
+    )
+    default_cache = tmp_path / "default_cache.json"
+    monkeypatch.setattr(sync_version_meta, "CACHE_PATH", default_cache)
+    monkeypatch.setattr(
+        sys, "argv", ["sync_version_meta.py", "--offline", str(fixture_path)]
+    )
+    sync_version_meta.main()
+    # Fixture validators never reach the cache used against PyPI.
+    assert not default_cache.exists()
+
+    assert "version_meta.json updated" in capsys.readouterr().out
+    assert _versions(meta_copy)["isagellm-protocol"] == "0.6.0"
+
+    # With an explicit cache file, the second offline run (on a new port)
+    # revalidates every package with a 304.
+    cache_path = tmp_path / "offline_cache.json"
+    argv = ["sync_version_meta.py", "--offline", str(fixture_path)]
+    monkeypatch.setattr(sys, "argv", [*argv, "--cache-file", str(cache_path)])
+    sync_version_meta.main()
+    sync_version_meta.main()
+    packages = len(_fixture(meta_copy))
+    assert f"0 fetched, {packages} not modified" in capsys.readouterr().out
+
+    fixture = _fixture(meta_copy)
+    del fixture["isagellm"]
+    with serve_fixture(fixture) as server:
+        with pytest.raises(RuntimeError, match="isagellm from PyPI: HTTP 404"):
+            sync_version_meta.sync_version_meta(
+                url_template=server.url_template, cache_path=None
+            )